@@ -1,15 +1,57 @@
 import streamlit as st
 from ml_models import detect_cost_anomalies
+from streaming_detector import detect_rolling_anomalies
+from instrumentation import instrumented
+from config import STREAM_KEY_COLS, STREAM_METRICS
 
 
-def show_anomaly_detection(df):
+def show_anomaly_detection(df, data_key):
     st.header("🚨 Anomaly Detection")
     if 'total_cost' not in df.columns:
         st.warning("Required data for anomaly detection not available")
         return
 
     with st.spinner("Detecting anomalies..."):
-        df['is_anomaly'] = detect_cost_anomalies(df)
+        is_anomaly = detect_cost_anomalies(data_key, df)
 
-    anomaly_count = df['is_anomaly'].sum()
-    st.metric("Anomalies Detected", anomaly_count)
\ No newline at end of file
+    anomaly_count = is_anomaly.sum()
+    st.metric("Anomalies Detected", anomaly_count)
+
+    _show_rolling_anomalies(df, data_key)
+
+
+@instrumented(cache=st.cache_data)
+def _rolling_anomalies(data_key, _df):
+    return detect_rolling_anomalies(_df)
+
+
+def _show_rolling_anomalies(df, data_key):
+    st.markdown("---")
+    st.subheader("📈 Rolling Route Anomalies")
+    st.markdown("**Orders and recent windows that break from each route's own cost history**")
+
+    flags, detector = _rolling_anomalies(data_key, df)
+    if 'order_flag' not in flags.columns:
+        st.info("Cost per km data not available for rolling detection")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Flagged Orders", int(flags['order_flag'].sum()))
+    with col2:
+        st.metric("Flagged Windows", int(flags['window_flag'].sum()))
+    with col3:
+        st.metric("Tracked Series", len(detector.state))
+
+    flagged = flags['order_flag'] | flags['window_flag']
+    if flagged.any():
+        key_cols = [col for col in STREAM_KEY_COLS if col in df.columns]
+        metric_cols = [col for col in STREAM_METRICS if col in df.columns]
+        z_cols = [col for col in flags.columns if col.endswith('_z')]
+        display_cols = [col for col in ['Order_ID', 'Order_Date'] if col in df.columns] + key_cols + metric_cols
+        flagged_orders = df.loc[flagged, display_cols].join(flags.loc[flagged, z_cols + ['order_flag', 'window_flag']])
+        if 'Order_Date' in flagged_orders.columns:
+            flagged_orders = flagged_orders.sort_values('Order_Date')
+        st.dataframe(flagged_orders, use_container_width=True)
+    else:
+        st.success("✅ No route has drifted from its recent cost profile")
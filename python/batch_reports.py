@@ -0,0 +1,143 @@
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from config import COST_COMPONENTS, BATCH_REPORT_DIR, BATCH_REPORT_WORKERS, WAREHOUSE_CAPACITY_HEADROOM
+from cost_analysis_engine import route_cost_table, product_cost_table, cost_breakdown_tables
+from dataset import data_version, load_dataset, filter_orders
+from optimization_engine import route_analysis, priority_analysis, warehouse_analysis, fuel_analysis
+from scenario_engine import compute_scenario_base, combined_impact, tornado, priority_mix_cost
+
+_snapshot = {}
+
+
+def order_reports(df, routes):
+    # Every order-level report for one slice of orders, as named DataFrames,
+    # plus a one-row summary of its headline numbers.
+    reports = {'route_costs': route_cost_table(df), 'product_costs': product_cost_table(df)}
+
+    breakdown = cost_breakdown_tables(df, [col for col in COST_COMPONENTS if col in df.columns])
+    if breakdown is not None:
+        reports.update({'cost_breakdown': breakdown['summary'], 'daily_costs': breakdown['daily'],
+                        'monthly_costs': breakdown['monthly'], 'cost_stats': breakdown['stats']})
+
+    analyses = {'route': route_analysis(df, routes), 'priority': priority_analysis(df), 'fuel': fuel_analysis(df)}
+    if analyses['route'] is not None:
+        reports['route_optimization'] = analyses['route']['table']
+        if analyses['route']['plan'] is not None:
+            reports['route_plan'] = analyses['route']['plan']['plan']
+    if analyses['priority'] is not None:
+        reports['priority_optimization'] = analyses['priority']['table']
+    if analyses['fuel'] is not None and analyses['fuel']['stats'] is not None:
+        for col, table in analyses['fuel']['stats']['breakdowns'].items():
+            reports[f'fuel_by_{col.lower()}'] = table
+    opportunities = [result['opportunity'] for result in analyses.values()
+                     if result is not None and result['opportunity'] is not None]
+    reports['opportunities'] = pd.DataFrame(opportunities, columns=['category', 'opportunity', 'savings', 'action'])
+
+    base = compute_scenario_base(df)
+    impact = combined_impact(base)
+    if impact is not None:
+        reports['combined_impact'] = impact['summary']
+        reports['scenario_tornado'] = pd.DataFrame(tornado(base)[0], columns=['Parameter', 'Low', 'High'])
+    mix = priority_mix_cost(df)
+    if mix is not None:
+        reports['priority_mix'] = mix['current_mix'].rename('Percentage').rename_axis('Priority').reset_index()
+
+    summary = {
+        'orders': len(df),
+        'total_cost': base['total'],
+        'avg_cost_per_order': base['total'] / len(df) if len(df) else 0.0,
+        'avg_cost_per_km': df['cost_per_km'].mean() if 'cost_per_km' in df.columns else None,
+        'revenue': df['Order_Value_INR'].sum() if 'Order_Value_INR' in df.columns else None,
+        'opportunity_savings': reports['opportunities']['savings'].sum(),
+        'combined_reduction_pct': impact['reduction_pct'] if impact is not None else None
+    }
+    return {name: table for name, table in reports.items() if table is not None}, summary
+
+
+def network_reports(data, headroom=WAREHOUSE_CAPACITY_HEADROOM):
+    result = warehouse_analysis(data['warehouse'], data['routes'], headroom)
+    if result is None or result['costs'] is None:
+        return {}
+    reports = {'warehouse_costs': result['costs']}
+    if result['result'] is not None and result['result']['plan'] is not None:
+        reports['warehouse_transfers'] = result['result']['plan']
+    return reports
+
+
+def report_slices(main_df, period=None, by=None):
+    # (label, filter_orders kwargs) for every date period and/or value of `by`;
+    # with neither, a single slice covering all orders.
+    periods = [('all', {})]
+    if period and 'Order_Date' in main_df.columns:
+        dates = main_df['Order_Date'].dropna().dt.to_period(period)
+        periods = [(str(p), {'date_range': (p.start_time.date(), p.end_time.date())})
+                   for p in sorted(dates.unique())]
+    groups = [('', {})]
+    if by:
+        groups = [(f'{by}={value}', {by: [value]}) for value in sorted(main_df[by].dropna().unique())]
+    return [('_'.join(part for part in (period_label, group_label) if part != 'all' and part) or 'all',
+             {**period_filters, **group_filters})
+            for period_label, period_filters in periods for group_label, group_filters in groups]
+
+
+def _write_reports(reports, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, table in reports.items():
+        table.to_csv(os.path.join(directory, f'{name}.csv'), index=False)
+
+
+def _load_snapshot(version):
+    _snapshot['data'] = load_dataset(version)
+
+
+def _run_slice(label, filters, output):
+    started = time.perf_counter()
+    data = _snapshot['data']
+    df = filter_orders(data['main'], **filters)
+    if df.empty:
+        return {'slice': label, 'orders': 0, 'seconds': time.perf_counter() - started}
+    reports, summary = order_reports(df, data['routes'])
+    _write_reports(reports, os.path.join(output, re.sub(r'[^\w=.-]+', '_', label)))
+    return {'slice': label, **summary, 'reports': len(reports), 'seconds': time.perf_counter() - started}
+
+
+def run_batch(period=None, by=None, output=BATCH_REPORT_DIR, workers=BATCH_REPORT_WORKERS):
+    # Slices are independent, so they run in worker processes that each read
+    # the dataset snapshot from the on-disk cache once.
+    started = time.perf_counter()
+    version = data_version()
+    _load_snapshot(version)
+    data = _snapshot['data']
+    if data is None:
+        raise ValueError("No cost columns found in data")
+    slices = report_slices(data['main'], period, by)
+    _write_reports(network_reports(data), output)
+
+    if workers <= 1:
+        rows = [_run_slice(label, filters, output) for label, filters in slices]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(slices)), initializer=_load_snapshot,
+                                 initargs=(version,)) as pool:
+            futures = [pool.submit(_run_slice, label, filters, output) for label, filters in slices]
+            rows = [future.result() for future in as_completed(futures)]
+
+    summary = pd.DataFrame(rows).sort_values('slice')
+    summary.to_csv(os.path.join(output, 'summary.csv'), index=False)
+    return summary, time.perf_counter() - started
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write every cost, optimization and scenario report per slice')
+    parser.add_argument('--period', help='split orders by pandas period, e.g. M, Q or W')
+    parser.add_argument('--by', help='split orders by the values of a column, e.g. Origin or Customer_Segment')
+    parser.add_argument('--output', default=BATCH_REPORT_DIR)
+    parser.add_argument('--workers', type=int, default=min(BATCH_REPORT_WORKERS, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    summary, seconds = run_batch(args.period, args.by, args.output, args.workers)
+    print(summary.round(2).to_string(index=False))
+    print(f"{len(summary)} slices written to {args.output} in {seconds:.2f} s with {args.workers} worker(s)")
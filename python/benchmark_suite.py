@@ -0,0 +1,190 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import streamlit as st
+from changepoint import detect_changepoints
+from config import (COST_COMPONENTS, FEATURE_COLS, N_CLUSTERS, PRIORITY_SEGMENT_COLS, SYNTHETIC_SEED,
+                    BENCHMARK_DIR)
+from cost_analysis_engine import route_cost_table, product_cost_table, cost_breakdown_tables
+from dataset import read_tables, parse_table_dates, merge_tables, filter_orders, default_filters, filter_key
+from inventory_simulation import build_inventory_state, simulate_inventory
+from ml_models import score_cost_anomalies, fit_cost_prediction_model, fit_cost_clusters
+from monte_carlo import run_monte_carlo
+from optimization_engine import analysis_jobs
+from priority_optimizer import build_priority_segments, optimize_priority_mix
+from scenario_engine import (compute_scenario_base, sensitivity_surface, tornado, build_order_base,
+                             reprice_orders, rollup_orders, default_params)
+from streaming_detector import detect_rolling_anomalies
+from synthetic_data import generate_dataset, synthetic_directory
+
+
+def _measure(memory, func, *args, **kwargs):
+    # tracemalloc slows allocation-heavy Python code, so timings taken with
+    # memory=False are the ones to compare for pure speed.
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    try:
+        value, error = func(*args, **kwargs), None
+    except Exception as e:
+        value, error = None, f'{type(e).__name__}: {e}'
+    row = {
+        'seconds': time.perf_counter() - started,
+        'cpu_seconds': time.process_time() - cpu_started,
+        'peak_mb': tracemalloc.get_traced_memory()[1] / 1e6 if memory else None
+    }
+    if memory:
+        tracemalloc.stop()
+    if error:
+        row['error'] = error
+    return value, row
+
+
+def _score_cost_model(fitted, df):
+    # Predict every order with the trained model, building features the way
+    # fit_cost_prediction_model does.
+    model, columns, _ = fitted
+    if model is None:
+        return None
+    X = df[[col for col in FEATURE_COLS if col in df.columns]].dropna()
+    if 'Priority' in df.columns:
+        X = pd.concat([X, pd.get_dummies(df.loc[X.index, 'Priority'], prefix='priority')], axis=1)
+    return model.predict(X.reindex(columns=columns, fill_value=0))
+
+
+@st.cache_data
+def _keyed_by_frame(df):
+    return len(df)
+
+
+@st.cache_data
+def _keyed_by_filters(data_key, _df):
+    return len(_df)
+
+
+def _lookup_stages(df, data_key):
+    # A cache hit under each keying scheme; the first call fills the cache, so
+    # only the lookup itself is timed.
+    stages = [('cache_lookup', 'frame_hash', _keyed_by_frame, (df,)),
+              ('cache_lookup', 'filter_key', _keyed_by_filters, (data_key, df))]
+    for _, _, func, args in stages:
+        func(*args)
+    return [(page, stage, lambda func=func, args=args: func(*args)) for page, stage, func, args in stages]
+
+
+def _page_stages(df, data):
+    # (page, stage, callable) for the computations behind each show_* page,
+    # without the widgets and charts.
+    components = [col for col in COST_COMPONENTS if col in df.columns]
+    stages = [
+        ('dashboard', 'changepoints', lambda: detect_changepoints(df)),
+        ('cost_analysis', 'route_costs', lambda: route_cost_table(df)),
+        ('cost_analysis', 'product_costs', lambda: product_cost_table(df)),
+        ('cost_analysis', 'cost_breakdown', lambda: cost_breakdown_tables(df, components)),
+        ('anomaly', 'isolation_forest', lambda: score_cost_anomalies(df)),
+        ('anomaly', 'rolling_anomalies', lambda: detect_rolling_anomalies(df)),
+        ('predictive', 'inventory_projection',
+         lambda: simulate_inventory(build_inventory_state(data['warehouse'], df)))
+    ]
+    for name, (_, func, args) in analysis_jobs(df, data).items():
+        stages.append(('optimization', f'{name}_analysis', lambda func=func, args=args: func(*args)))
+
+    base = compute_scenario_base(df)
+    stages += [
+        ('scenario', 'sensitivity_surface', lambda: sensitivity_surface(base, 'fuel_change', 'fleet_reduction')),
+        ('scenario', 'tornado', lambda: tornado(base)),
+        ('scenario', 'order_repricing',
+         lambda: rollup_orders(order_base := build_order_base(df), reprice_orders(order_base, **default_params()))),
+        ('scenario', 'monte_carlo', lambda: run_monte_carlo(base)),
+        ('scenario', 'priority_optimizer',
+         lambda: optimize_priority_mix(build_priority_segments(df, PRIORITY_SEGMENT_COLS[:1]), revenue_floor=1.0))
+    ]
+    return stages
+
+
+def run_suite(directory, filters=None, memory=True):
+    # Times every stage once, in the order a session runs them. A stage that
+    # raises is recorded with its error and the rest still run.
+    rows = []
+
+    def record(page, stage, func, *args, **kwargs):
+        value, row = _measure(memory, func, *args, **kwargs)
+        rows.append({'page': page, 'stage': stage, **row})
+        return value
+
+    tables = record('load', 'read_csv', read_tables, directory)
+    tables = record('load', 'parse_dates', parse_table_dates, tables)
+    data = record('load', 'merge', merge_tables, tables)
+    main_df = data['main']
+    filters = filters or default_filters(main_df)
+    df = record('load', 'filter', filter_orders, main_df, **filters)
+    record('dashboard', 'kpis', lambda: (df['total_cost'].sum(), df['total_cost'].mean(), df['cost_per_km'].mean(),
+                                         df['revenue_to_cost_ratio'].mean()))
+
+    for page, stage, func in _lookup_stages(df, filter_key(directory, filters)) + _page_stages(df, data):
+        record(page, stage, func)
+
+    fitted = record('models', 'train_cost_model', fit_cost_prediction_model, df)
+    if fitted is not None:
+        record('models', 'score_cost_model', _score_cost_model, fitted, df)
+    record('models', 'cost_clusters', fit_cost_clusters, df, N_CLUSTERS)
+    return {'orders': len(main_df), 'filtered_orders': len(df), 'stages': rows}
+
+
+def benchmark(sizes=(10000, 100000, 1000000), seed=SYNTHETIC_SEED, memory=True):
+    results = []
+    for orders in sizes:
+        directory = synthetic_directory(orders, seed)
+        if not os.path.exists(os.path.join(directory, 'orders.csv')):
+            generate_dataset(orders, directory, seed)
+        results.append({'size': orders, 'seed': seed, 'directory': directory, **run_suite(directory, memory=memory)})
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {'python': platform.python_version(), 'pandas': pd.__version__, 'numpy': np.__version__,
+                        'machine': platform.machine(), 'cpus': os.cpu_count()},
+        'runs': results
+    }
+
+
+def _stage_frame(result):
+    return pd.DataFrame([{'orders': run['size'], **stage} for run in result['runs'] for stage in run['stages']])
+
+
+def compare(previous, current):
+    # Per-stage seconds and peak memory, before and after, for every size the
+    # two runs share.
+    before = _stage_frame(previous).set_index(['orders', 'page', 'stage'])
+    after = _stage_frame(current).set_index(['orders', 'page', 'stage'])
+    table = before[['seconds', 'peak_mb']].join(after[['seconds', 'peak_mb']], how='inner',
+                                               lsuffix='_before', rsuffix='_after')
+    table['speedup'] = table['seconds_before'] / table['seconds_after']
+    return table.reset_index()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time and memory-profile every stage on synthetic datasets')
+    parser.add_argument('--orders', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED)
+    parser.add_argument('--output', help='JSON results file (default: a timestamped file in data/benchmarks/)')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc for undistorted timings')
+    parser.add_argument('--compare', help='earlier JSON results file to compare against')
+    args = parser.parse_args()
+
+    result = benchmark(args.orders, args.seed, not args.no_memory)
+    output = args.output or os.path.join(BENCHMARK_DIR, datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    print(_stage_frame(result).round(3).to_string(index=False))
+    print(f"Results written to {output}")
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(json.load(f), result).round(3).to_string(index=False))
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from instrumentation import instrumented
+from config import COST_COMPONENTS, CHANGEPOINT_PENALTY, CHANGEPOINT_MIN_SIZE, CHANGEPOINT_BATCH_SIZE
+
+
+def build_daily_series(df, metrics=None, group_col='Route'):
+    if metrics is None:
+        metrics = ['total_cost'] + COST_COMPONENTS + ['cost_per_km']
+    if 'Order_Date' not in df.columns:
+        return {}
+
+    sum_cols = [m for m in metrics if m != 'cost_per_km' and m in df.columns]
+    need_ratio = 'cost_per_km' in metrics and 'total_cost' in df.columns and 'Distance_KM' in df.columns
+    if need_ratio:
+        sum_cols = list(dict.fromkeys(sum_cols + ['total_cost', 'Distance_KM']))
+    if not sum_cols:
+        return {}
+
+    dated = df.dropna(subset=['Order_Date'])
+    day = dated['Order_Date'].dt.normalize()
+    calendar = pd.date_range(day.min(), day.max(), freq='D') if len(day) else pd.DatetimeIndex([])
+
+    overall = dated[sum_cols].groupby(day).sum()
+    overall.index = pd.MultiIndex.from_product([['All Routes'], overall.index])
+    frames = [overall]
+    if group_col in dated.columns:
+        frames.append(dated[sum_cols].groupby([dated[group_col].astype(str), day]).sum())
+    totals = pd.concat(frames)
+
+    series = {}
+    for metric in metrics:
+        if metric == 'cost_per_km':
+            if not need_ratio:
+                continue
+            values = totals['total_cost'] / totals['Distance_KM'].replace(0, np.nan)
+        elif metric in totals.columns:
+            values = totals[metric]
+        else:
+            continue
+        series[metric] = values.unstack(level=1).reindex(columns=calendar)
+    return series
+
+
+def _segment_cost(s0, s1, s2, rows, start, end):
+    count = s0[rows, end] - s0[rows, start]
+    total = s1[rows, end] - s1[rows, start]
+    return s2[rows, end] - s2[rows, start] - total * total / np.maximum(count, 1)
+
+
+def binary_segmentation(values, penalty=CHANGEPOINT_PENALTY, min_size=CHANGEPOINT_MIN_SIZE):
+    # Binary segmentation with a Gaussian mean-shift cost, run on every row of
+    # `values` at once. NaN days carry zero weight, so sparse route series keep
+    # their calendar positions without interpolation. Each round scores every
+    # split point of every open segment from cumulative sums in one flat array
+    # pass, so a round is O(rows * days) and there are O(log days) rounds.
+    y = np.asarray(values, dtype=float)
+    m, n = y.shape
+    observed = ~np.isnan(y)
+
+    sigma = np.ones(m)
+    for i in range(m):
+        row = y[i, observed[i]]
+        if len(row) > 2:
+            spread = np.diff(row).std() / np.sqrt(2)
+            sigma[i] = spread if spread > 0 else 1.0
+    center = np.nanmean(np.where(observed, y, np.nan), axis=1) if m else np.zeros(0)
+    z = np.where(observed, (y - center[:, None]) / sigma[:, None], 0.0)
+
+    s0 = np.zeros((m, n + 1))
+    s1 = np.zeros((m, n + 1))
+    s2 = np.zeros((m, n + 1))
+    np.cumsum(observed, axis=1, out=s0[:, 1:])
+    np.cumsum(z, axis=1, out=s1[:, 1:])
+    np.cumsum(z * z, axis=1, out=s2[:, 1:])
+    beta = penalty * np.log(np.maximum(s0[:, n], 2))
+
+    seg_row = np.arange(m)
+    seg_start = np.zeros(m, dtype=np.int64)
+    seg_end = np.full(m, n, dtype=np.int64)
+    breakpoints = [[] for _ in range(m)]
+
+    while len(seg_row):
+        lengths = seg_end - seg_start - 1
+        open_segments = lengths > 0
+        seg_row, seg_start, seg_end, lengths = (seg_row[open_segments], seg_start[open_segments],
+                                                seg_end[open_segments], lengths[open_segments])
+        if not len(seg_row):
+            break
+
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        seg_id = np.repeat(np.arange(len(seg_row)), lengths)
+        rows = seg_row[seg_id]
+        start = seg_start[seg_id]
+        end = seg_end[seg_id]
+        split = start + 1 + np.arange(len(seg_id)) - offsets[seg_id]
+
+        gain = (_segment_cost(s0, s1, s2, rows, start, end)
+                - _segment_cost(s0, s1, s2, rows, start, split)
+                - _segment_cost(s0, s1, s2, rows, split, end))
+        valid = ((s0[rows, split] - s0[rows, start] >= min_size)
+                 & (s0[rows, end] - s0[rows, split] >= min_size))
+        gain = np.where(valid, gain, -np.inf)
+
+        best_gain = np.maximum.reduceat(gain, offsets)
+        is_best = gain == best_gain[seg_id]
+        first_ids, first_pos = np.unique(seg_id[is_best], return_index=True)
+        best_split = np.zeros(len(seg_row), dtype=np.int64)
+        best_split[first_ids] = split[is_best][first_pos]
+
+        accepted = best_gain > beta[seg_row]
+        for row, point in zip(seg_row[accepted], best_split[accepted]):
+            breakpoints[row].append(int(point))
+
+        seg_row = np.concatenate([seg_row[accepted], seg_row[accepted]])
+        seg_start, seg_end = (np.concatenate([seg_start[accepted], best_split[accepted]]),
+                              np.concatenate([best_split[accepted], seg_end[accepted]]))
+
+    return [sorted(points) for points in breakpoints]
+
+
+@instrumented()
+def detect_changepoints(df, metrics=None, group_col='Route', penalty=CHANGEPOINT_PENALTY,
+                        min_size=CHANGEPOINT_MIN_SIZE, batch_size=CHANGEPOINT_BATCH_SIZE):
+    series = build_daily_series(df, metrics, group_col)
+    records = []
+    for metric, table in series.items():
+        table = table[table.notna().sum(axis=1) >= 2 * min_size]
+        if table.empty:
+            continue
+
+        values = table.to_numpy(dtype=float)
+        dates = table.columns
+        points = []
+        for start in range(0, len(values), batch_size):
+            points.extend(binary_segmentation(values[start:start + batch_size], penalty, min_size))
+
+        for name, row, row_points in zip(table.index, values, points):
+            observed = np.flatnonzero(~np.isnan(row))
+            bounds = [0] + row_points + [len(row)]
+            for j, point in enumerate(row_points):
+                before = np.nanmean(row[bounds[j]:point])
+                after = np.nanmean(row[point:bounds[j + 2]])
+                records.append({
+                    'Series': name,
+                    'Metric': metric,
+                    'Date': dates[observed[observed >= point][0]],
+                    'Mean Before': before,
+                    'Mean After': after,
+                    'Change %': (after - before) / abs(before) * 100 if before else np.nan
+                })
+
+    return pd.DataFrame(records, columns=['Series', 'Metric', 'Date', 'Mean Before', 'Mean After', 'Change %'])
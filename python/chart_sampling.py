@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from config import CHART_POINT_BUDGET
+
+
+def _numeric(values):
+    values = pd.Series(values)
+    if values.dtype == object:
+        # datetime.date keys (e.g. from .dt.date) stay object dtype and would
+        # all coerce to NaN below
+        numeric = pd.to_numeric(values, errors='coerce')
+        if numeric.notna().sum() < values.notna().sum():
+            dates = pd.to_datetime(values, errors='coerce')
+            if dates.notna().sum() > numeric.notna().sum():
+                values = dates
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return np.where(values.isna(), np.nan, values.to_numpy(dtype='datetime64[ns]').astype('int64'))
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+
+
+def lttb_indices(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: keeps the first and last points and, from
+    # each of threshold - 2 equal buckets, the point forming the largest triangle
+    # with the previously kept point and the mean of the next bucket. Peaks and
+    # dips survive, which plain striding or averaging would flatten.
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    next_x = np.append(np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes, x[-1])[1:]
+    next_y = np.append(np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes, y[-1])[1:]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_series(frame, x, y, budget=CHART_POINT_BUDGET):
+    # `y` may be one column or several sharing the same x (e.g. a stacked area);
+    # with several, points are picked on their total so every trace keeps the
+    # same x values and stacking stays aligned.
+    if len(frame) <= budget:
+        return frame
+    frame = frame.sort_values(x)
+    columns = [y] if isinstance(y, str) else list(y)
+    signal = frame[columns].sum(axis=1, min_count=1)
+    keep = signal.notna().to_numpy()
+    kept = frame[keep]
+    return kept.iloc[lttb_indices(_numeric(kept[x]), signal[keep].to_numpy(dtype=float), budget)]
+
+
+def bin_scatter(frame, x, y, budget=CHART_POINT_BUDGET, size=None, color=None, label=None):
+    # Aggregates points onto a grid of about `budget` cells. Each cell is drawn
+    # at the weighted centroid of its points, sized by the summed `size` and
+    # coloured by the weighted mean of `color`; `label` becomes a count.
+    if len(frame) <= budget:
+        return frame
+    points = frame.dropna(subset=[x, y])
+    side = max(int(np.sqrt(budget)), 1)
+    xs = points[x].to_numpy(dtype=float)
+    ys = points[y].to_numpy(dtype=float)
+    x_bin = np.minimum(((xs - xs.min()) / max(np.ptp(xs), 1e-12) * side).astype(np.int64), side - 1)
+    y_bin = np.minimum(((ys - ys.min()) / max(np.ptp(ys), 1e-12) * side).astype(np.int64), side - 1)
+    cell = x_bin * side + y_bin
+
+    weight = points[size].to_numpy(dtype=float) if size else np.ones(len(points))
+    cells, inverse = np.unique(cell, return_inverse=True)
+    total = np.bincount(inverse, weight)
+    safe_total = np.where(total > 0, total, 1)
+    binned = pd.DataFrame({
+        x: np.bincount(inverse, weight * xs) / safe_total,
+        y: np.bincount(inverse, weight * ys) / safe_total
+    })
+    if size:
+        binned[size] = total
+    if color:
+        binned[color] = np.bincount(inverse, weight * points[color].fillna(0).to_numpy(dtype=float)) / safe_total
+    if label:
+        binned[label] = [f"{count} {label.lower()}s" for count in np.bincount(inverse)]
+    return binned
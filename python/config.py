@@ -25,6 +25,12 @@ FEATURE_COLS = [
 
 CLUSTER_FEATURES = ['total_cost', 'Distance_KM', 'cost_per_km']
 
+FILTER_COLUMNS = [
+    ('Priority', 'Priority Level'),
+    ('Vehicle_Type', 'Vehicle Type'),
+    ('Product_Category', 'Product Category')
+]
+
 DATE_FORMATS = [
     '%d %m %y',
     '%d/%m/%y',
@@ -46,4 +52,152 @@ ML_MAX_DEPTH = 10
 ML_TEST_SIZE = 0.2
 
 N_CLUSTERS = 3
-CLUSTER_RANDOM_STATE = 42
\ No newline at end of file
+CLUSTER_RANDOM_STATE = 42
+
+STREAM_METRICS = ['cost_per_km', 'total_cost']
+STREAM_KEY_COLS = ['Route', 'Vehicle_Type']
+STREAM_EWMA_ALPHA = 0.05
+STREAM_WINDOW_ALPHA = 0.3
+STREAM_Z_THRESHOLD = 3.0
+STREAM_WINDOW_Z_THRESHOLD = 3.0
+STREAM_MIN_OBS = 5
+
+CHANGEPOINT_PENALTY = 3.0
+CHANGEPOINT_MIN_SIZE = 3
+CHANGEPOINT_BATCH_SIZE = 512
+
+SCENARIO_RANGES = {
+    'fuel_change': (-30, 50, 5, 0),
+    'fleet_reduction': (0, 30, 1, 10),
+    'efficiency_gain': (0, 25, 1, 10),
+    'distance_reduction': (0, 25, 1, 10),
+    'delay_reduction': (0, 40, 1, 15)
+}
+
+SCENARIO_LABELS = {
+    'fuel_change': 'Fuel Price Change (%)',
+    'fleet_reduction': 'Reduce Fleet by (%)',
+    'efficiency_gain': 'Improve Efficiency by (%)',
+    'distance_reduction': 'Reduce Average Distance by (%)',
+    'delay_reduction': 'Reduce Traffic Delays by (%)'
+}
+
+MC_DISTRIBUTIONS = {
+    'fuel_rate': ('triangular', 0.05, 0.10, 0.15),
+    'fleet_rate': ('triangular', 0.06, 0.12, 0.18),
+    'route_rate': ('triangular', 0.08, 0.15, 0.20),
+    'priority_rate': ('triangular', 0.04, 0.08, 0.12),
+    'overlap': ('uniform', 0.75, 0.95),
+    'fuel_price_change': ('normal', 0.0, 0.10),
+    'adoption': ('triangular', 0.6, 1.0, 1.0)
+}
+MC_TRIALS = 100000
+MC_CHUNK_SIZE = 25000
+MC_SEED = 42
+MC_MAX_WORKERS = 4
+MC_PARALLEL_MIN_TRIALS = 1000000
+MC_TARGET_REDUCTION = 15
+MC_CACHE_ENTRIES = 8
+
+PRIORITY_OPT_MAX_ITER = 200
+PRIORITY_SEGMENT_COLS = ['Customer_Segment', 'Product_Category', 'Route']
+
+ORDER_SCENARIO_AVG_SPEED_KMPH = 45
+ORDER_SCENARIO_MAINTENANCE_DISTANCE_SHARE = 0.5
+ORDER_SCENARIO_CACHE_SIZE = 4
+ORDER_SCENARIO_BASE_ENTRIES = 4
+ORDER_SCENARIO_DIMENSIONS = ['Route', 'Priority', 'Customer_Segment', 'Product_Category',
+                             'Vehicle_Type', 'Origin', 'Destination', 'Carrier']
+
+SCENARIO_LIBRARY_PATH = 'data/scenario_library.db'
+SCENARIO_LIBRARY_DIMENSIONS = ['Route', 'Priority', 'Customer_Segment', 'Vehicle_Type', 'Carrier']
+
+ROUTE_PLAN_VEHICLE_CAPACITY = 8
+ROUTE_PLAN_NEIGHBORS = 15
+ROUTE_PLAN_FULL_PAIRS_MAX = 500
+ROUTE_PLAN_OR_OPT_SEGMENT = 3
+ROUTE_PLAN_MAX_PASSES = 100
+ROUTE_PLAN_ROAD_FACTOR = 1.25
+CITY_COORDINATES = {
+    'Ahmedabad': (23.02, 72.57),
+    'Bangalore': (12.97, 77.59),
+    'Bangkok': (13.76, 100.50),
+    'Chennai': (13.08, 80.27),
+    'Delhi': (28.70, 77.10),
+    'Dubai': (25.20, 55.27),
+    'Hong Kong': (22.32, 114.17),
+    'Hyderabad': (17.39, 78.49),
+    'Kolkata': (22.57, 88.36),
+    'Mumbai': (19.08, 72.88),
+    'Pune': (18.52, 73.86),
+    'Singapore': (1.35, 103.82)
+}
+
+ORDER_WEIGHT_KG = {
+    'Fashion': 8,
+    'Books': 12,
+    'Home Goods': 45,
+    'Electronics': 20,
+    'Food & Beverage': 30,
+    'Industrial': 180,
+    'Healthcare': 10
+}
+ORDER_WEIGHT_DEFAULT_KG = 25
+ASSIGNMENT_VEHICLE_STATUSES = ['Available']
+ASSIGNMENT_HANDLING_VEHICLES = {'Temperature_Controlled': ['Refrigerated']}
+ASSIGNMENT_FUEL_PRICE_PER_L = 100
+ASSIGNMENT_MAX_TRIPS = 3
+UNASSIGNED_VEHICLE_TYPE = 'Unassigned'
+
+WAREHOUSE_CAPACITY_HEADROOM = 0.25
+WAREHOUSE_TRANSFER_COST_PER_UNIT_KM = 0.005
+WAREHOUSE_TRANSFER_HANDLING_PER_UNIT = 1.5
+WAREHOUSE_REBALANCE_MAX_ITER = 100
+WAREHOUSE_REBALANCE_KEEP_REDUCED_COST = 0.005
+
+INVENTORY_HORIZON_DAYS = 90
+INVENTORY_LEAD_TIME_DAYS = 7
+INVENTORY_DEMAND_SCALE = 100
+INVENTORY_ORDER_UP_TO_MULTIPLIER = 2.0
+INVENTORY_ORDER_COST = 500
+INVENTORY_STORAGE_COST_PERIOD_DAYS = 365
+
+OPTIMIZATION_WORKERS = 4
+OPTIMIZATION_CACHE_SIZE = 32
+
+FUEL_HISTOGRAM_BINS = 30
+FUEL_INEFFICIENT_RATIO = 0.8
+FUEL_PERCENTILES = [10, 25, 50, 75, 90]
+FUEL_BREAKDOWN_COLS = ['Route', 'Vehicle_Type']
+
+CHART_POINT_BUDGET = 2000
+
+EXPORT_FORMATS = {
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+}
+EXPORT_CHUNK_ROWS = 50000
+EXPORT_CACHE_DIR = 'data/exports'
+EXPORT_CACHE_MAX_FILES = 20
+
+FIGURE_CACHE_SIZE = 128
+
+DISK_CACHE_DIR = 'data/cache'
+DISK_CACHE_MAX_FILES = 200
+WARMUP_WORKERS = 4
+
+BATCH_REPORT_DIR = 'data/reports'
+BATCH_REPORT_WORKERS = 4
+
+KPI_API_HOST = '127.0.0.1'
+KPI_API_PORT = 8502
+KPI_API_CACHE_SIZE = 256
+
+SYNTHETIC_SEED = 42
+SYNTHETIC_CHUNK_ROWS = 1000000
+BENCHMARK_DIR = 'data/benchmarks'
+
+STAGE_LOG_FILE = 'data/logs/stages.jsonl'
+STAGE_LOG_MAX_BYTES = 10 * 1024 * 1024
+STAGE_LOG_BACKUPS = 3
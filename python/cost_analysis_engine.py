@@ -0,0 +1,82 @@
+import pandas as pd
+
+
+def route_cost_table(df):
+    if not ('Route' in df.columns and 'total_cost' in df.columns):
+        return None
+
+    route_costs = df.groupby('Route').agg({
+        'total_cost': ['mean', 'sum', 'count'],
+    }).reset_index()
+    route_costs.columns = ['Route', 'Avg Cost', 'Total Cost', 'Orders']
+
+    if 'Distance_KM' in df.columns:
+        avg_distance = df.groupby('Route')['Distance_KM'].mean().reset_index()
+        route_costs = route_costs.merge(avg_distance, on='Route', how='left')
+        route_costs.columns = list(route_costs.columns[:-1]) + ['Avg Distance']
+
+    if 'cost_per_km' in df.columns:
+        cost_per_km = df.groupby('Route')['cost_per_km'].mean().reset_index()
+        route_costs = route_costs.merge(cost_per_km, on='Route', how='left')
+        route_costs.columns = list(route_costs.columns[:-1]) + ['Cost/KM']
+
+    if 'Traffic_Delay_Minutes' in df.columns:
+        avg_delay = df.groupby('Route')['Traffic_Delay_Minutes'].mean().reset_index()
+        route_costs = route_costs.merge(avg_delay, on='Route', how='left')
+        route_costs.columns = list(route_costs.columns[:-1]) + ['Avg Delay (min)']
+
+    return route_costs.sort_values('Total Cost', ascending=False)
+
+
+def product_cost_table(df):
+    if not ('Product_Category' in df.columns and 'total_cost' in df.columns):
+        return None
+
+    product_costs = df.groupby('Product_Category').agg({
+        'total_cost': ['sum', 'mean', 'count'],
+    }).reset_index()
+    product_costs.columns = ['Category', 'Total Cost', 'Avg Cost', 'Orders']
+
+    if 'Order_Value_INR' in df.columns:
+        revenue = df.groupby('Product_Category')['Order_Value_INR'].sum().reset_index()
+        product_costs = product_costs.merge(revenue, left_on='Category', right_on='Product_Category', how='left')
+        product_costs = product_costs.drop('Product_Category', axis=1)
+        product_costs.columns = list(product_costs.columns[:-1]) + ['Total Revenue']
+
+    if 'revenue_to_cost_ratio' in df.columns:
+        avg_roi = df.groupby('Product_Category')['revenue_to_cost_ratio'].mean().reset_index()
+        product_costs = product_costs.merge(avg_roi, left_on='Category', right_on='Product_Category', how='left')
+        product_costs = product_costs.drop('Product_Category', axis=1)
+        product_costs.columns = list(product_costs.columns[:-1]) + ['Avg ROI']
+
+    if 'Total Revenue' in product_costs.columns:
+        product_costs['Profit'] = product_costs['Total Revenue'] - product_costs['Total Cost']
+        product_costs['Profit Margin %'] = (product_costs['Profit'] / product_costs['Total Revenue']) * 100
+
+    return product_costs.sort_values('Total Cost', ascending=False)
+
+
+def cost_breakdown_tables(df, components):
+    if not components:
+        return None
+
+    summary = df[components].sum().reset_index()
+    summary.columns = ['Component', 'Total']
+    summary['Percentage'] = (summary['Total'] / summary['Total'].sum()) * 100
+    summary = summary.sort_values('Total', ascending=False)
+
+    daily = monthly = None
+    if 'Order_Date' in df.columns:
+        daily = df.groupby(df['Order_Date'].dt.date)[components].sum().reset_index()
+        month = df['Order_Date'].dt.to_period('M').astype(str).rename('Month')
+        monthly = df.groupby(month)[components].sum().reset_index()
+
+    stats = pd.DataFrame({
+        'Component': [component.replace('_', ' ').title() for component in components],
+        'Mean': df[components].mean().to_numpy(),
+        'Median': df[components].median().to_numpy(),
+        'Min': df[components].min().to_numpy(),
+        'Max': df[components].max().to_numpy(),
+        'Std Dev': df[components].std().to_numpy()
+    })
+    return {'summary': summary, 'daily': daily, 'monthly': monthly, 'stats': stats}
@@ -1,11 +1,16 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from datetime import datetime
 from config import COST_COMPONENTS
+from chart_sampling import downsample_series
+from changepoint import detect_changepoints
+from exports import show_export_controls
+from figure_cache import cached_figure, show_chart
+from instrumentation import instrumented
 
 
-def show_executive_dashboard(df, data):
+def show_executive_dashboard(df, data, data_key):
     st.header("📊 Executive Dashboard")
     st.markdown("**Real-time cost intelligence at a glance**")
 
@@ -29,6 +34,8 @@ def show_executive_dashboard(df, data):
 
     st.markdown("---")
 
+    changepoints = _cost_changepoints(data_key, df)
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -37,11 +44,11 @@ def show_executive_dashboard(df, data):
 
         if existing_components:
             cost_breakdown = df[existing_components].sum().sort_values(ascending=False)
-            fig = px.bar(x=cost_breakdown.values, y=cost_breakdown.index, orientation='h',
-                         labels={'x': 'Total Cost (₹)', 'y': 'Cost Category'},
-                         color=cost_breakdown.values, color_continuous_scale='Blues')
-            fig.update_layout(showlegend=False, height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            fig = cached_figure(px.bar, x=cost_breakdown.values, y=cost_breakdown.index, orientation='h',
+                                labels={'x': 'Total Cost (₹)', 'y': 'Cost Category'},
+                                color=cost_breakdown.values, color_continuous_scale='Blues',
+                                layout={'showlegend': False, 'height': 400})
+            show_chart(fig, use_container_width=True)
         else:
             st.warning("Cost breakdown data not available")
 
@@ -56,12 +63,13 @@ def show_executive_dashboard(df, data):
                         'total_cost'].sum().reset_index()
                     daily_costs.columns = ['Date', 'Total Cost']
                     daily_costs['Date'] = pd.to_datetime(daily_costs['Date'])
+                    daily_costs = downsample_series(daily_costs, 'Date', 'Total Cost')
 
                     if len(daily_costs) > 0:
-                        fig = px.line(daily_costs, x='Date', y='Total Cost', markers=True,
-                                      title='Daily Cost Trend')
-                        fig.update_layout(height=400, xaxis_title='Date', yaxis_title='Total Cost (₹)')
-                        st.plotly_chart(fig, use_container_width=True)
+                        shifts = _series_shifts(changepoints, 'All Routes', 'total_cost')
+                        fig = cached_figure(_changepoint_figure, daily_costs, shifts, 'Total Cost',
+                                            'Daily Cost Trend', 'Total Cost (₹)')
+                        show_chart(fig, use_container_width=True)
                     else:
                         st.info("No date data available for cost trend")
                 except Exception as e:
@@ -78,16 +86,19 @@ def show_executive_dashboard(df, data):
         with col1:
             priority_costs = df.groupby('Priority').agg({'total_cost': 'sum', 'Order_ID': 'count'}).reset_index()
             priority_costs.columns = ['Priority', 'Total Cost', 'Order Count']
-            fig = px.pie(priority_costs, values='Total Cost', names='Priority', title='Cost Distribution by Priority')
-            st.plotly_chart(fig, use_container_width=True)
+            fig = cached_figure(px.pie, priority_costs, values='Total Cost', names='Priority',
+                                title='Cost Distribution by Priority')
+            show_chart(fig, use_container_width=True)
 
         with col2:
             priority_avg = df.groupby('Priority')['total_cost'].mean().reset_index()
             priority_avg.columns = ['Priority', 'Avg Cost']
-            fig = px.bar(priority_avg, x='Priority', y='Avg Cost',
-                         title='Average Cost per Order by Priority',
-                         color='Avg Cost', color_continuous_scale='Reds')
-            st.plotly_chart(fig, use_container_width=True)
+            fig = cached_figure(px.bar, priority_avg, x='Priority', y='Avg Cost',
+                                title='Average Cost per Order by Priority',
+                                color='Avg Cost', color_continuous_scale='Reds')
+            show_chart(fig, use_container_width=True)
+
+    _show_regime_changes(df, changepoints)
 
     st.markdown("### 💡 Key Insights")
     insights = []
@@ -113,16 +124,75 @@ def show_executive_dashboard(df, data):
             best_vehicle = vehicle_efficiency.index[0]
             insights.append(f"🔸 {best_vehicle} vehicles have the lowest cost per kilometer")
 
+    overall_shifts = changepoints[changepoints['Series'] == 'All Routes']
+    if len(overall_shifts) > 0:
+        latest = overall_shifts.sort_values('Date').iloc[-1]
+        insights.append(f"🔸 {latest['Metric'].replace('_', ' ').title()} shifted {latest['Change %']:+.1f}% "
+                        f"from {latest['Date']:%d %b %Y}")
+
     for insight in insights:
         st.markdown(f'<div class="insight-box">{insight}</div>', unsafe_allow_html=True)
 
     st.markdown("---")
     col1, col2, col3 = st.columns([1, 1, 1])
     with col2:
-        csv = df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Download Full Report (CSV)",
-            data=csv,
-            file_name=f"nexgen_cost_report_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
\ No newline at end of file
+        show_export_controls(df, "Full Report", "nexgen_cost_report", data_key)
+
+
+@instrumented(cache=st.cache_data)
+def _cost_changepoints(data_key, _df):
+    return detect_changepoints(_df)
+
+
+def _series_shifts(changepoints, series, metric):
+    return changepoints[(changepoints['Series'] == series) & (changepoints['Metric'] == metric)]
+
+
+def _changepoint_figure(daily, shifts, y, title, yaxis_title):
+    fig = px.line(daily, x='Date', y=y, markers=True, title=title)
+    fig.update_layout(height=400, xaxis_title='Date', yaxis_title=yaxis_title)
+    for _, shift in shifts.iterrows():
+        fig.add_vline(x=shift['Date'].timestamp() * 1000, line_dash="dash", line_color="red",
+                      annotation_text=f"{shift['Change %']:+.0f}%", annotation_position="top left")
+    return fig
+
+
+def _show_regime_changes(df, changepoints):
+    st.markdown("### 🔀 Cost Regime Changes")
+    if len(changepoints) == 0:
+        st.info("No significant shifts detected in daily cost series")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Shifts Detected", len(changepoints))
+    with col2:
+        st.metric("Routes Affected", changepoints.loc[changepoints['Series'] != 'All Routes', 'Series'].nunique())
+    with col3:
+        st.metric("Latest Shift", f"{changepoints['Date'].max():%d %b %Y}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        metric = st.selectbox("Metric", changepoints['Metric'].unique(), key='regime_metric')
+    with col2:
+        series_options = changepoints.loc[changepoints['Metric'] == metric, 'Series'].unique()
+        series = st.selectbox("Series", series_options, key='regime_series')
+
+    scoped = df if series == 'All Routes' else df[df['Route'].astype(str) == series]
+    scoped = scoped.dropna(subset=['Order_Date'])
+    day = scoped['Order_Date'].dt.normalize()
+    if metric == 'cost_per_km':
+        daily = scoped.groupby(day)['total_cost'].sum() / scoped.groupby(day)['Distance_KM'].sum().replace(0, np.nan)
+    else:
+        daily = scoped.groupby(day)[metric].sum()
+    daily = daily.reset_index()
+    daily.columns = ['Date', 'Value']
+    daily = downsample_series(daily, 'Date', 'Value')
+
+    label = metric.replace('_', ' ').title()
+    fig = cached_figure(_changepoint_figure, daily, _series_shifts(changepoints, series, metric), 'Value',
+                        f"{label} - {series}", label)
+    show_chart(fig, use_container_width=True)
+
+    with st.expander("All detected shifts"):
+        st.dataframe(changepoints.sort_values(['Date', 'Series']), use_container_width=True)
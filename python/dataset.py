@@ -0,0 +1,195 @@
+import hashlib
+import os
+import pandas as pd
+import numpy as np
+from config import DATE_FORMATS, COST_COMPONENTS, FILTER_COLUMNS, UNASSIGNED_VEHICLE_TYPE
+from disk_cache import disk_cached
+from instrumentation import instrumented
+from vehicle_assignment import assign_vehicles
+
+# The loaded dataset is shared by every session and thread, so frames derived
+# from it must never write through to it. Under copy-on-write every derived
+# frame is a lazy copy and NumPy arrays taken from shared frames are read-only.
+pd.set_option('mode.copy_on_write', True)
+
+
+def parse_dates(date_series):
+    result = pd.to_datetime(date_series, errors='coerce', infer_datetime_format=True)
+
+    if result.isna().sum() > len(result) * 0.5:
+        for fmt in DATE_FORMATS:
+            try:
+                result = pd.to_datetime(date_series, format=fmt, errors='coerce')
+                if result.notna().sum() > len(result) * 0.5:
+                    break
+            except:
+                continue
+
+    return result
+
+
+def data_version(directory='data'):
+    # Names, sizes and modification times of the source CSVs: replacing a file
+    # gives a new version, which keys both the in-memory and on-disk snapshot.
+    digest = hashlib.blake2b(digest_size=16)
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.csv'):
+                stat = os.stat(os.path.join(directory, name))
+                digest.update(f'{name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()
+
+
+TABLE_FILES = {
+    'orders': 'orders.csv',
+    'delivery': 'delivery_performance.csv',
+    'costs': 'cost_breakdown.csv',
+    'routes': 'routes_distance.csv',
+    'fleet': 'vehicle_fleet.csv',
+    'warehouse': 'warehouse_inventory.csv',
+    'feedback': 'customer_feedback.csv'
+}
+
+
+@instrumented()
+def read_tables(directory='data'):
+    return {name: pd.read_csv(os.path.join(directory, filename)) for name, filename in TABLE_FILES.items()}
+
+
+@instrumented()
+def parse_table_dates(tables):
+    tables['orders']['Order_Date'] = parse_dates(tables['orders']['Order_Date'])
+    tables['delivery']['Promised_Delivery_Days'] = pd.to_numeric(tables['delivery']['Promised_Delivery_Days'],
+                                                                 errors='coerce')
+    tables['delivery']['Actual_Delivery_Days'] = pd.to_numeric(tables['delivery']['Actual_Delivery_Days'],
+                                                               errors='coerce')
+    tables['feedback']['Feedback_Date'] = parse_dates(tables['feedback']['Feedback_Date'])
+    tables['warehouse']['Last_Restocked_Date'] = parse_dates(tables['warehouse']['Last_Restocked_Date'])
+    return tables
+
+
+def build_dataset(directory='data'):
+    return merge_tables(parse_table_dates(read_tables(directory)))
+
+
+@instrumented()
+def merge_tables(tables):
+    orders, delivery, costs, routes = tables['orders'], tables['delivery'], tables['costs'], tables['routes']
+    fleet, warehouse, feedback = tables['fleet'], tables['warehouse'], tables['feedback']
+
+    main_df = orders.copy()
+
+    if 'Order_ID' in delivery.columns:
+        main_df = main_df.merge(delivery, on='Order_ID', how='left', suffixes=('', '_delivery'))
+
+    if 'Order_ID' in costs.columns:
+        main_df = main_df.merge(costs, on='Order_ID', how='left')
+
+    if 'Order_ID' in routes.columns:
+        main_df = main_df.merge(routes, on='Order_ID', how='left')
+
+    loads = pd.DataFrame()
+    if 'Vehicle_ID' not in main_df.columns and 'Vehicle_ID' in fleet.columns:
+        assignment, loads = assign_vehicles(main_df, fleet, routes)
+        main_df = main_df.join(assignment)
+
+    if 'Vehicle_ID' in main_df.columns and 'Vehicle_ID' in fleet.columns:
+        main_df = main_df.merge(fleet, on='Vehicle_ID', how='left', suffixes=('', '_fleet'))
+        if 'Vehicle_Type' in main_df.columns:
+            # Orders without a vehicle (none free, none refrigerated, no date or
+            # origin) get an explicit type: the Vehicle Type filter only offers
+            # non-null values and would otherwise drop them from every total.
+            main_df['Vehicle_Type'] = main_df['Vehicle_Type'].fillna(UNASSIGNED_VEHICLE_TYPE)
+
+    existing_cost_cols = [col for col in COST_COMPONENTS if col in main_df.columns]
+
+    if existing_cost_cols:
+        main_df['total_cost'] = main_df[existing_cost_cols].sum(axis=1)
+    else:
+        return None
+
+    if 'Distance_KM' in main_df.columns and 'total_cost' in main_df.columns:
+        main_df['cost_per_km'] = main_df['total_cost'] / main_df['Distance_KM'].replace(0, np.nan)
+
+    if 'Order_Value_INR' in main_df.columns and 'total_cost' in main_df.columns:
+        main_df['revenue_to_cost_ratio'] = main_df['Order_Value_INR'] / main_df['total_cost'].replace(0, np.nan)
+
+    if 'Actual_Delivery_Days' in main_df.columns and 'Promised_Delivery_Days' in main_df.columns:
+        main_df['delivery_delay_days'] = main_df['Actual_Delivery_Days'] - main_df['Promised_Delivery_Days']
+
+    return {
+        'main': main_df,
+        'orders': orders,
+        'delivery': delivery,
+        'costs': costs,
+        'routes': routes,
+        'fleet': fleet,
+        'loads': loads,
+        'warehouse': warehouse,
+        'feedback': feedback
+    }
+
+
+def _canonical_object_columns(frame):
+    # Unpickled object arrays carry a non-canonical dtype instance, and pandas
+    # 2.1.1's astype(str) then writes 'nan' into the source array in place,
+    # which would corrupt a snapshot shared by every session. Fresh arrays
+    # hold the same objects.
+    columns = {}
+    for col in frame.columns[frame.dtypes == object]:
+        values = np.empty(len(frame), dtype=object)
+        values[:] = frame[col].to_numpy()
+        columns[col] = values
+    return frame.assign(**columns) if columns else frame
+
+
+def load_dataset(version=None, directory='data'):
+    # The built snapshot is pickled to disk, so a restarted app, a batch job
+    # or a worker process skips parsing, merging and vehicle assignment.
+    data = disk_cached(build_dataset, directory, key=version or data_version(directory))
+    if data is None:
+        return None
+    return {name: _canonical_object_columns(frame) for name, frame in data.items()}
+
+
+def filter_orders(main_df, date_range=None, **selections):
+    # `selections` maps a column to the values to keep; empty selections and
+    # incomplete date ranges leave the frame unfiltered, as in the sidebar.
+    mask = pd.Series(True, index=main_df.index)
+    if date_range is not None and len(date_range) == 2 and 'Order_Date' in main_df.columns:
+        mask &= ((main_df['Order_Date'] >= pd.Timestamp(date_range[0])) &
+                 (main_df['Order_Date'] <= pd.Timestamp(date_range[1])))
+    for column, values in selections.items():
+        if values is not None and len(values) > 0 and column in main_df.columns:
+            mask &= main_df[column].isin(values)
+    if mask.all():
+        return main_df.copy(deep=False)
+    return main_df[mask]
+
+
+def default_filters(main_df):
+    # The filter values the sidebar starts with.
+    filters = {}
+    if 'Order_Date' in main_df.columns and not main_df['Order_Date'].isna().all():
+        filters['date_range'] = (main_df['Order_Date'].min().date(), main_df['Order_Date'].max().date())
+    for column, _ in FILTER_COLUMNS:
+        if column in main_df.columns:
+            filters[column] = list(main_df[column].dropna().unique())
+    return filters
+
+
+def filter_key(version, filters):
+    # Stands in for the filtered frame as a cache key: the snapshot version plus
+    # the filter values, sorted so the order they were picked in doesn't
+    # matter. Its size depends on the number of selected values, not on rows.
+    return (version,) + tuple((name, tuple(map(str, value)) if name == 'date_range' else tuple(sorted(map(str, value))))
+                              for name, value in sorted(filters.items()) if value is not None)
+
+
+def frame_fingerprint(df):
+    # Content hash of a (filtered) frame, cheap enough to recompute on every rerun
+    # and stable across reruns that select the same rows.
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(','.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
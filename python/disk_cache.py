@@ -0,0 +1,76 @@
+import hashlib
+import os
+import pickle
+import uuid
+from figure_cache import update_digest
+from instrumentation import stage, record_cache
+from config import DISK_CACHE_DIR, DISK_CACHE_MAX_FILES
+
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def prune_directory(directory, keep):
+    files = sorted((entry for entry in os.scandir(directory) if entry.is_file()),
+                   key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in files[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def code_version(directory=SOURCE_DIR):
+    # Digest of every module next to this one, config.py included: a cached
+    # function's result also depends on the helpers it calls and the constants
+    # it reads, none of which show up in its own bytecode.
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py'):
+            with open(os.path.join(directory, name), 'rb') as handle:
+                digest.update(name.encode())
+                digest.update(handle.read())
+    return digest.hexdigest()
+
+
+CODE_VERSION = code_version()
+
+
+def artifact_path(func, *args, key=None, directory=DISK_CACHE_DIR):
+    # Keyed by the function's name, the code version, its arguments (frames by
+    # content) and an optional extra `key` for inputs it reads itself, so the
+    # app and warmup.py resolve the same call to the same file and any deploy
+    # that changes a module or a config value starts from fresh artifacts.
+    digest = hashlib.blake2b(digest_size=16)
+    update_digest((f'{func.__module__}.{func.__qualname__}', CODE_VERSION, args, key), digest)
+    return os.path.join(directory, f'{func.__name__}-{digest.hexdigest()}.pkl')
+
+
+def disk_cached(func, *args, key=None, directory=DISK_CACHE_DIR):
+    with stage(func.__name__, cached=True):
+        return _load_or_compute(func, args, key, directory)
+
+
+def _load_or_compute(func, args, key, directory):
+    path = artifact_path(func, *args, key=key, directory=directory)
+    try:
+        with open(path, 'rb') as handle:
+            value = pickle.load(handle)
+        os.utime(path)
+        record_cache('disk')
+        return value
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass
+
+    record_cache('miss')
+    value = func(*args)
+    os.makedirs(directory, exist_ok=True)
+    partial = f'{path}.{uuid.uuid4().hex}.part'
+    try:
+        with open(partial, 'wb') as handle:
+            pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    prune_directory(directory, DISK_CACHE_MAX_FILES)
+    return value
@@ -0,0 +1,102 @@
+import gzip
+import os
+import uuid
+from datetime import datetime
+import streamlit as st
+from dataset import frame_fingerprint
+from disk_cache import prune_directory
+from config import EXPORT_FORMATS, EXPORT_CHUNK_ROWS, EXPORT_CACHE_DIR, EXPORT_CACHE_MAX_FILES
+
+EXCEL_MAX_ROWS = 1048575
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def _write_csv_gz(df, path, chunk_rows):
+    with gzip.open(path, 'wt', encoding='utf-8', newline='') as handle:
+        for start, chunk in _chunks(df, chunk_rows):
+            chunk.to_csv(handle, header=start == 0, index=False)
+
+
+def _write_parquet(df, path, chunk_rows):
+    df.to_parquet(path, index=False, row_group_size=chunk_rows)
+
+
+def _write_xlsx(df, path, chunk_rows):
+    # Write-only workbooks stream rows to disk; frames past Excel's row limit
+    # continue on additional sheets.
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = None
+    for start, chunk in _chunks(df, chunk_rows):
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for offset, row in enumerate(values.itertuples(index=False, name=None)):
+            if sheet is None or (start + offset) % EXCEL_MAX_ROWS == 0:
+                sheet = workbook.create_sheet(f'Sheet{len(workbook.worksheets) + 1}')
+                sheet.append([str(col) for col in df.columns])
+            sheet.append(row)
+    if sheet is None:
+        workbook.create_sheet('Sheet1').append([str(col) for col in df.columns])
+    workbook.save(path)
+
+
+WRITERS = {'csv.gz': _write_csv_gz, 'parquet': _write_parquet, 'xlsx': _write_xlsx}
+
+
+def export_frame(df, extension, fingerprint=None, directory=EXPORT_CACHE_DIR, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Artifacts are named by frame fingerprint, so the same filtered frame is
+    # only serialised once per format. Files are written under a temporary name
+    # and renamed into place, so a concurrent reader never sees a partial file.
+    fingerprint = fingerprint or frame_fingerprint(df)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{fingerprint}.{extension}')
+    if not os.path.exists(path):
+        partial = f'{path}.{uuid.uuid4().hex}.part'
+        try:
+            WRITERS[extension](df, partial, chunk_rows)
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        prune_directory(directory, EXPORT_CACHE_MAX_FILES)
+    else:
+        os.utime(path)
+    return path
+
+
+def _prepare_export(df, key, source):
+    # The frame is only hashed here, to name the artifact; renders compare the
+    # cheap `source` key instead.
+    extension, _ = EXPORT_FORMATS[st.session_state[f'{key}_format']]
+    st.session_state[key] = (source, extension, export_frame(df, extension))
+
+
+def show_export_controls(df, label, file_prefix, data_key, tag=None, key=None):
+    # Nothing is serialised until "Prepare" is clicked; the download button only
+    # appears once an artifact for the current rows and format exists. The rows
+    # are identified by the page's data_key, the table and any extra inputs the
+    # caller passes as `tag`.
+    key = key or f'{file_prefix}_export'
+    source = (data_key, file_prefix, tag)
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        format_name = st.selectbox("Export format", list(EXPORT_FORMATS), key=f'{key}_format')
+    with col2:
+        st.button(f"⚙️ Prepare {label}", key=f'{key}_prepare', on_click=_prepare_export,
+                  args=(df, key, source))
+
+    extension, mime = EXPORT_FORMATS[format_name]
+    prepared = st.session_state.get(key)
+    if prepared and prepared[:2] == (source, extension) and os.path.exists(prepared[2]):
+        with open(prepared[2], 'rb') as handle:
+            st.download_button(
+                label=f"📥 Download {label}",
+                data=handle,
+                file_name=f"{file_prefix}_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                mime=mime,
+                key=f'{key}_download'
+            )
+        st.caption(f"{len(df):,} rows, {os.path.getsize(prepared[2]) / 1024:,.0f} KB")
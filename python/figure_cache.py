@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from instrumentation import stage, record_cache
+from config import FIGURE_CACHE_SIZE
+
+
+def update_digest(value, digest):
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr((list(value.columns), value.index.name)).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, pd.Index):
+        update_digest(value.to_series(), digest)
+    elif isinstance(value, pd.Series):
+        digest.update(repr(value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype.str, value.shape)).encode())
+        update_digest(pd.Series(value.ravel()), digest)
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            update_digest(item, digest)
+    elif isinstance(value, dict):
+        digest.update(f'dict{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            update_digest(value[key], digest)
+    elif callable(value):
+        digest.update(f'{getattr(value, "__module__", "")}.{getattr(value, "__qualname__", repr(value))}'.encode())
+    else:
+        digest.update(repr(value).encode())
+
+
+class FigureCache:
+    # Keys are a digest of the builder, the (small, already aggregated) input
+    # tables and every chart parameter, so identical charts across reruns and
+    # sessions share one Figure. Cached figures must not be mutated by callers;
+    # post-build tweaks go through `layout`, `xaxes` and `traces` so they are
+    # part of the key.
+
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def get(self, build, *data, layout=None, xaxes=None, traces=None, **params):
+        with stage(f'figure:{getattr(build, "__name__", "build")}', cached=True):
+            return self._get(build, data, params, layout, xaxes, traces)
+
+    def _get(self, build, data, params, layout, xaxes, traces):
+        digest = hashlib.blake2b(digest_size=16)
+        update_digest((build, data, params, layout, xaxes, traces), digest)
+        key = digest.hexdigest()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += entry[1]
+                return entry[0]
+
+        record_cache('miss')
+        started = time.perf_counter()
+        fig = build(*data, **params)
+        if layout:
+            fig.update_layout(**layout)
+        if xaxes:
+            fig.update_xaxes(**xaxes)
+        if traces:
+            fig.update_traces(**traces)
+        seconds = time.perf_counter() - started
+
+        with self.lock:
+            self.misses += 1
+            self.build_seconds += seconds
+            self.entries[key] = (fig, seconds)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return fig
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'build_seconds': self.build_seconds,
+                'saved_seconds': self.saved_seconds
+            }
+
+
+figure_cache = FigureCache()
+
+
+def cached_figure(build, *data, **params):
+    return figure_cache.get(build, *data, **params)
+
+
+def figure_cache_stats():
+    return figure_cache.stats()
+
+
+def show_chart(fig, **kwargs):
+    # st.plotly_chart under its own stage, which is mostly Plotly's JSON
+    # serialisation of the figure.
+    import streamlit as st
+    with stage('plotly_chart'):
+        st.plotly_chart(fig, **kwargs)
@@ -0,0 +1,120 @@
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from config import FUEL_HISTOGRAM_BINS, FUEL_INEFFICIENT_RATIO, FUEL_PERCENTILES, FUEL_BREAKDOWN_COLS
+
+
+def _column(df, col):
+    # to_numpy on a float64 column is a view, so this does not copy the frame
+    return df[col].to_numpy(dtype=float, copy=False)
+
+
+def _group_breakdown(df, col, valid, efficiency, inefficient, distance, fuel):
+    codes, labels = pd.factorize(df[col], sort=True)
+    keep = valid & (codes >= 0)
+    codes = codes[keep]
+    k = len(labels)
+    orders = np.bincount(codes, minlength=k)
+    table = pd.DataFrame({
+        col: labels,
+        'Orders': orders,
+        'Distance_KM': np.bincount(codes, distance[keep], k),
+        'Fuel_L': np.bincount(codes, fuel[keep], k),
+        'Avg km/L': np.bincount(codes, efficiency[keep], k) / np.maximum(orders, 1),
+        'Inefficient Orders': np.bincount(codes, inefficient[keep], k).astype(int)
+    })
+    table['Fleet km/L'] = table['Distance_KM'] / table['Fuel_L'].replace(0, np.nan)
+    table['Inefficient %'] = table['Inefficient Orders'] / table['Orders'].replace(0, np.nan) * 100
+    return table[table['Orders'] > 0].sort_values('Avg km/L').reset_index(drop=True)
+
+
+def fuel_efficiency_stats(df, bins=FUEL_HISTOGRAM_BINS, ratio=FUEL_INEFFICIENT_RATIO,
+                          percentiles=FUEL_PERCENTILES, breakdown_cols=FUEL_BREAKDOWN_COLS):
+    # Works on column views plus the km/L array itself: no frame copy, no helper
+    # column, and the histogram is returned as bin counts instead of raw values.
+    distance = _column(df, 'Distance_KM')
+    fuel = _column(df, 'Fuel_Consumption_L')
+
+    efficiency = np.full(len(df), np.nan)
+    np.divide(distance, fuel, out=efficiency, where=fuel != 0)
+    valid = np.isfinite(efficiency)
+    observed = efficiency[valid]
+    if not len(observed):
+        return None
+
+    avg_efficiency = observed.mean()
+    inefficient = np.zeros(len(df), dtype=bool)
+    np.less(efficiency, avg_efficiency * ratio, out=inefficient, where=valid)
+
+    counts, edges = np.histogram(observed, bins=bins)
+    histogram = pd.DataFrame({'low': edges[:-1], 'high': edges[1:], 'orders': counts})
+
+    return {
+        'avg_efficiency': avg_efficiency,
+        'fleet_efficiency': distance[valid].sum() / fuel[valid].sum(),
+        'percentiles': dict(zip(percentiles, np.percentile(observed, percentiles))),
+        'inefficient_orders': int(inefficient.sum()),
+        'histogram': histogram,
+        'breakdowns': {col: _group_breakdown(df, col, valid, efficiency, inefficient, distance, fuel)
+                       for col in breakdown_cols if col in df.columns}
+    }
+
+
+def _copy_based_stats(df):
+    # The original implementation, kept as the baseline for benchmark()
+    df_fuel = df.copy()
+    df_fuel['fuel_efficiency'] = df_fuel['Distance_KM'] / df_fuel['Fuel_Consumption_L'].replace(0, np.nan)
+    avg_efficiency = df_fuel['fuel_efficiency'].mean()
+    inefficient_orders = df_fuel[df_fuel['fuel_efficiency'] < avg_efficiency * 0.8]
+    values = df_fuel.dropna(subset=['fuel_efficiency'])['fuel_efficiency']
+    return avg_efficiency, len(inefficient_orders), np.histogram(values, bins=FUEL_HISTOGRAM_BINS)[0]
+
+
+def synthetic_orders(rows, extra_columns=8, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = {
+        'Distance_KM': rng.gamma(4.0, 150.0, rows),
+        'Fuel_Consumption_L': rng.gamma(6.0, 12.0, rows),
+        'Fuel_Cost': rng.gamma(6.0, 1200.0, rows),
+        'Route': pd.Categorical.from_codes(rng.integers(0, 500, rows), [f'R{i:03d}' for i in range(500)]),
+        'Vehicle_Type': pd.Categorical.from_codes(rng.integers(0, 5, rows),
+                                                  ['Small Van', 'Large Truck', 'Refrigerated', 'Express Bike',
+                                                   'Medium Truck'])
+    }
+    for i in range(extra_columns):
+        frame[f'metric_{i}'] = rng.random(rows)
+    return pd.DataFrame(frame)
+
+
+def _measure(func, df):
+    tracemalloc.start()
+    started = time.perf_counter()
+    func(df)
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def benchmark(sizes=(1000000, 10000000), extra_columns=8, seed=0):
+    rows = []
+    for n in sizes:
+        df = synthetic_orders(n, extra_columns, seed)
+        frame_mb = df.memory_usage(deep=True).sum() / 1e6
+        for name, func in [('copy-based', _copy_based_stats), ('fuel_efficiency_stats', fuel_efficiency_stats)]:
+            seconds, peak = _measure(func, df)
+            rows.append({'rows': n, 'implementation': name, 'frame_mb': frame_mb,
+                         'peak_mb': peak / 1e6, 'seconds': seconds})
+        del df
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare peak memory of the fuel efficiency analysis')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000000, 10000000])
+    parser.add_argument('--extra-columns', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(benchmark(args.rows, args.extra_columns, args.seed).to_string(index=False))
@@ -0,0 +1,76 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import pandas as pd
+
+PAGE_MODULES = ['dashboard_functions', 'cost_analysis_functions', 'anomaly_functions', 'predictive_functions',
+                'optimization_functions', 'scenario_functions']
+HEAVY_PACKAGES = ['sklearn', 'scipy', 'plotly.express', 'plotly.graph_objects', 'openpyxl', 'pyarrow']
+
+_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def _run(code):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return result
+
+
+def import_times(code):
+    # Each -X importtime line is "self | cumulative | <indent>module", in
+    # microseconds, with nesting shown by indentation (two spaces per level).
+    rows = []
+    for line in _run(code).stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append({'module': module, 'depth': (len(indent) - 1) // 2,
+                         'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000})
+    return pd.DataFrame(rows, columns=['module', 'depth', 'self_ms', 'cumulative_ms'])
+
+
+def page_import_costs(base='main', pages=PAGE_MODULES):
+    # Cost of importing each page module in a fresh process that has already
+    # imported `base`, i.e. what the first visit to that page adds.
+    rows = []
+    for page in pages:
+        times = import_times(f'import {base}; import {page}')
+        loaded = set(times['module'])
+        top = times[times['depth'] == 0].set_index('module')['cumulative_ms']
+        rows.append({
+            'page': page,
+            'import_ms': top.get(page, 0.0),
+            'heavy_packages': ', '.join(name for name in HEAVY_PACKAGES if name in loaded) or '-'
+        })
+    return pd.DataFrame(rows)
+
+
+def startup_report(base='main', top=15):
+    # Direct imports of `base`, most expensive first. importtime prints children
+    # before their parent, so they are the depth-1 lines after the previous root.
+    times = import_times(f'import {base}')
+    roots = times.index[times['depth'] == 0]
+    end = roots[times.loc[roots, 'module'].eq(base).to_numpy()][-1]
+    start = roots[roots < end].max() + 1 if (roots < end).any() else 0
+    subtree = times.loc[start:end]
+    total = times.loc[end, 'cumulative_ms']
+    children = subtree[subtree['depth'] == 1].sort_values('cumulative_ms', ascending=False)
+    heavy = [name for name in HEAVY_PACKAGES if name in set(times['module'])]
+    return total, children.head(top), heavy
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report import-time cost of app startup and of each page')
+    parser.add_argument('--base', default='main')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    total, children, heavy = startup_report(args.base, args.top)
+    print(f"import {args.base}: {total:,.0f} ms; heavy packages loaded: {', '.join(heavy) or 'none'}")
+    print(children[['module', 'self_ms', 'cumulative_ms']].to_string(index=False))
+    print()
+    print(page_import_costs(args.base).to_string(index=False))
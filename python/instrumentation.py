@@ -0,0 +1,155 @@
+import contextvars
+import datetime
+import functools
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from config import STAGE_LOG_FILE, STAGE_LOG_MAX_BYTES, STAGE_LOG_BACKUPS
+
+# The active run and the innermost open stage live in context variables, so
+# concurrent sessions keep separate stacks and work submitted to a thread pool
+# with a copied context nests under the stage that submitted it.
+_run = contextvars.ContextVar('stage_run', default=None)
+_current = contextvars.ContextVar('stage', default=None)
+_sequence = itertools.count()
+_memory_lock = threading.Lock()
+_memory_runs = 0
+_log_lock = threading.Lock()
+logger = logging.getLogger('stages')
+
+
+def _logger():
+    with _log_lock:
+        if not logger.handlers:
+            os.makedirs(os.path.dirname(STAGE_LOG_FILE) or '.', exist_ok=True)
+            handler = RotatingFileHandler(STAGE_LOG_FILE, maxBytes=STAGE_LOG_MAX_BYTES, backupCount=STAGE_LOG_BACKUPS)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+    return logger
+
+
+def start_run(**fields):
+    # Stages are only recorded inside a run; outside one (batch jobs, the API,
+    # benchmarks) `stage` costs a context variable lookup.
+    run = {'id': uuid.uuid4().hex[:12], 'fields': fields, 'stages': []}
+    _run.set(run)
+    return run
+
+
+@contextmanager
+def track_memory(enabled):
+    # tracemalloc is process-wide and slows allocation-heavy code, so it only
+    # runs while some run that asked for peak allocations is in progress. Runs
+    # are counted in and out, so a closed tab cannot leave it switched on.
+    global _memory_runs
+    if not enabled:
+        yield
+        return
+    with _memory_lock:
+        _memory_runs += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    try:
+        yield
+    finally:
+        with _memory_lock:
+            _memory_runs -= 1
+            if not _memory_runs and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+
+def record_cache(status):
+    # 'hit' (in memory), 'disk' (loaded from the artifact cache) or 'miss'
+    # (computed), set on the innermost stage that wraps a cache.
+    record = _current.get()
+    while record is not None and record['cache'] is None:
+        record = record['_parent']
+    if record is not None:
+        record['cache'] = status
+
+
+@contextmanager
+def stage(name, cached=False):
+    run = _run.get()
+    if run is None:
+        yield None
+        return
+
+    parent = _current.get()
+    record = {'stage': name, 'parent': parent['stage'] if parent else None,
+              'depth': parent['depth'] + 1 if parent else 0, 'seq': next(_sequence),
+              'cache': 'hit' if cached else None, '_parent': parent}
+    memory = tracemalloc.is_tracing()
+    if memory:
+        # Peaks are tracked per stage by resetting the global peak on entry,
+        # after handing the peak seen so far to the enclosing stage.
+        with _memory_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                parent['_peak'] = max(parent.get('_peak', 0), peak)
+            tracemalloc.reset_peak()
+        record['_start'] = record['_peak'] = current
+
+    token = _current.set(record)
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        yield record
+    except BaseException as e:
+        record['error'] = type(e).__name__
+        raise
+    finally:
+        record['wall_ms'] = (time.perf_counter() - started) * 1000
+        record['cpu_ms'] = (time.thread_time() - cpu_started) * 1000
+        _current.reset(token)
+        record['peak_mb'] = None
+        if memory and tracemalloc.is_tracing():
+            with _memory_lock:
+                peak = max(record['_peak'], tracemalloc.get_traced_memory()[1])
+                if parent is not None:
+                    parent['_peak'] = max(parent.get('_peak', 0), peak)
+            record['peak_mb'] = (peak - record['_start']) / 1e6
+        _finish(run, record)
+
+
+def _finish(run, record):
+    row = {key: value for key, value in record.items() if not key.startswith('_')}
+    run['stages'].append(row)
+    _logger().info(json.dumps({'time': datetime.datetime.now().isoformat(timespec='milliseconds'),
+                               'run': run['id'], **run['fields'], **row}, default=str))
+
+
+def instrumented(name=None, cache=None):
+    # Times every call as a stage. `cache` is a caching decorator such as
+    # st.cache_data: it is applied underneath, and the stage reports a hit
+    # unless the function body actually runs.
+    def decorate(func):
+        label = name or func.__name__.lstrip('_')
+        body = func
+        if cache is not None:
+            @functools.wraps(func)
+            def body(*args, **kwargs):
+                record_cache('miss')
+                return func(*args, **kwargs)
+            body = cache(body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(label, cached=cache is not None):
+                return body(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def run_in_context(func, *args):
+    # For pool.submit: runs `func` under the caller's run and stage.
+    return functools.partial(contextvars.copy_context().run, func, *args)
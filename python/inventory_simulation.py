@@ -0,0 +1,182 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from config import (INVENTORY_HORIZON_DAYS, INVENTORY_LEAD_TIME_DAYS, INVENTORY_DEMAND_SCALE,
+                    INVENTORY_ORDER_UP_TO_MULTIPLIER, INVENTORY_ORDER_COST, INVENTORY_STORAGE_COST_PERIOD_DAYS)
+
+
+def build_inventory_state(warehouse_df, orders_df, demand_scale=INVENTORY_DEMAND_SCALE):
+    # One row per warehouse x category. Daily demand comes from orders of that
+    # category shipped from the warehouse's city; demand from cities without a
+    # warehouse is shared by every warehouse stocking the category in
+    # proportion to its stock. A weekday profile shapes the daily rate.
+    needed = ['Warehouse_ID', 'Product_Category', 'Current_Stock_Units', 'Reorder_Level']
+    if any(col not in warehouse_df.columns for col in needed):
+        return None
+    skus = warehouse_df.dropna(subset=needed).reset_index(drop=True)
+    if skus.empty:
+        return None
+
+    stock = skus['Current_Stock_Units'].to_numpy(dtype=float)
+    reorder = skus['Reorder_Level'].to_numpy(dtype=float)
+    cost = skus['Storage_Cost_per_Unit'].fillna(0).to_numpy(dtype=float) \
+        if 'Storage_Cost_per_Unit' in skus.columns else np.zeros(len(skus))
+    category = skus['Product_Category'].astype(str)
+    location = skus['Location'].astype(str) if 'Location' in skus.columns else pd.Series('', index=skus.index)
+
+    rate = np.zeros(len(skus))
+    weekday = np.ones(7)
+    orders = orders_df.dropna(subset=[col for col in ['Order_Date', 'Product_Category'] if col in orders_df.columns]) \
+        if 'Product_Category' in orders_df.columns and 'Order_Date' in orders_df.columns else orders_df.iloc[0:0]
+    if len(orders):
+        days = max((orders['Order_Date'].max() - orders['Order_Date'].min()).days + 1, 1)
+        origin = orders['Origin'].astype(str) if 'Origin' in orders.columns else pd.Series('', index=orders.index)
+        per_day = pd.crosstab(origin, orders['Product_Category'].astype(str)) / days * demand_scale
+
+        local = per_day.stack().reindex(pd.MultiIndex.from_arrays([location, category])).fillna(0).to_numpy()
+        stocked_cities = set(location)
+        remote = per_day[~per_day.index.isin(stocked_cities)].sum()
+        share = stock / pd.Series(stock).groupby(category.to_numpy()).transform('sum').replace(0, np.nan).to_numpy()
+        rate = local + remote.reindex(category).fillna(0).to_numpy() * np.nan_to_num(share)
+
+        counts = orders['Order_Date'].dt.dayofweek.value_counts().reindex(range(7), fill_value=0).to_numpy(dtype=float)
+        if counts.sum() > 0:
+            weekday = counts / counts.mean()
+
+    start = pd.Timestamp.today().normalize()
+    if 'Last_Restocked_Date' in skus.columns and skus['Last_Restocked_Date'].notna().any():
+        start = pd.to_datetime(skus['Last_Restocked_Date']).max().normalize() + pd.Timedelta(days=1)
+
+    return {
+        'warehouse': skus['Warehouse_ID'].to_numpy(),
+        'category': category.to_numpy(),
+        'stock': stock,
+        'reorder': reorder,
+        'cost': cost,
+        'rate': rate,
+        'weekday': weekday,
+        'start': start
+    }
+
+
+def simulate_inventory(state, horizon=INVENTORY_HORIZON_DAYS, lead_time=INVENTORY_LEAD_TIME_DAYS,
+                       order_up_to=INVENTORY_ORDER_UP_TO_MULTIPLIER, order_cost=INVENTORY_ORDER_COST,
+                       cost_period=INVENTORY_STORAGE_COST_PERIOD_DAYS):
+    # Every SKU advances one day per step as whole-array operations:
+    # receive due replenishments, serve demand (unmet demand is lost), then
+    # reorder up to `order_up_to` x Reorder_Level wherever the inventory
+    # position (on hand + on order) has fallen to the reorder level.
+    # The only Python loop is over days.
+    started = time.perf_counter()
+    stock = state['stock'].copy()
+    reorder = state['reorder']
+    target = np.maximum(reorder * order_up_to, reorder + 1)
+    daily_cost = state['cost'] / cost_period
+    K = len(stock)
+    first_weekday = state['start'].dayofweek
+    demand_by_day = state['rate'][:, None] * np.roll(state['weekday'], -first_weekday)[np.arange(horizon) % 7][None, :]
+
+    pipeline = np.zeros((K, horizon + lead_time + 1))
+    on_order = np.zeros(K)
+    levels = np.empty((K, horizon))
+    reorders = np.zeros(K, dtype=np.int64)
+    lost = np.zeros(K)
+    stockout_days = np.zeros(K, dtype=np.int64)
+    first_reorder = np.full(K, -1)
+    first_stockout = np.full(K, -1)
+
+    for day in range(horizon):
+        arriving = pipeline[:, day]
+        stock += arriving
+        on_order -= arriving
+
+        demand = demand_by_day[:, day]
+        served = np.minimum(stock, demand)
+        stock -= served
+        short = demand - served
+        lost += short
+        out = short > 1e-9
+        stockout_days += out
+        first_stockout[out & (first_stockout < 0)] = day
+
+        position = stock + on_order
+        trigger = position <= reorder
+        if trigger.any():
+            quantity = np.where(trigger, target - position, 0.0)
+            pipeline[:, day + lead_time] += quantity
+            on_order += quantity
+            reorders += trigger
+            first_reorder[trigger & (first_reorder < 0)] = day
+
+        levels[:, day] = stock
+
+    storage_cost = levels @ np.ones(horizon) * daily_cost
+    return {
+        'levels': levels,
+        'storage_cost': storage_cost,
+        'reorders': reorders,
+        'order_cost': reorders * order_cost,
+        'lost_units': lost,
+        'stockout_days': stockout_days,
+        'first_reorder': first_reorder,
+        'first_stockout': first_stockout,
+        'dates': pd.date_range(state['start'], periods=horizon, freq='D'),
+        'seconds': time.perf_counter() - started
+    }
+
+
+def inventory_summary_table(state, result):
+    dates = result['dates']
+
+    def to_date(days):
+        return pd.Series(np.where(days >= 0, dates[np.maximum(days, 0)], pd.NaT), dtype='datetime64[ns]')
+
+    return pd.DataFrame({
+        'Warehouse_ID': state['warehouse'],
+        'Product_Category': state['category'],
+        'Current Stock': state['stock'],
+        'Reorder Level': state['reorder'],
+        'Daily Demand': state['rate'],
+        'Ending Stock': result['levels'][:, -1],
+        'Reorders': result['reorders'],
+        'First Reorder': to_date(result['first_reorder']),
+        'Stockout Days': result['stockout_days'],
+        'First Stockout': to_date(result['first_stockout']),
+        'Lost Units': result['lost_units'],
+        'Storage Cost': result['storage_cost'],
+        'Order Cost': result['order_cost']
+    })
+
+
+def synthetic_state(n_skus, seed=0):
+    rng = np.random.default_rng(seed)
+    stock = rng.integers(500, 5000, n_skus).astype(float)
+    return {
+        'warehouse': np.array([f'WH{i // 7:05d}' for i in range(n_skus)]),
+        'category': np.array([f'CAT{i % 7}' for i in range(n_skus)]),
+        'stock': stock,
+        'reorder': np.round(stock * rng.uniform(0.1, 0.4, n_skus)),
+        'cost': rng.uniform(5, 45, n_skus),
+        'rate': rng.uniform(5, 80, n_skus),
+        'weekday': rng.uniform(0.7, 1.3, 7),
+        'start': pd.Timestamp('2025-01-01')
+    }
+
+
+def benchmark(sizes=(1000, 5000, 20000), horizon=365, seed=0):
+    rows = []
+    for n in sizes:
+        result = simulate_inventory(synthetic_state(n, seed), horizon=horizon)
+        rows.append({'skus': n, 'days': horizon, 'reorders': int(result['reorders'].sum()),
+                     'stockout_sku_days': int(result['stockout_days'].sum()), 'seconds': result['seconds']})
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the inventory simulation')
+    parser.add_argument('--skus', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(benchmark(args.skus, args.days, args.seed).to_string(index=False))
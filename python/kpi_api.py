@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import datetime
+import json
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+import pandas as pd
+from config import FILTER_COLUMNS, KPI_API_HOST, KPI_API_PORT, KPI_API_CACHE_SIZE
+from cost_analysis_engine import route_cost_table
+from dataset import load_dataset, filter_orders, default_filters, filter_key
+from optimization_engine import analysis_jobs, run_analyses, priority_analysis
+from scenario_engine import compute_scenario_base, combined_impact
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+def kpi_summary(df, data):
+    # Same definitions as the Executive Dashboard header.
+    return {
+        'orders': len(df),
+        'total_cost': df['total_cost'].sum() if 'total_cost' in df.columns else 0,
+        'avg_cost_per_order': df['total_cost'].mean() if 'total_cost' in df.columns else 0,
+        'avg_cost_per_km': df['cost_per_km'].mean() if 'cost_per_km' in df.columns else 0,
+        'avg_revenue_to_cost': df['revenue_to_cost_ratio'].mean() if 'revenue_to_cost_ratio' in df.columns else 0,
+        'revenue': df['Order_Value_INR'].sum() if 'Order_Value_INR' in df.columns else None
+    }
+
+
+def route_rollup(df, data):
+    return route_cost_table(df)
+
+
+def priority_rollup(df, data):
+    result = priority_analysis(df)
+    return result['table'] if result is not None else None
+
+
+def savings_estimates(df, data):
+    results = dict(run_analyses(analysis_jobs(df, data)))
+    opportunities = [result['opportunity'] for result in results.values()
+                     if result is not None and result['opportunity'] is not None]
+    impact = combined_impact(compute_scenario_base(df))
+    return {
+        'opportunities': opportunities,
+        'opportunity_savings': sum(opportunity['savings'] for opportunity in opportunities),
+        'combined_savings': impact['areas'] if impact is not None else {},
+        'combined_total': impact['savings'] if impact is not None else 0,
+        'combined_reduction_pct': impact['reduction_pct'] if impact is not None else 0
+    }
+
+
+ENDPOINTS = {
+    '/kpis': kpi_summary,
+    '/routes': route_rollup,
+    '/priorities': priority_rollup,
+    '/savings': savings_estimates
+}
+
+
+def _json_value(value):
+    if isinstance(value, pd.DataFrame):
+        return [{key: _json_value(item) for key, item in row.items()} for row in value.to_dict('records')]
+    if isinstance(value, dict):
+        return {str(key): _json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return value.isoformat()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+class KpiService:
+    # Responses are cached by endpoint and normalised filter spec. Concurrent
+    # requests for the same key share one in-flight computation, which runs in
+    # a worker thread so the event loop keeps accepting connections.
+
+    def __init__(self, data, max_entries=KPI_API_CACHE_SIZE):
+        self.data = data
+        self.defaults = default_filters(data['main'])
+        self.max_entries = max_entries
+        self.responses = OrderedDict()
+        self.inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve_filters(self, query):
+        # Query parameters mirror the sidebar: date_from / date_to (YYYY-MM-DD)
+        # and comma-separated values per filter column. Anything omitted keeps
+        # the sidebar's default, so an empty query matches a fresh session.
+        filters = dict(self.defaults)
+        if 'date_from' in query or 'date_to' in query:
+            low, high = filters.get('date_range', (None, None))
+            low = datetime.date.fromisoformat(query['date_from'][-1]) if 'date_from' in query else low
+            high = datetime.date.fromisoformat(query['date_to'][-1]) if 'date_to' in query else high
+            filters['date_range'] = (low, high)
+        for column, _ in FILTER_COLUMNS:
+            if column in query:
+                filters[column] = [value for item in query[column] for value in item.split(',') if value]
+        return filters
+
+    def _key(self, path, filters):
+        return (path,) + filter_key(None, filters)
+
+    def _compute(self, path, filters):
+        df = filter_orders(self.data['main'], **filters)
+        body = {'filters': filters, 'result': ENDPOINTS[path](df, self.data)}
+        return json.dumps(_json_value(body)).encode()
+
+    async def respond(self, path, query):
+        if path == '/health':
+            return 200, json.dumps({'status': 'ok', 'orders': len(self.data['main']), 'cache': self.stats()}).encode()
+        if path not in ENDPOINTS:
+            return 404, json.dumps({'error': f'unknown endpoint {path}', 'endpoints': list(ENDPOINTS)}).encode()
+        try:
+            filters = self.resolve_filters(query)
+        except ValueError as e:
+            return 400, json.dumps({'error': str(e)}).encode()
+
+        key = self._key(path, filters)
+        if key in self.responses:
+            self.responses.move_to_end(key)
+            self.hits += 1
+            return 200, self.responses[key]
+        if key in self.inflight:
+            self.hits += 1
+            return 200, await asyncio.shield(self.inflight[key])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().run_in_executor(None, self._compute, path, filters)
+        self.inflight[key] = future
+        try:
+            body = await future
+        finally:
+            del self.inflight[key]
+        self.responses[key] = body
+        while len(self.responses) > self.max_entries:
+            self.responses.popitem(last=False)
+        return 200, body
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries': len(self.responses), 'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    async def handle(self, reader, writer):
+        # Minimal HTTP/1.1: GET only, no request bodies, keep-alive by default.
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                method, target, version = (request_line.decode('latin-1').split() + ['', '', ''])[:3]
+                if method != 'GET':
+                    status, body = 405, json.dumps({'error': 'only GET is supported'}).encode()
+                else:
+                    url = urlsplit(target)
+                    try:
+                        status, body = await self.respond(url.path, parse_qs(url.query))
+                    except Exception as e:
+                        status, body = 500, json.dumps({'error': str(e)}).encode()
+
+                close = headers.get('connection', '').lower() == 'close' or version == 'HTTP/1.0'
+                writer.write(f'HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n'
+                             f'Content-Length: {len(body)}\r\nConnection: {"close" if close else "keep-alive"}'
+                             f'\r\n\r\n'.encode() + body)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host=KPI_API_HOST, port=KPI_API_PORT, data=None):
+    service = KpiService(data or load_dataset())
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving {', '.join(ENDPOINTS)} on http://{host}:{port} ({len(service.data['main']):,} orders)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve dashboard KPIs as JSON over HTTP')
+    parser.add_argument('--host', default=KPI_API_HOST)
+    parser.add_argument('--port', type=int, default=KPI_API_PORT)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    data = load_dataset()
+    print(f"Dataset loaded in {time.perf_counter() - started:.2f} s")
+    asyncio.run(serve(args.host, args.port, data))
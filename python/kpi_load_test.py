@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import time
+import numpy as np
+from config import KPI_API_HOST, KPI_API_PORT
+
+DEFAULT_PATHS = [
+    '/kpis',
+    '/kpis?Priority=Express',
+    '/kpis?Priority=Standard,Economy',
+    '/routes',
+    '/routes?Vehicle_Type=Medium_Truck',
+    '/priorities',
+    '/savings',
+    '/savings?Product_Category=Electronics'
+]
+
+
+async def _request(reader, writer, host, path):
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, paths, requests, offset, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(requests):
+            started = time.perf_counter()
+            status = await _request(reader, writer, host, paths[(offset + i) % len(paths)])
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def load_test(host=KPI_API_HOST, port=KPI_API_PORT, clients=50, requests=200, paths=DEFAULT_PATHS):
+    # Each client holds one keep-alive connection and cycles through `paths`
+    # from its own offset, so identical requests arrive concurrently.
+    latencies = []
+    statuses = {}
+    started = time.perf_counter()
+    await asyncio.gather(*[_client(host, port, paths, requests, offset, latencies, statuses)
+                           for offset in range(clients)])
+    elapsed = time.perf_counter() - started
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'p50_ms': np.percentile(latencies, 50),
+        'p99_ms': np.percentile(latencies, 99),
+        'max_ms': latencies.max(),
+        'statuses': statuses
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load-test the KPI API and report throughput and latency')
+    parser.add_argument('--host', default=KPI_API_HOST)
+    parser.add_argument('--port', type=int, default=KPI_API_PORT)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200, help='requests per client')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+    args = parser.parse_args()
+
+    result = asyncio.run(load_test(args.host, args.port, args.clients, args.requests, args.paths))
+    print(f"{result['requests']:,} requests in {result['seconds']:.2f} s: {result['requests_per_second']:,.0f} req/s, "
+          f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms, "
+          f"statuses {result['statuses']}")
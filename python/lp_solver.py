@@ -0,0 +1,216 @@
+import numpy as np
+
+STATUS_MESSAGES = {
+    0: 'Optimal solution found',
+    1: 'Iteration limit reached',
+    2: 'Problem is infeasible',
+    3: 'Problem is unbounded'
+}
+
+
+def _pivot(tableau, basis, row, col):
+    # Only rows with a non-zero in the entering column and columns with a
+    # non-zero in the pivot row change, so structured problems (one simplex
+    # row per segment, a handful of coupling rows) pivot in O(nnz), not O(m*n).
+    tableau[row] /= tableau[row, col]
+    rows = np.flatnonzero(tableau[:, col])
+    rows = rows[rows != row]
+    if len(rows):
+        cols = np.flatnonzero(tableau[row])
+        tableau[np.ix_(rows, cols)] -= np.outer(tableau[rows, col], tableau[row, cols])
+        tableau[rows, col] = 0.0
+    basis[row] = col
+
+
+def _simplex(tableau, basis, allowed, max_iter, tol):
+    m = len(basis)
+    degenerate_steps = 0
+    for iteration in range(max_iter):
+        reduced = np.where(allowed, tableau[m, :-1], 0.0)
+        candidates = np.flatnonzero(reduced < -tol)
+        if not len(candidates):
+            return 0, iteration
+
+        # Dantzig's rule, falling back to Bland's rule on long degenerate runs
+        col = candidates[0] if degenerate_steps > 50 else candidates[np.argmin(reduced[candidates])]
+        column = tableau[:m, col]
+        rows = np.flatnonzero(column > tol)
+        if not len(rows):
+            return 3, iteration
+
+        ratios = tableau[rows, -1] / column[rows]
+        best = ratios.min()
+        ties = rows[ratios <= best + tol]
+        row = ties[np.argmin(basis[ties])]
+
+        degenerate_steps = degenerate_steps + 1 if best <= tol else 0
+        _pivot(tableau, basis, row, col)
+    return 1, max_iter
+
+
+class TableauLP:
+    # Dense two-phase tableau simplex for: minimise c @ x subject to
+    # A_ub @ x <= b_ub, A_eq @ x == b_eq and x >= lower. `basis_hint` maps
+    # equality row indices to a column that should start basic in that row,
+    # which lets callers with an obvious starting point skip most of phase 1.
+    # The tableau is kept between solve() calls, so column generation can add
+    # columns and re-optimise from the previous basis instead of from scratch.
+
+    def __init__(self, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, lower=None, basis_hint=None, tol=1e-9):
+        c = np.asarray(c, dtype=float)
+        n = len(c)
+        A_ub = np.zeros((0, n)) if A_ub is None else np.asarray(A_ub, dtype=float)
+        b_ub = np.zeros(0) if b_ub is None else np.asarray(b_ub, dtype=float)
+        A_eq = np.zeros((0, n)) if A_eq is None else np.asarray(A_eq, dtype=float)
+        b_eq = np.zeros(0) if b_eq is None else np.asarray(b_eq, dtype=float)
+        lower = np.zeros(n) if lower is None else np.asarray(lower, dtype=float)
+
+        m_ub, m_eq = len(A_ub), len(A_eq)
+        m = m_ub + m_eq
+        b = np.concatenate([b_ub - A_ub @ lower, b_eq - A_eq @ lower])
+
+        # Columns: structural | slacks (one per <= row) | artificials (one per row) | rhs
+        slack_start, art_start = n, n + m_ub
+        width = n + m_ub + m + 1
+        tableau = np.zeros((m + 1, width))
+        tableau[:m_ub, :n] = A_ub
+        tableau[m_ub:m, :n] = A_eq
+        tableau[np.arange(m_ub), slack_start + np.arange(m_ub)] = 1.0
+        tableau[np.arange(m), art_start + np.arange(m)] = 1.0
+        tableau[:m, -1] = b
+
+        flipped = b < 0
+        flipped_rows = np.flatnonzero(flipped)
+        tableau[flipped_rows, :art_start] *= -1
+        tableau[flipped_rows, -1] *= -1
+
+        basis = art_start + np.arange(m)
+        for row in range(m_ub):
+            if not flipped[row]:
+                basis[row] = slack_start + row
+
+        for row, col in (basis_hint or {}).items():
+            row = m_ub + row
+            pivot = tableau[row, col]
+            if pivot <= tol or basis[row] < art_start:
+                continue
+            step = tableau[row, -1] / pivot
+            if np.all(tableau[:m, -1] - tableau[:m, col] * step >= -tol):
+                _pivot(tableau, basis, row, col)
+
+        self.c = c
+        self.lower = lower
+        self.b = b
+        self.m_ub = m_ub
+        self.tableau = tableau
+        self.basis = basis
+        self.sign = np.where(flipped, -1.0, 1.0)
+        self.tol = tol
+        self.phase_two = False
+        self.status = None
+        self.iterations = 0
+
+    @property
+    def n(self):
+        return len(self.c)
+
+    def _allowed(self):
+        allowed = np.ones(self.tableau.shape[1] - 1, dtype=bool)
+        allowed[self.n + self.m_ub:] = False
+        return allowed
+
+    def add_columns(self, c, A_ub=None, A_eq=None):
+        # New columns start non-basic at zero (lower bound 0). Their current
+        # tableau entries are B^-1 @ a, read off the artificial block, and in
+        # phase 2 their reduced costs come from the objective row the same way.
+        c = np.asarray(c, dtype=float)
+        k = len(c)
+        if not k:
+            return
+        m = len(self.basis)
+        m_eq = m - self.m_ub
+        A_ub = np.zeros((self.m_ub, k)) if A_ub is None else np.asarray(A_ub, dtype=float)
+        A_eq = np.zeros((m_eq, k)) if A_eq is None else np.asarray(A_eq, dtype=float)
+        columns = np.vstack([A_ub, A_eq]) * self.sign[:, None]
+
+        # Generated columns are usually very sparse, so B^-1 @ a is built from
+        # the few artificial-block columns each one touches.
+        n, art_start = self.n, self.n + self.m_ub
+        col_idx, row_idx = np.nonzero(columns.T)
+        block = np.zeros((m + 1, k))
+        if len(col_idx):
+            contributions = self.tableau[:, art_start + row_idx] * columns[row_idx, col_idx]
+            starts = np.flatnonzero(np.r_[True, np.diff(col_idx) != 0])
+            block[:, col_idx[starts]] = np.add.reduceat(contributions, starts, axis=1)
+        if self.phase_two:
+            block[m] += c
+        self.tableau = np.hstack([self.tableau[:, :n], block, self.tableau[:, n:]])
+        self.basis[self.basis >= n] += k
+        self.c = np.concatenate([self.c, c])
+        self.lower = np.concatenate([self.lower, np.zeros(k)])
+
+    def solve(self, max_iter=None):
+        tableau, basis, tol = self.tableau, self.basis, self.tol
+        m = len(basis)
+        n, art_start = self.n, self.n + self.m_ub
+        width = tableau.shape[1]
+        max_iter = max_iter or 50 * (m + n) + 100
+        allowed = self._allowed()
+
+        if not self.phase_two:
+            artificial_rows = np.flatnonzero(basis >= art_start)
+            if len(artificial_rows):
+                tableau[m] = 0.0
+                tableau[m] -= tableau[artificial_rows].sum(axis=0)
+                tableau[m, basis] = 0.0
+                status, iterations = _simplex(tableau, basis, allowed, max_iter, tol)
+                self.iterations += iterations
+                if status == 1:
+                    return _result(None, np.nan, 1, self.iterations)
+                if -tableau[m, -1] > tol * max(1.0, np.abs(self.b).sum()):
+                    return _result(None, np.nan, 2, self.iterations)
+
+                for row in np.flatnonzero(basis >= art_start):
+                    options = np.flatnonzero(np.abs(tableau[row, :art_start]) > tol)
+                    if len(options):
+                        _pivot(tableau, basis, row, options[0])
+
+            objective = np.zeros(width - 1)
+            objective[:n] = self.c
+            tableau[m, :-1] = objective
+            tableau[m, -1] = 0.0
+            basic = basis < width - 1
+            tableau[m] -= objective[basis[basic]] @ tableau[:m][basic]
+            self.phase_two = True
+
+        status, iterations = _simplex(tableau, basis, allowed, max_iter, tol)
+        self.iterations += iterations
+        if status != 0:
+            return _result(None, np.nan, status, self.iterations)
+
+        x = np.zeros(width - 1)
+        x[basis] = tableau[:m, -1]
+        x = x[:n] + self.lower
+
+        # Artificial columns are unit columns of the (sign-flipped) rows, so their
+        # reduced costs are the negated row duals.
+        duals = -tableau[m, art_start:art_start + m] * self.sign
+        return _result(x, float(self.c @ x), 0, self.iterations, duals)
+
+
+def solve_lp(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, lower=None, basis_hint=None,
+             max_iter=None, tol=1e-9):
+    # Duals are returned in row order (<= rows first) with the linprog sign convention.
+    return TableauLP(c, A_ub, b_ub, A_eq, b_eq, lower, basis_hint, tol).solve(max_iter)
+
+
+def _result(x, fun, status, iterations, duals=None):
+    return {
+        'x': x,
+        'fun': fun,
+        'duals': duals,
+        'status': status,
+        'success': status == 0,
+        'message': STATUS_MESSAGES[status],
+        'iterations': iterations
+    }
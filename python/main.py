@@ -1,14 +1,12 @@
 import streamlit as st
+import uuid
 import warnings
-from config import PAGE_CONFIG
+from config import PAGE_CONFIG, STAGE_LOG_FILE
 from styles import CSS_STYLES
 from data_loader import load_data, apply_filters
-from dashboard_functions import show_executive_dashboard
-from cost_analysis_functions import show_cost_analysis
-from anomaly_functions import show_anomaly_detection
-from predictive_functions import show_predictive_analytics
-from optimization_functions import show_optimization_opportunities
-from scenario_functions import show_what_if_scenarios
+from dataset import data_version, filter_key
+from figure_cache import figure_cache_stats
+from instrumentation import start_run, track_memory, stage
 warnings.filterwarnings('ignore')
 
 
@@ -18,7 +16,15 @@ def main():
     st.markdown('<div class="main-header">🚚 NexGen Cost Intelligence Platform</div>', unsafe_allow_html=True)
     st.markdown("### Transform Your Operations with Data-Driven Cost Optimization")
 
-    data = load_data()
+    session = st.session_state.setdefault('stage_session', uuid.uuid4().hex[:8])
+    run = start_run(session=session)
+    with track_memory(st.session_state.get('stage_memory', False)):
+        _show_app(run)
+
+
+def _show_app(run):
+    version = data_version()
+    data = load_data(version)
     if data is None:
         st.error("Failed to load data. Please ensure all CSV files are in the correct directory.")
         st.info("""
@@ -36,7 +42,8 @@ def main():
     main_df = data['main']
 
     st.sidebar.header("🔍 Filters & Controls")
-    main_df = apply_filters(main_df)
+    main_df, filters = apply_filters(main_df)
+    data_key = filter_key(version, filters)
     st.sidebar.markdown("---")
 
     page = st.sidebar.radio(
@@ -45,18 +52,52 @@ def main():
          "🤖 Predictive Analytics", "💡 Optimization Opportunities", "📈 What-If Scenarios"]
     )
 
-    if page == "📊 Executive Dashboard":
-        show_executive_dashboard(main_df, data)
-    elif page == "💰 Cost Analysis":
-        show_cost_analysis(main_df)
-    elif page == "🚨 Anomaly Detection":
-        show_anomaly_detection(main_df)
-    elif page == "🤖 Predictive Analytics":
-        show_predictive_analytics(main_df)
-    elif page == "💡 Optimization Opportunities":
-        show_optimization_opportunities(main_df, data)
-    elif page == "📈 What-If Scenarios":
-        show_what_if_scenarios(main_df)
+    # Page modules are imported on first visit, so sklearn, plotly.graph_objects
+    # and the solvers are only loaded once a page that uses them is opened.
+    with stage(page.split(' ', 1)[1]):
+        if page == "📊 Executive Dashboard":
+            from dashboard_functions import show_executive_dashboard
+            show_executive_dashboard(main_df, data, data_key)
+        elif page == "💰 Cost Analysis":
+            from cost_analysis_functions import show_cost_analysis
+            show_cost_analysis(main_df, data_key)
+        elif page == "🚨 Anomaly Detection":
+            from anomaly_functions import show_anomaly_detection
+            show_anomaly_detection(main_df, data_key)
+        elif page == "🤖 Predictive Analytics":
+            from predictive_functions import show_predictive_analytics
+            show_predictive_analytics(main_df, data, data_key)
+        elif page == "💡 Optimization Opportunities":
+            from optimization_functions import show_optimization_opportunities
+            show_optimization_opportunities(main_df, data, data_key)
+        elif page == "📈 What-If Scenarios":
+            from scenario_functions import show_what_if_scenarios
+            show_what_if_scenarios(main_df, data, data_key)
+
+    _show_stage_panel(run)
+
+
+def _show_stage_panel(run):
+    st.sidebar.markdown("---")
+    if not st.sidebar.checkbox("⏱️ Show stage timings", key='stage_panel'):
+        return
+    st.sidebar.checkbox("Track peak memory (slower)", key='stage_memory')
+
+    # Stages are listed in the order they started, indented under the stage
+    # that called them. Cache is hit (memory), disk or miss (computed).
+    rows = [{
+        'Stage': '· ' * record['depth'] + record['stage'],
+        'Wall (ms)': round(record['wall_ms'], 1),
+        'CPU (ms)': round(record['cpu_ms'], 1),
+        'Peak (MB)': round(record['peak_mb'], 2) if record['peak_mb'] is not None else None,
+        'Cache': record['cache'] or ''
+    } for record in sorted(run['stages'], key=lambda record: record['seq'])]
+    st.sidebar.dataframe(rows, hide_index=True, use_container_width=True)
+
+    total = sum(record['wall_ms'] for record in run['stages'] if record['depth'] == 0)
+    figures = figure_cache_stats()
+    st.sidebar.caption(f"{total:,.0f} ms in top-level stages · figure cache {figures['hits']} hits / "
+                       f"{figures['misses']} misses · logged to {STAGE_LOG_FILE}")
 
 
 if __name__ == "__main__":
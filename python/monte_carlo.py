@@ -0,0 +1,114 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config import (MC_DISTRIBUTIONS, MC_TRIALS, MC_CHUNK_SIZE, MC_SEED, MC_MAX_WORKERS,
+                    MC_PARALLEL_MIN_TRIALS, MC_TARGET_REDUCTION)
+
+
+def _sample(rng, spec, size):
+    kind, *args = spec
+    if kind == 'triangular':
+        low, mode, high = args
+        if low == high:
+            return np.full(size, float(low))
+        return rng.triangular(low, mode, high, size)
+    if kind == 'uniform':
+        return rng.uniform(args[0], args[1], size)
+    if kind == 'normal':
+        return rng.normal(args[0], args[1], size)
+    if kind == 'beta':
+        return rng.beta(args[0], args[1], size)
+    if kind == 'fixed':
+        return np.full(size, float(args[0]))
+    raise ValueError(f"Unknown distribution: {kind}")
+
+
+def _run_chunk(base, distributions, seed, size):
+    rng = np.random.default_rng(seed)
+    draws = {name: _sample(rng, spec, size) for name, spec in distributions.items()}
+
+    fuel = base['fuel'] * (1 + draws['fuel_price_change'])
+    total = base['total'] + (fuel - base['fuel'])
+
+    fuel_saving = fuel * draws['fuel_rate']
+    fleet_saving = base['maintenance'] * draws['fleet_rate']
+    route_saving = (fuel + base['labor']) * draws['route_rate']
+    priority_saving = total * draws['priority_rate']
+
+    savings = (fuel_saving + fleet_saving + route_saving + priority_saving) * draws['overlap'] * draws['adoption']
+    reduction = np.divide(savings, total, out=np.zeros(size), where=total > 0) * 100
+    return savings, reduction
+
+
+def run_monte_carlo(base, trials=MC_TRIALS, seed=MC_SEED, distributions=None,
+                    chunk_size=MC_CHUNK_SIZE, max_workers=MC_MAX_WORKERS, target=MC_TARGET_REDUCTION):
+    distributions = dict(MC_DISTRIBUTIONS, **(distributions or {}))
+    base = {key: base.get(key, 0.0) for key in ('fuel', 'labor', 'maintenance', 'total')}
+
+    # Chunks are fixed by chunk_size and each gets its own spawned seed, so the
+    # result is identical whether it runs in-process or across any pool size.
+    sizes = [min(chunk_size, trials - start) for start in range(0, trials, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    # Pool start-up costs more than small runs take, so only fan out large ones.
+    workers = min(max_workers or 1, os.cpu_count() or 1, len(sizes))
+    if trials < MC_PARALLEL_MIN_TRIALS:
+        workers = 1
+
+    started = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_run_chunk, [base] * len(sizes), [distributions] * len(sizes), seeds, sizes))
+    else:
+        chunks = [_run_chunk(base, distributions, s, size) for s, size in zip(seeds, sizes)]
+    elapsed = time.perf_counter() - started
+
+    savings = np.concatenate([chunk[0] for chunk in chunks])
+    reduction = np.concatenate([chunk[1] for chunk in chunks])
+    p10, p50, p90 = np.percentile(savings, [10, 50, 90])
+    r10, r50, r90 = np.percentile(reduction, [10, 50, 90])
+    return {
+        'savings': savings,
+        'reduction': reduction,
+        'savings_p10': p10,
+        'savings_p50': p50,
+        'savings_p90': p90,
+        'reduction_p10': r10,
+        'reduction_p50': r50,
+        'reduction_p90': r90,
+        'prob_target': float((reduction >= target).mean()),
+        'trials': trials,
+        'workers': workers,
+        'elapsed': elapsed,
+        'trials_per_second': trials / elapsed if elapsed > 0 else float('inf')
+    }
+
+
+def benchmark(base, trial_counts=(100000, 1000000), worker_counts=(1, MC_MAX_WORKERS), seed=MC_SEED):
+    rows = []
+    for trials in trial_counts:
+        for workers in worker_counts:
+            result = run_monte_carlo(base, trials=trials, seed=seed, max_workers=workers)
+            rows.append({
+                'trials': trials,
+                'workers': result['workers'],
+                'seconds': result['elapsed'],
+                'trials_per_second': result['trials_per_second'],
+                'reduction_p50': result['reduction_p50']
+            })
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the combined-impact Monte Carlo simulation")
+    parser.add_argument('--trials', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, MC_MAX_WORKERS])
+    parser.add_argument('--seed', type=int, default=MC_SEED)
+    args = parser.parse_args()
+
+    sample_base = {'fuel': 30000.0, 'labor': 25000.0, 'maintenance': 12000.0, 'total': 95000.0}
+    for row in benchmark(sample_base, args.trials, args.workers, args.seed):
+        print(f"{row['trials']:>10,} trials  {row['workers']:>2} workers  {row['seconds']:8.3f}s  "
+              f"{row['trials_per_second']:>14,.0f} trials/s  P50 {row['reduction_p50']:.2f}%")
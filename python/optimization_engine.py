@@ -0,0 +1,201 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataset import frame_fingerprint
+from disk_cache import disk_cached
+from fuel_efficiency import fuel_efficiency_stats
+from instrumentation import run_in_context
+from route_planner import plan_daily_routes
+from warehouse_rebalancing import build_rebalancing_problem, solve_rebalancing
+from config import OPTIMIZATION_WORKERS, OPTIMIZATION_CACHE_SIZE, WAREHOUSE_CAPACITY_HEADROOM
+
+_results = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def route_analysis(df, routes):
+    if not ('Route' in df.columns and 'total_cost' in df.columns and 'cost_per_km' in df.columns):
+        return None
+
+    table = df.groupby('Route').agg({
+        'total_cost': 'sum',
+        'cost_per_km': 'mean',
+        'Distance_KM': 'mean',
+        'Order_ID': 'count'
+    }).reset_index()
+    table.columns = ['Route', 'Total Cost', 'Avg Cost/KM', 'Avg Distance', 'Orders']
+
+    if 'Traffic_Delay_Minutes' in df.columns:
+        traffic_by_route = df.groupby('Route')['Traffic_Delay_Minutes'].mean()
+        table = table.merge(traffic_by_route.reset_index(), on='Route', how='left')
+        table.columns = list(table.columns[:-1]) + ['Avg Delay']
+
+    avg_route_cost = table['Avg Cost/KM'].mean()
+    inefficient = table[table['Avg Cost/KM'] > avg_route_cost * 1.3]
+    plan = plan_daily_routes(df, routes)
+
+    # The planner's fuel savings are the opportunity whenever it can run; the
+    # flat 20% on inefficient routes is only a fallback without order locations.
+    if plan is not None:
+        savings = plan['fuel_saved_cost']
+        label = f"Multi-stop tours cut distance by {plan['distance_reduction']:.1f}%"
+        if len(inefficient) > 0:
+            label += f'; {len(inefficient)} routes with 30%+ higher cost per km'
+    else:
+        savings = inefficient['Total Cost'].sum() * 0.20
+        label = f'{len(inefficient)} routes with 30%+ higher cost per km'
+
+    opportunity = None
+    if savings > 0:
+        opportunity = {
+            'category': 'Route Optimization',
+            'opportunity': label,
+            'savings': savings,
+            'action': 'Optimize routing and scheduling'
+        }
+    return {'table': table, 'inefficient': inefficient, 'plan': plan, 'opportunity': opportunity}
+
+
+def priority_analysis(df):
+    if not ('Priority' in df.columns and 'total_cost' in df.columns):
+        return None
+
+    table = df.groupby('Priority').agg({
+        'total_cost': ['sum', 'mean'],
+        'Order_ID': 'count'
+    }).reset_index()
+    table.columns = ['Priority', 'Total Cost', 'Avg Cost', 'Orders']
+
+    if 'Order_Value_INR' in df.columns:
+        revenue_by_priority = df.groupby('Priority')['Order_Value_INR'].sum().reset_index()
+        table = table.merge(revenue_by_priority, on='Priority', how='left')
+        table.columns = list(table.columns[:-1]) + ['Total Revenue']
+        table['ROI'] = table['Total Revenue'] / table['Total Cost']
+
+    table['Cost %'] = (table['Total Cost'] / table['Total Cost'].sum()) * 100
+
+    express_pct = None
+    opportunity = None
+    if 'Express' in table['Priority'].values:
+        express = table[table['Priority'] == 'Express'].iloc[0]
+        express_pct = express['Cost %']
+        if express_pct > 30:
+            opportunity = {
+                'category': 'Priority Optimization',
+                'opportunity': f'Express deliveries account for {express_pct:.1f}% of costs',
+                'savings': express['Total Cost'] * 0.25,
+                'action': 'Shift 25% of Express to Standard'
+            }
+    return {'table': table, 'express_pct': express_pct, 'opportunity': opportunity}
+
+
+def warehouse_analysis(warehouse_df, routes, headroom):
+    if 'Warehouse_ID' not in warehouse_df.columns:
+        return None
+    if not ('Storage_Cost_per_Unit' in warehouse_df.columns and 'Current_Stock_Units' in warehouse_df.columns):
+        return {'costs': None, 'opportunity': None}
+
+    costs = warehouse_df.groupby('Warehouse_ID').agg({
+        'Storage_Cost_per_Unit': 'mean',
+        'Current_Stock_Units': 'sum'
+    }).reset_index()
+    costs.columns = ['Warehouse', 'Avg Storage Cost/Unit', 'Total Stock']
+    costs['Total Storage Cost'] = costs['Avg Storage Cost/Unit'] * costs['Total Stock']
+
+    avg_storage_cost = costs['Avg Storage Cost/Unit'].mean()
+    expensive = costs[costs['Avg Storage Cost/Unit'] > avg_storage_cost * 1.15]
+
+    problem = build_rebalancing_problem(warehouse_df, routes)
+    result = solve_rebalancing(problem, headroom) if problem is not None else None
+
+    opportunity = None
+    if result is not None and result['plan'] is not None and result['savings'] > 0:
+        opportunity = {
+            'category': 'Warehouse Optimization',
+            'opportunity': f'{len(result["plan"])} stock transfers between warehouses',
+            'savings': result['savings'],
+            'action': 'Rebalance stock to lower-cost warehouses'
+        }
+    return {'costs': costs, 'expensive': expensive, 'problem': problem, 'result': result,
+            'opportunity': opportunity}
+
+
+def fuel_analysis(df):
+    if not ('Fuel_Consumption_L' in df.columns and 'Distance_KM' in df.columns and 'Fuel_Cost' in df.columns):
+        return None
+
+    stats = fuel_efficiency_stats(df)
+    savings = df['Fuel_Cost'].sum() * 0.15
+    opportunity = None
+    if stats is not None and stats['inefficient_orders'] > 0:
+        opportunity = {
+            'category': 'Fuel Efficiency',
+            'opportunity': f'{stats["inefficient_orders"]} orders with poor fuel efficiency',
+            'savings': savings,
+            'action': 'Implement fuel efficiency program'
+        }
+    return {'stats': stats, 'savings': savings, 'opportunity': opportunity}
+
+
+def _cached(key):
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return True, _results[key]
+    return False, None
+
+
+def _store(key, value):
+    with _results_lock:
+        _results[key] = value
+        _results.move_to_end(key)
+        while len(_results) > OPTIMIZATION_CACHE_SIZE:
+            _results.popitem(last=False)
+
+
+def analysis_jobs(df, data, headroom=WAREHOUSE_CAPACITY_HEADROOM, orders_key=None):
+    # Analyses are keyed by the frame they read, so changing an unrelated filter
+    # does not recompute the warehouse plan and vice versa. The app passes
+    # dataset.filter_key as `orders_key`; its first element is the snapshot
+    # version, which stands in for the routes and warehouse tables. Frames are
+    # only hashed when no key is given (batch and API callers).
+    if orders_key is None:
+        orders_key = frame_fingerprint(df)
+        network_key = frame_fingerprint(data['routes'])
+        warehouse_key = frame_fingerprint(data['warehouse'])
+    else:
+        network_key = ('routes', orders_key[0])
+        warehouse_key = ('warehouse', orders_key[0])
+    return {
+        'route': ((orders_key, network_key), route_analysis, (df, data['routes'])),
+        'priority': (orders_key, priority_analysis, (df,)),
+        'warehouse': ((warehouse_key, network_key, headroom), warehouse_analysis,
+                      (data['warehouse'], data['routes'], headroom)),
+        'fuel': (orders_key, fuel_analysis, (df,))
+    }
+
+
+def run_analyses(jobs, max_workers=OPTIMIZATION_WORKERS):
+    # `jobs` maps a name to (cache key, function, args). Cached results are
+    # yielded straight away; the rest run in a thread pool and are yielded in
+    # completion order, so callers can render each one as soon as it is ready.
+    # The heavy lifting is NumPy/pandas work that releases the GIL. Results are
+    # also kept in the on-disk artifact cache that warmup.py fills.
+    pending = {}
+    for name, (key, func, args) in jobs.items():
+        hit, value = _cached((name, key))
+        if hit:
+            yield name, value
+        else:
+            pending[name] = (key, func, args)
+    if not pending:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+        futures = {pool.submit(run_in_context(disk_cached, func, *args)): (name, key)
+                   for name, (key, func, args) in pending.items()}
+        for future in as_completed(futures):
+            name, key = futures[future]
+            value = future.result()
+            _store((name, key), value)
+            yield name, value
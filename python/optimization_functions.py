@@ -1,266 +1,333 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
-from datetime import datetime
+from optimization_engine import analysis_jobs, run_analyses
+from vehicle_assignment import assignment_summary
+from warehouse_rebalancing import stock_change_table
+from config import WAREHOUSE_CAPACITY_HEADROOM
+from exports import show_export_controls
+from figure_cache import cached_figure, show_chart
 
 
-def show_optimization_opportunities(df, data):
+def show_optimization_opportunities(df, data, data_key):
     st.header("💡 Optimization Opportunities")
     st.markdown("**Actionable insights to reduce costs by 15-20%**")
 
-    opportunities = []
-    potential_savings = 0
+    sections = {}
+    for name, title in [('route', "🗺️ Route Optimization"), ('priority', "⚡ Priority Level Optimization"),
+                        ('warehouse', "🏭 Warehouse Optimization"), ('fleet', "🚚 Fleet Assignment"),
+                        ('fuel', "⛽ Fuel Efficiency Improvements")]:
+        st.markdown("---")
+        st.subheader(title)
+        sections[name] = st.container()
+
+    with sections['warehouse']:
+        headroom = st.slider("Max stock increase per warehouse (%)", 0, 100,
+                             int(WAREHOUSE_CAPACITY_HEADROOM * 100), 5, key='warehouse_headroom') / 100
+    with sections['fleet']:
+        _show_fleet_assignment(df, data.get('loads'))
+
+    jobs = analysis_jobs(df, data, headroom, orders_key=data_key)
+    renderers = {
+        'route': _show_route_optimization,
+        'priority': _show_priority_optimization,
+        'warehouse': _show_warehouse_optimization,
+        'fuel': _show_fuel_efficiency
+    }
+
+    pending = {}
+    for name in jobs:
+        with sections[name]:
+            pending[name] = st.empty()
+            pending[name].caption("⏳ Analysing...")
+
+    results = {}
+    for name, result in run_analyses(jobs):
+        pending[name].empty()
+        with sections[name]:
+            renderers[name](result)
+        results[name] = result
+
+    opportunities = [results[name]['opportunity'] for name in jobs
+                     if results[name] is not None and results[name]['opportunity'] is not None]
+    potential_savings = sum(opportunity['savings'] for opportunity in opportunities)
+    _show_optimization_summary(df, opportunities, potential_savings, data_key, headroom)
+
+
+def _show_route_plan(plan):
+    st.markdown("**Multi-stop tour planning: each day's orders consolidated per origin city**")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Direct Round Trips", f"{plan['direct_km']:,.0f} km")
+    with col2:
+        st.metric("Planned Tours", f"{plan['planned_km']:,.0f} km",
+                  delta=f"-{plan['direct_km'] - plan['planned_km']:,.0f} km")
+    with col3:
+        st.metric("Distance Reduction", f"{plan['distance_reduction']:.1f}%")
+    with col4:
+        st.metric("Fuel Saved", f"₹{plan['fuel_saved_cost']:,.0f}", delta=f"{plan['fuel_saved_litres']:,.0f} L")
 
-    st.markdown("---")
-    st.subheader("🗺️ Route Optimization")
-    route_savings = _analyze_route_optimization(df)
-    if route_savings:
-        opportunities.append(route_savings)
-        potential_savings += route_savings['savings']
-    st.markdown("---")
-    st.subheader("⚡ Priority Level Optimization")
-    priority_savings = _analyze_priority_optimization(df)
-    if priority_savings:
-        opportunities.append(priority_savings)
-        potential_savings += priority_savings['savings']
-    st.markdown("---")
-    st.subheader("🏭 Warehouse Optimization")
-    warehouse_savings = _analyze_warehouse_optimization(data['warehouse'])
-    if warehouse_savings:
-        opportunities.append(warehouse_savings)
-        potential_savings += warehouse_savings['savings']
-    st.markdown("---")
-    st.subheader("⛽ Fuel Efficiency Improvements")
-    fuel_savings = _analyze_fuel_efficiency(df)
-    if fuel_savings:
-        opportunities.append(fuel_savings)
-        potential_savings += fuel_savings['savings']
-
-    _show_optimization_summary(df, opportunities, potential_savings)
-
-
-def _analyze_route_optimization(df):
-    if 'Route' in df.columns and 'total_cost' in df.columns and 'cost_per_km' in df.columns:
-        route_analysis = df.groupby('Route').agg({
-            'total_cost': 'sum',
-            'cost_per_km': 'mean',
-            'Distance_KM': 'mean',
-            'Order_ID': 'count'
-        }).reset_index()
-        route_analysis.columns = ['Route', 'Total Cost', 'Avg Cost/KM', 'Avg Distance', 'Orders']
-
-        if 'Traffic_Delay_Minutes' in df.columns:
-            traffic_by_route = df.groupby('Route')['Traffic_Delay_Minutes'].mean()
-            route_analysis = route_analysis.merge(traffic_by_route.reset_index(), on='Route', how='left')
-            route_analysis.columns = list(route_analysis.columns[:-1]) + ['Avg Delay']
-
-        avg_route_cost = route_analysis['Avg Cost/KM'].mean()
-        inefficient_routes = route_analysis[route_analysis['Avg Cost/KM'] > avg_route_cost * 1.3]
-
-        if len(inefficient_routes) > 0:
-            savings = inefficient_routes['Total Cost'].sum() * 0.20
-
-            col1, col2 = st.columns(2)
-            with col1:
-                top_routes = inefficient_routes.nlargest(10, 'Total Cost')
-                fig = px.bar(top_routes, x='Route', y='Total Cost',
-                             title='Top 10 Most Expensive Routes',
-                             color='Avg Cost/KM', color_continuous_scale='Reds')
-                fig.update_xaxes(tickangle=-45)
-                st.plotly_chart(fig, use_container_width=True)
-
-            with col2:
-                st.markdown(f"""
-                <div class="alert-box">
-                <h4>🗺️ Route Inefficiency Alert</h4>
-                <p><strong>{len(inefficient_routes)} routes</strong> have significantly higher costs</p>
-                <p><strong>Potential Annual Savings: ₹{savings:,.0f}</strong></p>
-                <ul>
-                <li>Consolidate shipments on expensive routes</li>
-                <li>Use alternative routes during peak traffic</li>
-                <li>Consider route splitting or combining</li>
-                <li>Negotiate better rates with carriers</li>
-                </ul>
-                </div>
-                """, unsafe_allow_html=True)
-
-            return {
-                'category': 'Route Optimization',
-                'opportunity': f'{len(inefficient_routes)} routes with 30%+ higher cost per km',
-                'savings': savings,
-                'action': 'Optimize routing and scheduling'
-            }
-        else:
-            st.success("✅ Route efficiency is optimized")
-    else:
-        st.warning("Route data not available for analysis")
-    return None
+    daily = plan['plan'].groupby('Date')[['Direct KM', 'Planned KM']].sum().reset_index()
+    fig = cached_figure(px.bar, daily, x='Date', y=['Direct KM', 'Planned KM'], barmode='group',
+                        title='Daily Distance: Direct Round Trips vs Planned Tours')
+    show_chart(fig, use_container_width=True)
+
+    with st.expander("Tour plan by day and origin"):
+        st.dataframe(plan['plan'], use_container_width=True)
+    st.caption(f"{plan['plan']['Orders'].sum():,} orders planned into {plan['plan']['Tours'].sum():,} tours "
+               f"in {plan['seconds'] * 1000:.0f} ms")
 
 
-def _analyze_priority_optimization(df):
-    if 'Priority' in df.columns and 'total_cost' in df.columns:
-        priority_analysis = df.groupby('Priority').agg({
-            'total_cost': ['sum', 'mean'],
-            'Order_ID': 'count'
-        }).reset_index()
-        priority_analysis.columns = ['Priority', 'Total Cost', 'Avg Cost', 'Orders']
+def _show_route_optimization(analysis):
+    if analysis is None:
+        st.warning("Route data not available for analysis")
+        return
 
-        if 'Order_Value_INR' in df.columns:
-            revenue_by_priority = df.groupby('Priority')['Order_Value_INR'].sum().reset_index()
-            priority_analysis = priority_analysis.merge(revenue_by_priority, on='Priority', how='left')
-            priority_analysis.columns = list(priority_analysis.columns[:-1]) + ['Total Revenue']
-            priority_analysis['ROI'] = priority_analysis['Total Revenue'] / priority_analysis['Total Cost']
+    if analysis['plan'] is not None:
+        _show_route_plan(analysis['plan'])
 
-        priority_analysis['Cost %'] = (priority_analysis['Total Cost'] / priority_analysis['Total Cost'].sum()) * 100
+    opportunity = analysis['opportunity']
+    if opportunity is None:
+        st.success("✅ Route efficiency is optimized")
+        return
 
-        col1, col2 = st.columns(2)
-        with col1:
-            if 'Total Revenue' in priority_analysis.columns:
-                fig = px.bar(priority_analysis, x='Priority', y=['Total Cost', 'Total Revenue'],
-                             title='Cost vs Revenue by Priority', barmode='group')
-                st.plotly_chart(fig, use_container_width=True)
-            else:
-                fig = px.bar(priority_analysis, x='Priority', y='Total Cost',
-                             title='Total Cost by Priority',
-                             color='Avg Cost', color_continuous_scale='Blues')
-                st.plotly_chart(fig, use_container_width=True)
+    inefficient_routes = analysis['inefficient']
+    if inefficient_routes.empty:
+        return
 
-        with col2:
-            st.dataframe(priority_analysis, use_container_width=True)
-
-        if 'Express' in priority_analysis['Priority'].values:
-            express_data = priority_analysis[priority_analysis['Priority'] == 'Express'].iloc[0]
-            express_pct = express_data['Cost %']
-
-            if express_pct > 30:
-                savings = express_data['Total Cost'] * 0.25
-
-                st.markdown(f"""
-                <div class="alert-box">
-                <h4>⚡ Priority Level Alert</h4>
-                <p>Express deliveries are <strong>{express_pct:.1f}%</strong> of total costs</p>
-                <p><strong>Potential Savings (if 25% shifted to Standard): ₹{savings:,.0f}</strong></p>
-                <ul>
-                <li>Review customer expectations vs actual needs</li>
-                <li>Offer incentives for standard delivery</li>
-                <li>Implement smart priority assignment</li>
-                </ul>
-                </div>
-                """, unsafe_allow_html=True)
-
-                return {
-                    'category': 'Priority Optimization',
-                    'opportunity': f'Express deliveries account for {express_pct:.1f}% of costs',
-                    'savings': savings,
-                    'action': 'Shift 25% of Express to Standard'
-                }
-    else:
+    col1, col2 = st.columns(2)
+    with col1:
+        top_routes = inefficient_routes.nlargest(10, 'Total Cost')
+        fig = cached_figure(px.bar, top_routes, x='Route', y='Total Cost',
+                            title='Top 10 Most Expensive Routes',
+                            color='Avg Cost/KM', color_continuous_scale='Reds', xaxes={'tickangle': -45})
+        show_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown(f"""
+        <div class="alert-box">
+        <h4>🗺️ Route Inefficiency Alert</h4>
+        <p><strong>{len(inefficient_routes)} routes</strong> have significantly higher costs</p>
+        <p><strong>Potential Annual Savings: ₹{opportunity['savings']:,.0f}</strong></p>
+        <ul>
+        <li>Consolidate shipments on expensive routes</li>
+        <li>Use alternative routes during peak traffic</li>
+        <li>Consider route splitting or combining</li>
+        <li>Negotiate better rates with carriers</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def _show_priority_optimization(analysis):
+    if analysis is None:
         st.warning("Priority data not available for analysis")
-    return None
-
-
-def _analyze_warehouse_optimization(warehouse_df):
-    if 'Warehouse_ID' in warehouse_df.columns:
-        if 'Storage_Cost_per_Unit' in warehouse_df.columns and 'Current_Stock_Units' in warehouse_df.columns:
-            warehouse_costs = warehouse_df.groupby('Warehouse_ID').agg({
-                'Storage_Cost_per_Unit': 'mean',
-                'Current_Stock_Units': 'sum'
-            }).reset_index()
-            warehouse_costs.columns = ['Warehouse', 'Avg Storage Cost/Unit', 'Total Stock']
-            warehouse_costs['Total Storage Cost'] = warehouse_costs['Avg Storage Cost/Unit'] * warehouse_costs[
-                'Total Stock']
-
-            avg_storage_cost = warehouse_costs['Avg Storage Cost/Unit'].mean()
-            expensive_warehouses = warehouse_costs[warehouse_costs['Avg Storage Cost/Unit'] > avg_storage_cost * 1.15]
-
-            if len(expensive_warehouses) > 0:
-                savings = expensive_warehouses['Total Storage Cost'].sum() * 0.12
-
-                col1, col2 = st.columns(2)
-                with col1:
-                    fig = px.bar(warehouse_costs, x='Warehouse', y='Avg Storage Cost/Unit',
-                                 title='Storage Cost per Unit by Warehouse',
-                                 color='Total Storage Cost', color_continuous_scale='Oranges')
-                    st.plotly_chart(fig, use_container_width=True)
-
-                with col2:
-                    st.markdown(f"""
-                    <div class="alert-box">
-                    <h4>🏭 Warehouse Cost Alert</h4>
-                    <p><strong>{len(expensive_warehouses)} warehouses</strong> with higher storage costs</p>
-                    <p><strong>Potential Annual Savings: ₹{savings:,.0f}</strong></p>
-                    <ul>
-                    <li>Negotiate better warehouse rates</li>
-                    <li>Consolidate inventory to lower-cost locations</li>
-                    <li>Implement just-in-time inventory</li>
-                    <li>Review slow-moving inventory</li>
-                    </ul>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                return {
-                    'category': 'Warehouse Optimization',
-                    'opportunity': f'{len(expensive_warehouses)} warehouses with 15%+ higher storage costs',
-                    'savings': savings,
-                    'action': 'Consolidate or negotiate better rates'
-                }
-            else:
-                st.success("✅ Warehouse costs are optimized")
+        return
+
+    priority_analysis = analysis['table']
+    col1, col2 = st.columns(2)
+    with col1:
+        if 'Total Revenue' in priority_analysis.columns:
+            fig = cached_figure(px.bar, priority_analysis, x='Priority', y=['Total Cost', 'Total Revenue'],
+                                title='Cost vs Revenue by Priority', barmode='group')
+            show_chart(fig, use_container_width=True)
         else:
-            st.info("Warehouse cost data not available")
-    else:
+            fig = cached_figure(px.bar, priority_analysis, x='Priority', y='Total Cost',
+                                title='Total Cost by Priority',
+                                color='Avg Cost', color_continuous_scale='Blues')
+            show_chart(fig, use_container_width=True)
+
+    with col2:
+        st.dataframe(priority_analysis, use_container_width=True)
+
+    opportunity = analysis['opportunity']
+    if opportunity is not None:
+        st.markdown(f"""
+        <div class="alert-box">
+        <h4>⚡ Priority Level Alert</h4>
+        <p>Express deliveries are <strong>{analysis['express_pct']:.1f}%</strong> of total costs</p>
+        <p><strong>Potential Savings (if 25% shifted to Standard): ₹{opportunity['savings']:,.0f}</strong></p>
+        <ul>
+        <li>Review customer expectations vs actual needs</li>
+        <li>Offer incentives for standard delivery</li>
+        <li>Implement smart priority assignment</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+def _show_rebalancing_plan(problem, result):
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Current Storage Cost", f"₹{result['current_cost']:,.0f}")
+    with col2:
+        st.metric("Rebalanced Cost", f"₹{result['optimized_cost']:,.0f}", delta=f"-₹{result['savings']:,.0f}")
+    with col3:
+        st.metric("Transfer Cost", f"₹{result['transfer_cost']:,.0f}")
+    with col4:
+        st.metric("Units Moved", f"{result['plan']['Units'].sum():,}")
+
+    changes = stock_change_table(problem, result)
+    fig = cached_figure(px.bar, changes, x='Warehouse_ID', y='Change', color='Product_Category',
+                        title='Stock Change by Warehouse and Category', barmode='relative')
+    show_chart(fig, use_container_width=True)
+
+    st.markdown("#### 🚚 Transfer Plan")
+    st.dataframe(result['plan'], use_container_width=True)
+    if result['shortfall_units'] > 0:
+        st.warning(f"⚠️ {result['shortfall_units']:,.0f} units of reorder-level shortfall cannot be covered "
+                   f"by transfers")
+    st.caption(f"{result['arcs_priced']:,} candidate moves priced over {result['iterations']} rounds "
+               f"in {result['seconds'] * 1000:.0f} ms")
+
+
+def _show_warehouse_optimization(analysis):
+    if analysis is None:
         st.warning("Warehouse data not available for analysis")
-    return None
-
-
-def _analyze_fuel_efficiency(df):
-    if 'Fuel_Consumption_L' in df.columns and 'Distance_KM' in df.columns and 'Fuel_Cost' in df.columns:
-        df_fuel = df.copy()
-        df_fuel['fuel_efficiency'] = df_fuel['Distance_KM'] / df_fuel['Fuel_Consumption_L'].replace(0, np.nan)
-        avg_efficiency = df_fuel['fuel_efficiency'].mean()
-
-        inefficient_orders = df_fuel[df_fuel['fuel_efficiency'] < avg_efficiency * 0.8]
-
-        if len(inefficient_orders) > 0:
-            savings = df_fuel['Fuel_Cost'].sum() * 0.15
-
-            col1, col2 = st.columns(2)
-            with col1:
-                fig = px.histogram(df_fuel.dropna(subset=['fuel_efficiency']), x='fuel_efficiency', nbins=30,
-                                   title='Fuel Efficiency Distribution (km/L)',
-                                   color_discrete_sequence=['steelblue'])
-                fig.add_vline(x=avg_efficiency, line_dash="dash", line_color="red",
-                              annotation_text="Average", annotation_position="top")
-                st.plotly_chart(fig, use_container_width=True)
-
-            with col2:
-                st.markdown(f"""
-                <div class="alert-box">
-                <h4>⛽ Fuel Efficiency Alert</h4>
-                <p>Significant variation in fuel efficiency across deliveries</p>
-                <p><strong>Potential Annual Savings (15% improvement): ₹{savings:,.0f}</strong></p>
-                <ul>
-                <li>Driver training on fuel-efficient driving</li>
-                <li>Regular vehicle maintenance</li>
-                <li>Route optimization to reduce idle time</li>
-                <li>Consider hybrid/electric vehicles</li>
-                </ul>
-                </div>
-                """, unsafe_allow_html=True)
-
-            return {
-                'category': 'Fuel Efficiency',
-                'opportunity': f'{len(inefficient_orders)} orders with poor fuel efficiency',
-                'savings': savings,
-                'action': 'Implement fuel efficiency program'
-            }
-    else:
+        return
+    if analysis['costs'] is None:
+        st.info("Warehouse cost data not available")
+        return
+
+    result = analysis['result']
+    opportunity = analysis['opportunity']
+    if opportunity is None:
+        if result is not None and result['plan'] is None:
+            st.warning(f"Rebalancing could not be solved: {result['message']}")
+        else:
+            st.success("✅ Warehouse costs are optimized")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = cached_figure(px.bar, analysis['costs'], x='Warehouse', y='Avg Storage Cost/Unit',
+                            title='Storage Cost per Unit by Warehouse',
+                            color='Total Storage Cost', color_continuous_scale='Oranges')
+        show_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown(f"""
+        <div class="alert-box">
+        <h4>🏭 Warehouse Cost Alert</h4>
+        <p><strong>{len(analysis['expensive'])} warehouses</strong> with 15%+ higher storage costs;
+        <strong>{len(result['plan'])} stock transfers</strong> rebalance inventory</p>
+        <p><strong>Potential Annual Savings: ₹{opportunity['savings']:,.0f}</strong></p>
+        <ul>
+        <li>Execute the transfer plan below, largest net savings first</li>
+        <li>Negotiate better warehouse rates</li>
+        <li>Implement just-in-time inventory</li>
+        <li>Review slow-moving inventory</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    _show_rebalancing_plan(analysis['problem'], result)
+
+
+def _show_fleet_assignment(df, loads):
+    if loads is None or loads.empty or 'Load_ID' not in df.columns:
+        st.info("Vehicle assignments are only generated when orders have no Vehicle_ID")
+        return
+
+    loads = loads[loads['Load_ID'].isin(df['Load_ID'])]
+    summary = assignment_summary(loads)
+    st.markdown("**Each day's orders packed into vehicle loads and matched to available vehicles by fuel cost**")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Loads", summary['loads'], delta=f"{summary['unassigned_loads']} unassigned",
+                  delta_color="inverse")
+    with col2:
+        st.metric("Vehicles Used", summary['vehicles_used'])
+    with col3:
+        st.metric("Capacity Utilisation", f"{summary['utilisation'] * 100:.1f}%")
+    with col4:
+        st.metric("Assigned Fuel Cost", f"₹{summary['fuel_cost']:,.0f}", delta=f"{summary['co2_kg']:,.0f} kg CO2",
+                  delta_color="off")
+
+    by_type = loads.dropna(subset=['Vehicle_ID']).groupby('Vehicle_Type').agg(
+        Loads=('Load_ID', 'count'),
+        Weight_KG=('Weight_KG', 'sum'),
+        Capacity_KG=('Capacity_KG', 'sum'),
+        Fuel_Cost=('Fuel_Cost', 'sum'),
+        CO2_Kg=('CO2_Kg', 'sum')
+    ).reset_index()
+    by_type['Utilisation %'] = by_type['Weight_KG'] / by_type['Capacity_KG'] * 100
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = cached_figure(px.bar, by_type, x='Vehicle_Type', y='Fuel_Cost', color='Utilisation %',
+                            title='Assigned Fuel Cost by Vehicle Type', color_continuous_scale='Blues')
+        show_chart(fig, use_container_width=True)
+    with col2:
+        fig = cached_figure(px.bar, by_type, x='Vehicle_Type', y='CO2_Kg', title='CO2 Emissions by Vehicle Type',
+                            color_discrete_sequence=['#7f8c8d'])
+        show_chart(fig, use_container_width=True)
+
+    with st.expander("Load assignments"):
+        st.dataframe(loads, use_container_width=True)
+    st.caption(f"Deadhead to pickup: {summary['deadhead_km']:,.0f} km")
+
+
+def _show_fuel_efficiency(analysis):
+    if analysis is None:
         st.warning("Fuel data not available for efficiency analysis")
-    return None
+        return
+    if analysis['opportunity'] is None:
+        return
 
+    stats = analysis['stats']
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = cached_figure(_fuel_histogram_figure, stats['histogram'], stats['avg_efficiency'])
+        show_chart(fig, use_container_width=True)
 
-def _show_optimization_summary(df, opportunities, potential_savings):
+    with col2:
+        st.markdown(f"""
+        <div class="alert-box">
+        <h4>⛽ Fuel Efficiency Alert</h4>
+        <p>Significant variation in fuel efficiency across deliveries</p>
+        <p><strong>Potential Annual Savings (15% improvement): ₹{analysis['savings']:,.0f}</strong></p>
+        <ul>
+        <li>Driver training on fuel-efficient driving</li>
+        <li>Regular vehicle maintenance</li>
+        <li>Route optimization to reduce idle time</li>
+        <li>Consider hybrid/electric vehicles</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    percentile_cols = st.columns(len(stats['percentiles']) + 1)
+    with percentile_cols[0]:
+        st.metric("Fleet km/L", f"{stats['fleet_efficiency']:.2f}")
+    for col, (pct, value) in zip(percentile_cols[1:], stats['percentiles'].items()):
+        with col:
+            st.metric(f"P{pct} km/L", f"{value:.2f}")
+
+    breakdowns = stats['breakdowns']
+    if 'Vehicle_Type' in breakdowns:
+        fig = cached_figure(px.bar, breakdowns['Vehicle_Type'], x='Vehicle_Type', y='Avg km/L',
+                            color='Inefficient %', title='Fuel Efficiency by Vehicle Type',
+                            color_continuous_scale='Reds')
+        show_chart(fig, use_container_width=True)
+    if 'Route' in breakdowns:
+        with st.expander("Fuel efficiency by route (least efficient first)"):
+            st.dataframe(breakdowns['Route'].round(2), use_container_width=True)
+
+
+def _fuel_histogram_figure(histogram, avg_efficiency):
+    fig = px.bar(x=(histogram['low'] + histogram['high']) / 2, y=histogram['orders'],
+                 title='Fuel Efficiency Distribution (km/L)',
+                 labels={'x': 'fuel_efficiency', 'y': 'count'},
+                 color_discrete_sequence=['steelblue'])
+    fig.update_traces(width=histogram['high'] - histogram['low'])
+    fig.add_vline(x=avg_efficiency, line_dash="dash", line_color="red",
+                  annotation_text="Average", annotation_position="top")
+    return fig
+
+
+def _show_optimization_summary(df, opportunities, potential_savings, data_key, headroom):
     st.markdown("---")
     st.subheader("📊 Cost Optimization Summary")
 
@@ -281,16 +348,16 @@ def _show_optimization_summary(df, opportunities, potential_savings):
 
         col1, col2 = st.columns(2)
         with col1:
-            fig = px.bar(opp_df, x='category', y='savings',
-                         title='Savings Potential by Category',
-                         color='savings', color_continuous_scale='Greens',
-                         labels={'savings': 'Potential Savings (₹)', 'category': 'Category'})
-            st.plotly_chart(fig, use_container_width=True)
+            fig = cached_figure(px.bar, opp_df, x='category', y='savings',
+                                title='Savings Potential by Category',
+                                color='savings', color_continuous_scale='Greens',
+                                labels={'savings': 'Potential Savings (₹)', 'category': 'Category'})
+            show_chart(fig, use_container_width=True)
 
         with col2:
-            fig = px.pie(opp_df, values='savings', names='category',
-                         title='Savings Distribution', hole=0.4)
-            st.plotly_chart(fig, use_container_width=True)
+            fig = cached_figure(px.pie, opp_df, values='savings', names='category',
+                                title='Savings Distribution', hole=0.4)
+            show_chart(fig, use_container_width=True)
 
         st.subheader("📋 Action Plan")
         for idx, row in opp_df.iterrows():
@@ -303,12 +370,7 @@ def _show_optimization_summary(df, opportunities, potential_savings):
             </div>
             """, unsafe_allow_html=True)
 
-        csv = opp_df.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Download Optimization Report",
-            data=csv,
-            file_name=f"optimization_opportunities_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+        show_export_controls(opp_df, "Optimization Report", "optimization_opportunities", data_key,
+                             tag=headroom)
     else:
         st.info("No major optimization opportunities identified. Your operations are running efficiently!")
\ No newline at end of file
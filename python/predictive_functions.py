@@ -1,14 +1,74 @@
 import streamlit as st
+import plotly.express as px
+import pandas as pd
 from ml_models import train_cost_prediction_model
+from inventory_simulation import build_inventory_state, simulate_inventory, inventory_summary_table
+from config import INVENTORY_HORIZON_DAYS, INVENTORY_LEAD_TIME_DAYS, INVENTORY_DEMAND_SCALE
+from figure_cache import cached_figure, show_chart
+from instrumentation import instrumented
 
 
-def show_predictive_analytics(df):
+def show_predictive_analytics(df, data, data_key):
     st.header("🤖 Predictive Analytics")
     with st.spinner("Training predictive model..."):
-        model, feature_cols, metrics = train_cost_prediction_model(df)
+        model, feature_cols, metrics = train_cost_prediction_model(data_key, df)
 
     if model is None:
         st.warning("Insufficient data to train predictive model")
+    else:
+        st.metric("Model R² Score", f"{metrics['r2']:.3f}")
+
+    _show_inventory_projection(df, data.get('warehouse', pd.DataFrame()), data_key)
+
+
+@instrumented(cache=st.cache_data)
+def _project_inventory(data_key, _warehouse_df, _df, horizon, demand_scale, lead_time):
+    state = build_inventory_state(_warehouse_df, _df, demand_scale)
+    if state is None:
+        return None, None
+    return state, simulate_inventory(state, horizon, lead_time)
+
+
+def _show_inventory_projection(df, warehouse_df, data_key):
+    st.markdown("---")
+    st.subheader("📦 Inventory Projection")
+    st.markdown("**Day-by-day stock depletion, reorders and storage cost for every warehouse and category**")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        horizon = st.slider("Horizon (days)", 30, 365, INVENTORY_HORIZON_DAYS, 15, key='inventory_horizon')
+    with col2:
+        demand_scale = st.slider("Demand scale (x sample orders)", 10, 500, INVENTORY_DEMAND_SCALE, 10,
+                                 key='inventory_demand_scale')
+    with col3:
+        lead_time = st.slider("Replenishment lead time (days)", 1, 30, INVENTORY_LEAD_TIME_DAYS, 1,
+                              key='inventory_lead_time')
+
+    state, result = _project_inventory(data_key, warehouse_df, df, horizon, demand_scale, lead_time)
+    if state is None:
+        st.info("Warehouse stock data not available for inventory projection")
         return
 
-    st.metric("Model R² Score", f"{metrics['r2']:.3f}")
\ No newline at end of file
+    summary = inventory_summary_table(state, result)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Projected Storage Cost", f"₹{summary['Storage Cost'].sum():,.0f}")
+    with col2:
+        st.metric("Reorders", f"{int(summary['Reorders'].sum()):,}",
+                  delta=f"₹{summary['Order Cost'].sum():,.0f} ordering", delta_color='off')
+    with col3:
+        st.metric("SKUs Stocking Out", f"{int((summary['Stockout Days'] > 0).sum())} / {len(summary)}")
+    with col4:
+        st.metric("Lost Units", f"{summary['Lost Units'].sum():,.0f}")
+
+    levels = pd.DataFrame(result['levels'].T, index=result['dates'])
+    by_category = levels.T.groupby(state['category']).sum().T
+    by_category.index.name = 'Date'
+    by_category = by_category.reset_index().melt(id_vars='Date', var_name='Product_Category', value_name='Stock')
+    fig = cached_figure(px.line, by_category, x='Date', y='Stock', color='Product_Category',
+                        title='Projected Stock by Category')
+    show_chart(fig, use_container_width=True)
+
+    at_risk = summary.sort_values(['First Stockout', 'First Reorder'], na_position='last')
+    st.dataframe(at_risk.round(1), use_container_width=True)
+    st.caption(f"{len(summary)} SKUs simulated over {horizon} days in {result['seconds'] * 1000:.0f} ms")
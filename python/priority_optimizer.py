@@ -0,0 +1,170 @@
+import time
+import numpy as np
+import pandas as pd
+from lp_solver import solve_lp
+from instrumentation import instrumented
+from config import PRIORITY_OPT_MAX_ITER
+
+
+def build_priority_segments(df, segment_cols=('Customer_Segment',)):
+    work = df.dropna(subset=['Priority'])
+    cols = [col for col in segment_cols if col in work.columns]
+    if not cols:
+        work = work.assign(Segment='All')
+        cols = ['Segment']
+    work = work.assign(**{col: work[col].fillna('Unknown').astype(str) for col in cols})
+
+    metrics = {'cost': 'total_cost', 'revenue': 'Order_Value_INR', 'delay': 'delivery_delay_days'}
+    metrics = {name: col for name, col in metrics.items() if col in work.columns}
+
+    grouped = work.groupby(cols + ['Priority'])
+    counts = grouped.size().unstack('Priority', fill_value=0)
+    priorities = list(counts.columns)
+    orders = counts.to_numpy(dtype=float)
+    n = orders.sum(axis=1)
+
+    segments = {
+        'index': counts.index,
+        'customer_segment': (counts.index.get_level_values('Customer_Segment').to_numpy()
+                             if 'Customer_Segment' in cols else np.full(len(counts), 'All')),
+        'priorities': priorities,
+        'orders': n,
+        'current': orders / n[:, None]
+    }
+
+    # Segment-priority cells with no history fall back to that priority's overall mean.
+    for name, col in metrics.items():
+        overall = work.groupby('Priority')[col].mean().reindex(priorities).fillna(0)
+        table = grouped[col].mean().unstack('Priority').reindex(index=counts.index, columns=priorities)
+        segments[name] = table.fillna(overall).to_numpy(dtype=float)
+    return segments
+
+
+@instrumented()
+def optimize_priority_mix(segments, min_express=None, revenue_floor=None, max_delay=None,
+                          max_iter=PRIORITY_OPT_MAX_ITER):
+    # Column generation on the mix LP: every segment chooses a mix on its own
+    # simplex, and only revenue and delay couple segments. The master LP holds
+    # one weight per generated full assignment (plus elastic slacks), and pricing
+    # a new assignment is a vectorized argmin over the segment x priority costs.
+    started = time.perf_counter()
+    cost = segments['cost']
+    n = segments['orders']
+    current = segments['current']
+    priorities = segments['priorities']
+    S, P = cost.shape
+
+    lower = np.zeros((S, P))
+    if min_express and 'Express' in priorities:
+        express = priorities.index('Express')
+        if isinstance(min_express, dict):
+            lower[:, express] = [min_express.get(seg, 0.0) for seg in segments['customer_segment']]
+        else:
+            lower[:, express] = min_express
+    rest = 1 - lower.sum(axis=1)
+    if np.any(rest < -1e-9):
+        return _infeasible(segments, "Minimum shares exceed 100% for some segments", started)
+
+    coupling = []
+    if revenue_floor is not None and 'revenue' in segments:
+        current_revenue = (n[:, None] * segments['revenue'] * current).sum()
+        coupling.append((-n[:, None] * segments['revenue'], -revenue_floor * current_revenue))
+    if max_delay is not None and 'delay' in segments:
+        coupling.append((n[:, None] * segments['delay'] / n.sum(), max_delay))
+    usage = np.array([coef for coef, _ in coupling]).reshape(len(coupling), S, P)
+    bounds = np.array([bound for _, bound in coupling])
+    weighted_cost = n[:, None] * cost
+
+    def vertex(priced):
+        x = lower.copy()
+        x[np.arange(S), priced.argmin(axis=1)] += rest
+        return x
+
+    # The current mix seeds the master LP since it meets any revenue floor up
+    # to 100%, but it is first moved onto the minimum shares: each share is
+    # raised to its minimum and the excess above the minimums scaled to fit.
+    excess = np.maximum(current, lower) - lower
+    total = excess.sum(axis=1, keepdims=True)
+    seed = lower + np.divide(excess * rest[:, None], total, out=np.zeros_like(excess), where=total > 0)
+
+    columns = [seed, vertex(weighted_cost)]
+    scale = abs(weighted_cost).sum() + 1.0
+    penalty = 1e3 * scale
+    result = None
+    for iteration in range(max_iter):
+        column_costs = np.array([(weighted_cost * x).sum() for x in columns])
+        column_usage = np.array([[(coef * x).sum() for x in columns] for coef in usage]).reshape(len(coupling),
+                                                                                                 len(columns))
+        K, J = column_usage.shape
+
+        result = solve_lp(
+            np.concatenate([column_costs, np.full(K, penalty)]),
+            A_ub=np.hstack([column_usage, -np.eye(K)]) if K else None,
+            b_ub=bounds if K else None,
+            A_eq=np.concatenate([np.ones(J), np.zeros(K)])[None, :],
+            b_eq=[1.0]
+        )
+        if not result['success']:
+            return _infeasible(segments, result['message'], started)
+
+        duals = result['duals']
+        priced = weighted_cost - np.tensordot(duals[:K], usage, axes=1)
+        candidate = vertex(priced)
+        reduced = (priced * candidate).sum() - duals[K]
+        if reduced >= -1e-9 * scale:
+            break
+        columns.append(candidate)
+
+    weights = result['x'][:len(columns)]
+    shares = np.tensordot(weights, np.array(columns), axes=1)
+    elastic = result['x'][len(columns):]
+    feasible = not len(elastic) or elastic.sum() <= 1e-6 * scale
+
+    return _summarize(segments, shares, feasible, iteration + 1, started,
+                      'Optimal mix found' if feasible else 'Constraints cannot all be met; showing closest mix')
+
+
+def _summarize(segments, shares, feasible, iterations, started, message):
+    n = segments['orders']
+    current = segments['current']
+    weighted_cost = n[:, None] * segments['cost']
+    orders_total = n.sum()
+    summary = {
+        'shares': shares,
+        'current_cost': float((weighted_cost * current).sum()),
+        'optimized_cost': float((weighted_cost * shares).sum()) if shares is not None else np.nan,
+        'current_mix': (n[:, None] * current).sum(axis=0) / orders_total * 100,
+        'optimized_mix': (n[:, None] * shares).sum(axis=0) / orders_total * 100 if shares is not None else None,
+        'feasible': feasible,
+        'iterations': iterations,
+        'message': message,
+        'seconds': time.perf_counter() - started,
+        'variables': shares.size if shares is not None else current.size
+    }
+    for name in ('revenue', 'delay'):
+        if name in segments and shares is not None:
+            values = n[:, None] * segments[name]
+            summary[f'current_{name}'] = float((values * current).sum())
+            summary[f'optimized_{name}'] = float((values * shares).sum())
+    if 'delay' in segments and shares is not None:
+        summary['current_delay'] /= orders_total
+        summary['optimized_delay'] /= orders_total
+    return summary
+
+
+def _infeasible(segments, message, started):
+    return _summarize(segments, None, False, 0, started, message)
+
+
+def segment_mix_table(segments, result):
+    index = segments['index']
+    priorities = segments['priorities']
+    table = pd.DataFrame(index=index)
+    table['Orders'] = segments['orders'].astype(int)
+    for j, priority in enumerate(priorities):
+        table[f'{priority} Current %'] = segments['current'][:, j] * 100
+        table[f'{priority} Optimized %'] = result['shares'][:, j] * 100
+    table['Current Cost'] = (segments['orders'][:, None] * segments['cost'] * segments['current']).sum(axis=1)
+    table['Optimized Cost'] = (segments['orders'][:, None] * segments['cost'] * result['shares']).sum(axis=1)
+    table['Savings'] = table['Current Cost'] - table['Optimized Cost']
+    return table.reset_index().sort_values('Savings', ascending=False)
@@ -0,0 +1,289 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from config import (ROUTE_PLAN_VEHICLE_CAPACITY, ROUTE_PLAN_NEIGHBORS, ROUTE_PLAN_FULL_PAIRS_MAX,
+                    ROUTE_PLAN_OR_OPT_SEGMENT, ROUTE_PLAN_MAX_PASSES, ROUTE_PLAN_ROAD_FACTOR, CITY_COORDINATES)
+
+
+def _haversine(a, b):
+    lat1, lon1 = np.radians(a).T
+    lat2, lon2 = np.radians(b).T
+    h = (np.sin((lat2[None, :] - lat1[:, None]) / 2) ** 2
+         + np.cos(lat1)[:, None] * np.cos(lat2)[None, :] * np.sin((lon2[None, :] - lon1[:, None]) / 2) ** 2)
+    return 2 * 6371.0 * np.arcsin(np.sqrt(h))
+
+
+def build_distance_matrix(routes, cities=()):
+    # Observed route distances are noisy, so each city pair takes the median of
+    # its orders in either direction. Shortest paths then fill unobserved pairs
+    # and repair triangle-inequality violations; pairs that are still
+    # unreachable fall back to great-circle distance times a road factor.
+    routes = routes.dropna(subset=['Route', 'Distance_KM'])
+    ends = routes['Route'].astype(str).str.split('-', n=1, expand=True)
+    if ends.shape[1] < 2:
+        ends = pd.DataFrame({0: [], 1: []})
+    names = sorted(set(ends[0].dropna()) | set(ends[1].dropna()) | set(cities))
+    index = {name: i for i, name in enumerate(names)}
+    n = len(names)
+
+    matrix = np.full((n, n), np.inf)
+    np.fill_diagonal(matrix, 0.0)
+    valid = ends[1].notna()
+    a = ends.loc[valid, 0].map(index).to_numpy()
+    b = ends.loc[valid, 1].map(index).to_numpy()
+    pairs = pd.DataFrame({'a': np.minimum(a, b), 'b': np.maximum(a, b),
+                          'km': routes.loc[valid[valid].index, 'Distance_KM'].to_numpy(dtype=float)})
+    pairs = pairs[pairs['a'] != pairs['b']].groupby(['a', 'b'])['km'].median()
+    matrix[pairs.index.get_level_values(0), pairs.index.get_level_values(1)] = pairs.to_numpy()
+    matrix[pairs.index.get_level_values(1), pairs.index.get_level_values(0)] = pairs.to_numpy()
+
+    for k in range(n):
+        np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+
+    missing = np.isinf(matrix)
+    if missing.any():
+        known = np.array([name in CITY_COORDINATES for name in names])
+        coords = np.array([CITY_COORDINATES.get(name, (0.0, 0.0)) for name in names])
+        fallback = _haversine(coords, coords) * ROUTE_PLAN_ROAD_FACTOR
+        usable = missing & known[:, None] & known[None, :]
+        matrix[usable] = fallback[usable]
+        finite = matrix[np.isfinite(matrix)]
+        matrix[np.isinf(matrix)] = finite.max() if len(finite) else 0.0
+    return names, matrix
+
+
+def _candidate_pairs(n, dist, coords=None, neighbors=ROUTE_PLAN_NEIGHBORS):
+    # Small problems score every pair; large ones only pair each stop with its
+    # nearest neighbours, which keeps the savings list at O(n * k).
+    if n <= ROUTE_PLAN_FULL_PAIRS_MAX or coords is None:
+        i, j = np.triu_indices(n, 1)
+        return i, j, dist(np.arange(n), np.arange(n))[i, j]
+
+    from sklearn.neighbors import NearestNeighbors
+    k = min(neighbors + 1, n)
+    _, nearest = NearestNeighbors(n_neighbors=k).fit(coords).kneighbors(coords)
+    i = np.repeat(np.arange(n), k - 1)
+    j = nearest[:, 1:].ravel()
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    keys = np.unique(i * n + j)
+    i, j = keys // n, keys % n
+    return i, j, np.sqrt(((coords[i] - coords[j]) ** 2).sum(axis=1)) * ROUTE_PLAN_ROAD_FACTOR
+
+
+def savings_tours(depot_dist, pair_i, pair_j, pair_dist, demand, capacity=ROUTE_PLAN_VEHICLE_CAPACITY):
+    # Clarke-Wright parallel savings: walk candidate links from the largest
+    # saving down and join two tours whenever both stops are tour ends and the
+    # merged load still fits one vehicle.
+    savings = depot_dist[pair_i] + depot_dist[pair_j] - pair_dist
+    order = np.argsort(-savings, kind='stable')
+    order = order[savings[order] > 0]
+
+    n = len(depot_dist)
+    route_of = np.arange(n)
+    tours = [[i] for i in range(n)]
+    load = np.asarray(demand, dtype=float).copy()
+    for i, j in zip(pair_i[order].tolist(), pair_j[order].tolist()):
+        ri, rj = route_of[i], route_of[j]
+        if ri == rj or load[ri] + load[rj] > capacity:
+            continue
+        first, second = tours[ri], tours[rj]
+        if first[-1] != i:
+            if first[0] != i:
+                continue
+            first.reverse()
+        if second[0] != j:
+            if second[-1] != j:
+                continue
+            second.reverse()
+        first.extend(second)
+        route_of[second] = ri
+        load[ri] += load[rj]
+        tours[rj] = None
+    return [np.array(tour) for tour in tours if tour is not None]
+
+
+def _two_opt_move(block, seq):
+    head, tail = seq[:-1], seq[1:]
+    edge = block[head, tail]
+    delta = block[np.ix_(head, head)] + block[np.ix_(tail, tail)] - edge[:, None] - edge[None, :]
+    delta = np.triu(delta, 2)
+    best = np.argmin(delta)
+    i, j = divmod(best, delta.shape[1])
+    return delta[i, j], i, j
+
+
+def _or_opt_move(block, seq, max_segment):
+    # Relocate a run of 1..max_segment stops, optionally reversed, to the
+    # cheapest edge elsewhere in the tour.
+    m = len(seq) - 2
+    head, tail = seq[:-1], seq[1:]
+    edge = block[head, tail]
+    best = (0.0, None)
+    for length in range(1, min(max_segment, m - 1) + 1):
+        starts = np.arange(1, m - length + 2)
+        first, last = seq[starts], seq[starts + length - 1]
+        prev, nxt = seq[starts - 1], seq[starts + length]
+        removal = block[prev, first] + block[last, nxt] - block[prev, nxt]
+        forward = block[head[None, :], first[:, None]] + block[last[:, None], tail[None, :]] - edge[None, :]
+        reverse = block[head[None, :], last[:, None]] + block[first[:, None], tail[None, :]] - edge[None, :]
+        insert = np.minimum(forward, reverse)
+        positions = np.arange(len(edge))
+        touching = (positions[None, :] >= starts[:, None] - 1) & (positions[None, :] <= starts[:, None] + length - 1)
+        delta = np.where(touching, np.inf, insert - removal[:, None])
+        flat = np.argmin(delta)
+        s, k = divmod(flat, delta.shape[1])
+        if delta[s, k] < best[0]:
+            best = (delta[s, k], (starts[s], length, k, reverse[s, k] < forward[s, k]))
+    return best
+
+
+def improve_tour(block, tour_seq=None, max_passes=ROUTE_PLAN_MAX_PASSES, max_segment=ROUTE_PLAN_OR_OPT_SEGMENT,
+                 tol=1e-9):
+    # `block` is the distance matrix of one tour with the depot at index 0.
+    # Alternates best-improvement 2-opt and or-opt moves until neither helps.
+    m = len(block) - 1
+    seq = np.concatenate([[0], np.arange(1, m + 1) if tour_seq is None else tour_seq, [0]])
+    if m < 3:
+        return seq
+    for _ in range(max_passes):
+        delta, i, j = _two_opt_move(block, seq)
+        if delta < -tol:
+            seq[i + 1:j + 1] = seq[i + 1:j + 1][::-1].copy()
+            continue
+        delta, move = _or_opt_move(block, seq, max_segment)
+        if delta >= -tol or move is None:
+            break
+        start, length, k, flip = move
+        segment = seq[start:start + length]
+        if flip:
+            segment = segment[::-1]
+        rest = np.concatenate([seq[:start], seq[start + length:]])
+        at = k + 1 if k < start else k + 1 - length
+        seq = np.concatenate([rest[:at], segment, rest[at:]])
+    return seq
+
+
+def tour_length(block, seq):
+    return float(block[seq[:-1], seq[1:]].sum())
+
+
+def plan_tours(depot_dist, dist, demand, capacity=ROUTE_PLAN_VEHICLE_CAPACITY, coords=None):
+    # `dist(rows, cols)` returns the stop-to-stop distance block for the given
+    # stop indices, so callers can back it with a full matrix or coordinates.
+    n = len(depot_dist)
+    if n == 0:
+        return [], 0.0
+    pair_i, pair_j, pair_dist = _candidate_pairs(n, dist, coords)
+    total = 0.0
+    tours = []
+    for tour in savings_tours(depot_dist, pair_i, pair_j, pair_dist, demand, capacity):
+        block = np.zeros((len(tour) + 1, len(tour) + 1))
+        block[0, 1:] = block[1:, 0] = depot_dist[tour]
+        block[1:, 1:] = dist(tour, tour)
+        seq = improve_tour(block)
+        tours.append(tour[seq[1:-1] - 1])
+        total += tour_length(block, seq)
+    return tours, total
+
+
+def plan_daily_routes(df, routes, capacity=ROUTE_PLAN_VEHICLE_CAPACITY):
+    # Each day's orders leave from their origin city. Full vehicle loads to a
+    # single destination run direct; the remainder becomes one stop per
+    # destination that the savings + local search planner chains into tours.
+    # The baseline is the current practice of one round trip per order.
+    needed = ['Order_Date', 'Origin', 'Destination']
+    if any(col not in df.columns for col in needed):
+        return None
+    orders = df.dropna(subset=needed)
+    if orders.empty:
+        return None
+
+    cities, matrix = build_distance_matrix(routes, set(orders['Origin']) | set(orders['Destination']))
+    index = {name: i for i, name in enumerate(cities)}
+    counts = orders.groupby([orders['Order_Date'].dt.normalize(), 'Origin', 'Destination']).size()
+
+    start = time.perf_counter()
+    records = []
+    for (day, origin), group in counts.groupby(level=[0, 1]):
+        depot = index[origin]
+        dests = np.array([index[name] for name in group.index.get_level_values(2)])
+        count = group.to_numpy()
+        direct_km = float((2 * matrix[depot, dests] * count).sum())
+
+        full_loads, remainder = np.divmod(count, capacity)
+        planned_km = float((2 * matrix[depot, dests] * full_loads).sum())
+        stops = dests[remainder > 0]
+        tours, tour_km = plan_tours(matrix[depot, stops], lambda r, c: matrix[np.ix_(stops[r], stops[c])],
+                                    remainder[remainder > 0], capacity)
+        records.append({
+            'Date': day,
+            'Origin': origin,
+            'Orders': int(count.sum()),
+            'Stops': len(dests),
+            'Tours': int(full_loads.sum()) + len(tours),
+            'Direct KM': direct_km,
+            'Planned KM': planned_km + tour_km
+        })
+    elapsed = time.perf_counter() - start
+
+    plan = pd.DataFrame(records)
+    direct_km = plan['Direct KM'].sum()
+    planned_km = plan['Planned KM'].sum()
+
+    litres_per_km = fuel_price = 0.0
+    if 'Fuel_Consumption_L' in df.columns and 'Distance_KM' in df.columns:
+        distance = df['Distance_KM'].sum()
+        litres = df['Fuel_Consumption_L'].sum()
+        litres_per_km = litres / distance if distance > 0 else 0.0
+        if 'Fuel_Cost' in df.columns and litres > 0:
+            fuel_price = df['Fuel_Cost'].sum() / litres
+    fuel_saved = (direct_km - planned_km) * litres_per_km
+
+    return {
+        'plan': plan,
+        'cities': cities,
+        'matrix': matrix,
+        'direct_km': direct_km,
+        'planned_km': planned_km,
+        'distance_reduction': (direct_km - planned_km) / direct_km * 100 if direct_km > 0 else 0.0,
+        'fuel_saved_litres': fuel_saved,
+        'fuel_saved_cost': fuel_saved * fuel_price,
+        'seconds': elapsed
+    }
+
+
+def benchmark(order_counts=(1000, 10000, 100000), capacity=ROUTE_PLAN_VEHICLE_CAPACITY, radius_km=150, seed=0):
+    # One depot-day of uniformly scattered single-order stops per size.
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n in order_counts:
+        coords = rng.uniform(-radius_km, radius_km, size=(n, 2))
+        depot_dist = np.sqrt((coords ** 2).sum(axis=1)) * ROUTE_PLAN_ROAD_FACTOR
+
+        def dist(r, c):
+            return np.sqrt(((coords[r][:, None, :] - coords[c][None, :, :]) ** 2).sum(axis=2)) * ROUTE_PLAN_ROAD_FACTOR
+
+        start = time.perf_counter()
+        tours, planned_km = plan_tours(depot_dist, dist, np.ones(n), capacity, coords)
+        elapsed = time.perf_counter() - start
+        direct_km = float(2 * depot_dist.sum())
+        rows.append({
+            'orders': n,
+            'tours': len(tours),
+            'direct_km': direct_km,
+            'planned_km': planned_km,
+            'reduction_pct': (direct_km - planned_km) / direct_km * 100,
+            'seconds': elapsed,
+            'orders_per_second': n / elapsed
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the multi-stop route planner')
+    parser.add_argument('--orders', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--capacity', type=int, default=ROUTE_PLAN_VEHICLE_CAPACITY)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(benchmark(args.orders, args.capacity, seed=args.seed).to_string(index=False))
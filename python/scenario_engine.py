@@ -0,0 +1,287 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config import (SCENARIO_RANGES, ORDER_SCENARIO_AVG_SPEED_KMPH, ORDER_SCENARIO_MAINTENANCE_DISTANCE_SHARE,
+                    ORDER_SCENARIO_CACHE_SIZE, ORDER_SCENARIO_DIMENSIONS)
+
+BASE_COLUMNS = {
+    'fuel': 'Fuel_Cost',
+    'labor': 'Labor_Cost',
+    'maintenance': 'Vehicle_Maintenance',
+    'insurance': 'Insurance',
+    'tolls': 'Toll_Charges_INR',
+    'total': 'total_cost'
+}
+
+
+def compute_scenario_base(df):
+    columns = [col for col in BASE_COLUMNS.values() if col in df.columns]
+    sums = df[columns].sum() if columns else {}
+    base = {key: float(sums[col]) if col in columns else 0.0 for key, col in BASE_COLUMNS.items()}
+    base['orders'] = len(df)
+    base['has_fleet'] = 'Vehicle_Maintenance' in df.columns and 'Insurance' in df.columns
+    return base
+
+
+def default_params():
+    return {name: spec[3] for name, spec in SCENARIO_RANGES.items()}
+
+
+def slider_values(name):
+    low, high, step, _ = SCENARIO_RANGES[name]
+    return np.arange(low, high + step, step, dtype=float)
+
+
+def evaluate_scenarios(base, fuel_change=0, fleet_reduction=0, efficiency_gain=0,
+                       distance_reduction=0, delay_reduction=0):
+    # Every argument is a percentage and may be a scalar or an array; arrays
+    # broadcast against each other, so a full grid is one pass of arithmetic.
+    fuel_factor = 1 + np.asarray(fuel_change, dtype=float) / 100
+    fleet_factor = 1 - np.asarray(fleet_reduction, dtype=float) / 100
+    efficiency_factor = 1 - np.asarray(efficiency_gain, dtype=float) / 100
+    distance_factor = 1 - np.asarray(distance_reduction, dtype=float) / 100
+    delay_factor = 1 - np.asarray(delay_reduction, dtype=float) / 100
+
+    fixed = base['maintenance'] + base['insurance']
+    new_fuel = base['fuel'] * fuel_factor * efficiency_factor * distance_factor
+    new_labor = base['labor'] * efficiency_factor * delay_factor
+    new_fixed = fixed * fleet_factor
+    new_tolls = base['tolls'] * distance_factor
+
+    # Tolls sit outside total_cost, so only their change is carried into the total.
+    delta = ((new_fuel - base['fuel']) + (new_labor - base['labor'])
+             + (new_fixed - fixed) + (new_tolls - base['tolls']))
+    return {
+        'fuel': new_fuel,
+        'labor': new_labor,
+        'fixed': new_fixed,
+        'tolls': new_tolls,
+        'delta': delta,
+        'total': base['total'] + delta
+    }
+
+
+def evaluate_grid(base, axes, fixed_params=None):
+    # `axes` maps parameter names to 1-D value arrays; the result arrays have one
+    # dimension per axis, in the order given, with the other parameters held at
+    # `fixed_params`.
+    params = dict(default_params())
+    params.update(fixed_params or {})
+    names = list(axes)
+    grids = np.meshgrid(*[np.asarray(axes[name], dtype=float) for name in names],
+                        indexing='ij', sparse=True)
+    params.update(dict(zip(names, grids)))
+    result = evaluate_scenarios(base, **params)
+    shape = tuple(len(axes[name]) for name in names)
+    return {key: np.broadcast_to(value, shape) for key, value in result.items()}
+
+
+def sensitivity_surface(base, x_param, y_param, fixed_params=None, metric='delta'):
+    x_values = slider_values(x_param)
+    y_values = slider_values(y_param)
+    grid = evaluate_grid(base, {y_param: y_values, x_param: x_values}, fixed_params)
+    return x_values, y_values, grid[metric]
+
+
+def tornado(base, params=None):
+    params = dict(default_params(), **(params or {}))
+    current = float(evaluate_scenarios(base, **params)['total'])
+    names = list(SCENARIO_RANGES)
+
+    # One row per parameter, two columns (range low / range high), evaluated as
+    # a single broadcast over a (parameters x 2) block.
+    block = {name: np.full((len(names), 2), float(params[name])) for name in names}
+    for i, name in enumerate(names):
+        block[name][i] = SCENARIO_RANGES[name][:2]
+    totals = evaluate_scenarios(base, **block)['total']
+
+    low = totals[:, 0] - current
+    high = totals[:, 1] - current
+    order = np.argsort(-np.maximum(np.abs(low), np.abs(high)))
+    return [(names[i], low[i], high[i]) for i in order], current
+
+
+
+def priority_mix_cost(df, new_mix=None):
+    # Orders re-weighted to `new_mix` (percent per priority), each priority at
+    # its current average cost per order.
+    if not ('Priority' in df.columns and 'total_cost' in df.columns):
+        return None
+    current_mix = df['Priority'].value_counts(normalize=True) * 100
+    new_mix = current_mix.to_dict() if new_mix is None else new_mix
+    priority_costs = df.groupby('Priority')['total_cost'].mean().to_dict()
+
+    current_cost = sum(current_mix.get(p, 0) / 100 * priority_costs.get(p, 0) for p in priority_costs) * len(df)
+    new_cost = sum(new_mix.get(p, 0) / 100 * priority_costs.get(p, 0) for p in priority_costs) * len(df)
+    return {'current_mix': current_mix, 'current_cost': current_cost, 'new_cost': new_cost,
+            'delta': new_cost - current_cost}
+
+
+def combined_impact(base):
+    if base['total'] <= 0:
+        return None
+    areas = {
+        'Fuel Efficiency': base['fuel'] * 0.10,
+        'Fleet Management': base['maintenance'] * 0.12,
+        'Route Optimization': (base['fuel'] + base['labor']) * 0.15,
+        'Priority Mix': base['total'] * 0.08
+    }
+    # The levers overlap, so only 85% of their sum is counted together.
+    savings = sum(areas.values()) * 0.85
+    summary = pd.DataFrame({'Optimization Area': list(areas), 'Potential Savings': list(areas.values())})
+    summary['Savings %'] = summary['Potential Savings'] / base['total'] * 100
+    return {'areas': areas, 'savings': savings, 'final_cost': base['total'] - savings,
+            'reduction_pct': savings / base['total'] * 100, 'summary': summary}
+
+
+ORDER_COMPONENTS = ['fuel', 'labor', 'maintenance', 'insurance', 'tolls', 'other']
+
+
+def _column(df, col):
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return np.nan_to_num(df[col].to_numpy(dtype=float, na_value=np.nan))
+
+
+def build_order_base(df):
+    # Pull every column the repricing formulas need into flat float arrays once,
+    # and factorize the rollup dimensions, so a scenario is pure array math.
+    distance = _column(df, 'Distance_KM')
+    fuel_litres = _column(df, 'Fuel_Consumption_L')
+    fuel = _column(df, 'Fuel_Cost')
+    labor = _column(df, 'Labor_Cost')
+    delay = _column(df, 'Traffic_Delay_Minutes')
+    total = _column(df, 'total_cost')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price = fuel / fuel_litres
+        known = np.isfinite(price) & (fuel_litres > 0)
+        fallback = fuel.sum() / fuel_litres[known].sum() if known.any() else 0.0
+        price = np.where(known, price, fallback)
+
+        drive = distance / ORDER_SCENARIO_AVG_SPEED_KMPH * 60
+        minutes = drive + delay
+        labor_rate = np.where(minutes > 0, labor / minutes, 0.0)
+
+    base = {
+        'orders': len(df),
+        'distance': distance,
+        'fuel_litres': np.where(fuel_litres > 0, fuel_litres, fuel / fallback if fallback > 0 else 0.0),
+        'fuel_price': price,
+        'drive_minutes': drive,
+        'delay_minutes': delay,
+        'labor_rate': labor_rate,
+        'labor_flat': np.where(minutes > 0, 0.0, labor),
+        'maintenance': _column(df, 'Vehicle_Maintenance'),
+        'insurance': _column(df, 'Insurance'),
+        'tolls': _column(df, 'Toll_Charges_INR'),
+        'fuel': fuel,
+        'labor': labor,
+        'total': total,
+        'dimensions': {},
+        'current_rollups': {},
+        'cache': OrderedDict(),
+        'lock': threading.Lock()
+    }
+    base['other'] = total - fuel - labor - base['maintenance'] - base['insurance']
+    for col in ORDER_SCENARIO_DIMENSIONS:
+        if col in df.columns:
+            base['dimensions'][col] = pd.factorize(df[col], sort=True)
+    return base
+
+
+def reprice_orders(order_base, fuel_change=0, fleet_reduction=0, efficiency_gain=0,
+                   distance_reduction=0, delay_reduction=0):
+    key = (fuel_change, fleet_reduction, efficiency_gain, distance_reduction, delay_reduction)
+    cache = order_base['cache']
+    # The app shares one order base between sessions on the same filters, so
+    # its memo dicts are only touched under its lock; repricing runs outside it.
+    with order_base['lock']:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+    fuel_factor = 1 + fuel_change / 100
+    fleet_factor = 1 - fleet_reduction / 100
+    efficiency_factor = 1 - efficiency_gain / 100
+    distance_factor = 1 - distance_reduction / 100
+    delay_factor = 1 - delay_reduction / 100
+
+    # Fuel re-prices litres burned on the shortened route at the new pump price;
+    # labor re-prices drive time and traffic delay minutes at each order's own
+    # per-minute rate; maintenance has a distance-driven share and a fleet-driven share.
+    fuel = order_base['fuel_litres'] * (distance_factor * efficiency_factor * fuel_factor)
+    fuel *= order_base['fuel_price']
+
+    minutes = order_base['drive_minutes'] * distance_factor
+    minutes += order_base['delay_minutes'] * delay_factor
+    labor = minutes
+    labor *= order_base['labor_rate']
+    labor *= efficiency_factor
+    labor += order_base['labor_flat'] * efficiency_factor
+
+    share = ORDER_SCENARIO_MAINTENANCE_DISTANCE_SHARE
+    maintenance = order_base['maintenance'] * (fleet_factor * (1 - share + share * distance_factor))
+    insurance = order_base['insurance'] * fleet_factor
+    tolls = order_base['tolls'] * distance_factor
+
+    result = {
+        'fuel': fuel,
+        'labor': labor,
+        'maintenance': maintenance,
+        'insurance': insurance,
+        'tolls': tolls,
+        'other': order_base['other']
+    }
+    total = fuel + labor
+    total += maintenance
+    total += insurance
+    total += order_base['other']
+    result['total'] = total
+    # Tolls sit outside total_cost, so only their change is carried into the delta.
+    delta = total - order_base['total']
+    delta += tolls - order_base['tolls']
+    result['delta'] = delta
+
+    with order_base['lock']:
+        cache[key] = result
+        while len(cache) > ORDER_SCENARIO_CACHE_SIZE:
+            cache.popitem(last=False)
+    return result
+
+
+def rollup_orders(order_base, scenario, by=None):
+    components = ORDER_COMPONENTS + ['total']
+    if by is None or by not in order_base['dimensions']:
+        row = {}
+        for name in components:
+            row[f'{name}_current'] = float(order_base[name].sum())
+            row[f'{name}_scenario'] = float(scenario[name].sum())
+        row['delta'] = float(scenario['delta'].sum())
+        return pd.DataFrame([row], index=pd.Index(['All'], name=by or 'Scope'))
+
+    codes, uniques = order_base['dimensions'][by]
+    valid = codes >= 0
+    if not valid.all():
+        codes = codes[valid]
+    size = len(uniques)
+
+    def bincount(values):
+        return np.bincount(codes, weights=values if valid.all() else values[valid], minlength=size)
+
+    # Baseline rollups never change with the scenario, so they are built once per dimension.
+    with order_base['lock']:
+        current = order_base['current_rollups'].get(by)
+    if current is None:
+        current = {f'{name}_current': bincount(order_base[name]) for name in components}
+        current['orders'] = np.bincount(codes, minlength=size)
+        with order_base['lock']:
+            current = order_base['current_rollups'].setdefault(by, current)
+
+    frame = dict(current)
+    for name in components:
+        frame[f'{name}_scenario'] = bincount(scenario[name])
+    frame['delta'] = bincount(scenario['delta'])
+    columns = [col for name in components for col in (f'{name}_current', f'{name}_scenario')] + ['delta', 'orders']
+    return pd.DataFrame(frame, index=pd.Index(uniques, name=by))[columns]
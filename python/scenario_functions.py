@@ -1,46 +1,84 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime
-
-
-def show_what_if_scenarios(df):
+from config import (SCENARIO_RANGES, SCENARIO_LABELS, MC_DISTRIBUTIONS, MC_TRIALS, MC_SEED, MC_TARGET_REDUCTION,
+                    MC_CACHE_ENTRIES, PRIORITY_SEGMENT_COLS, ORDER_SCENARIO_BASE_ENTRIES)
+from monte_carlo import run_monte_carlo
+from priority_optimizer import build_priority_segments, optimize_priority_mix, segment_mix_table
+from scenario_engine import (compute_scenario_base, evaluate_scenarios, sensitivity_surface,
+                             tornado, default_params, priority_mix_cost, combined_impact, build_order_base,
+                             reprice_orders, rollup_orders, ORDER_COMPONENTS)
+from optimization_engine import analysis_jobs, run_analyses
+from scenario_library import save_scenario, list_scenarios, load_scenario, delete_scenario, diff_scenarios
+from exports import show_export_controls
+from figure_cache import cached_figure, show_chart
+from instrumentation import instrumented
+
+
+def show_what_if_scenarios(df, data, data_key):
     st.header("📈 What-If Scenario Analysis")
     st.markdown("**Model the impact of strategic decisions on costs**")
 
+    # Reduce the filtered data to component totals once; every scenario below
+    # is arithmetic on these totals.
+    base = compute_scenario_base(df)
+
     # Current baseline
-    _show_baseline_metrics(df)
+    _show_baseline_metrics(base, df)
 
     st.markdown("---")
     st.subheader("🎯 Scenario Builder")
 
-    tab1, tab2, tab3, tab4 = st.tabs(
-        ["⛽ Fuel Price Change", "📦 Priority Mix", "🚗 Fleet Optimization", "🗺️ Route Efficiency"])
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+        ["⛽ Fuel Price Change", "📦 Priority Mix", "🚗 Fleet Optimization", "🗺️ Route Efficiency",
+         "📊 Sensitivity", "🧾 Order Repricing", "💾 Saved Scenarios"])
 
     with tab1:
-        _show_fuel_scenario(df)
+        _show_fuel_scenario(base)
 
     with tab2:
         _show_priority_scenario(df)
 
     with tab3:
-        _show_fleet_scenario(df)
+        _show_fleet_scenario(base)
 
     with tab4:
-        _show_route_scenario(df)
+        _show_route_scenario(base, df, data, data_key)
+
+    with tab5:
+        _show_sensitivity_analysis(base)
+
+    with tab6:
+        _show_order_repricing(df, base, data_key)
+
+    with tab7:
+        _show_scenario_library(df, base, data_key)
 
     # Combined impact
-    _show_combined_impact(df)
+    _show_combined_impact(base, data_key)
+
+
+def _scenario_slider(name):
+    low, high, step, default = SCENARIO_RANGES[name]
+    # Seeded through session state so saved scenarios can be applied to the sliders.
+    if name not in st.session_state:
+        st.session_state[name] = default
+    return st.slider(SCENARIO_LABELS[name], low, high, step=step, key=name)
+
 
+def _current_params():
+    return {name: st.session_state.get(name, value) for name, value in default_params().items()}
 
-def _show_baseline_metrics(df):
+
+def _show_baseline_metrics(base, df):
     st.subheader("📊 Current Baseline Metrics")
 
-    current_total_cost = df['total_cost'].sum() if 'total_cost' in df.columns else 0
+    current_total_cost = base['total']
     current_avg_cost = df['total_cost'].mean() if 'total_cost' in df.columns else 0
-    current_fuel_cost = df['Fuel_Cost'].sum() if 'Fuel_Cost' in df.columns else 0
-    current_labor_cost = df['Labor_Cost'].sum() if 'Labor_Cost' in df.columns else 0
+    current_fuel_cost = base['fuel']
+    current_labor_cost = base['labor']
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -53,18 +91,19 @@ def _show_baseline_metrics(df):
         st.metric("Labor Costs", f"₹{current_labor_cost:,.0f}")
 
 
-def _show_fuel_scenario(df):
+def _show_fuel_scenario(base):
     st.markdown("### ⛽ Fuel Price Impact Analysis")
 
-    current_fuel_cost = df['Fuel_Cost'].sum() if 'Fuel_Cost' in df.columns else 0
-    current_total_cost = df['total_cost'].sum() if 'total_cost' in df.columns else 0
+    current_fuel_cost = base['fuel']
+    current_total_cost = base['total']
 
     if current_fuel_cost > 0:
-        fuel_change = st.slider("Fuel Price Change (%)", -30, 50, 0, 5)
+        fuel_change = _scenario_slider('fuel_change')
 
-        new_fuel_cost = current_fuel_cost * (1 + fuel_change / 100)
-        fuel_diff = new_fuel_cost - current_fuel_cost
-        new_total = current_total_cost + fuel_diff
+        scenario = evaluate_scenarios(base, fuel_change=fuel_change)
+        new_fuel_cost = float(scenario['fuel'])
+        fuel_diff = float(scenario['delta'])
+        new_total = float(scenario['total'])
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -83,10 +122,10 @@ def _show_fuel_scenario(df):
             'Total': [current_total_cost, new_total]
         })
 
-        fig = px.bar(scenario_data, x='Scenario', y=['Fuel Cost', 'Other Costs'],
-                     title='Cost Comparison: Current vs Fuel Price Change',
-                     barmode='stack')
-        st.plotly_chart(fig, use_container_width=True)
+        fig = cached_figure(px.bar, scenario_data, x='Scenario', y=['Fuel Cost', 'Other Costs'],
+                            title='Cost Comparison: Current vs Fuel Price Change',
+                            barmode='stack')
+        show_chart(fig, use_container_width=True)
 
         if fuel_change > 0:
             st.markdown(f"""
@@ -115,6 +154,11 @@ def _show_priority_scenario(df):
     st.markdown("### 📦 Priority Mix Optimization")
 
     if 'Priority' in df.columns and 'total_cost' in df.columns:
+        mode = st.radio("Mode", ["Manual Mix", "Optimize Mix"], horizontal=True, key='priority_mode')
+        if mode == "Optimize Mix":
+            _show_priority_optimizer(df)
+            return
+
         current_mix = df['Priority'].value_counts(normalize=True) * 100
 
         st.markdown("**Current Priority Mix:**")
@@ -132,17 +176,10 @@ def _show_priority_scenario(df):
         if total_pct != 100:
             st.warning(f"⚠️ Total percentage is {total_pct}%. Please adjust to 100%.")
 
-        priority_costs = df.groupby('Priority')['total_cost'].mean().to_dict()
-
-        current_weighted_cost = sum([current_mix.get(p, 0) / 100 * priority_costs.get(p, 0)
-                                     for p in priority_costs.keys()])
-        new_weighted_cost = sum([new_mix.get(p, 0) / 100 * priority_costs.get(p, 0)
-                                 for p in priority_costs.keys()])
-
-        total_orders = len(df)
-        current_scenario_cost = current_weighted_cost * total_orders
-        new_scenario_cost = new_weighted_cost * total_orders
-        cost_diff = new_scenario_cost - current_scenario_cost
+        scenario = priority_mix_cost(df, new_mix)
+        current_scenario_cost = scenario['current_cost']
+        new_scenario_cost = scenario['new_cost']
+        cost_diff = scenario['delta']
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -159,9 +196,9 @@ def _show_priority_scenario(df):
             'Scenario': ['Current'] * len(current_mix) + ['Proposed'] * len(current_mix)
         })
 
-        fig = px.bar(comparison_df, x='Priority', y='Percentage', color='Scenario',
-                     title='Priority Mix: Current vs Proposed', barmode='group')
-        st.plotly_chart(fig, use_container_width=True)
+        fig = cached_figure(px.bar, comparison_df, x='Priority', y='Percentage', color='Scenario',
+                            title='Priority Mix: Current vs Proposed', barmode='group')
+        show_chart(fig, use_container_width=True)
 
         if cost_diff < 0:
             st.markdown(f"""
@@ -181,21 +218,82 @@ def _show_priority_scenario(df):
         st.warning("Priority data not available")
 
 
-def _show_fleet_scenario(df):
-    st.markdown("### 🚗 Fleet Optimization Scenario")
+def _show_priority_optimizer(df):
+    st.markdown("**Solve for the lowest-cost priority mix under service and revenue constraints**")
+
+    segment_cols = st.multiselect("Segment orders by", [col for col in PRIORITY_SEGMENT_COLS if col in df.columns],
+                                  default=[col for col in PRIORITY_SEGMENT_COLS[:1] if col in df.columns],
+                                  key='priority_segment_cols')
+    segments = build_priority_segments(df, segment_cols)
 
-    current_fuel_cost = df['Fuel_Cost'].sum() if 'Fuel_Cost' in df.columns else 0
-    current_labor_cost = df['Labor_Cost'].sum() if 'Labor_Cost' in df.columns else 0
+    min_express = {}
+    if 'Express' in segments['priorities']:
+        customer_segments = sorted(set(segments['customer_segment']))
+        cols = st.columns(len(customer_segments))
+        for col, segment in zip(cols, customer_segments):
+            with col:
+                min_express[segment] = st.slider(f"Min Express % ({segment})", 0, 100, 0,
+                                                 key=f'min_express_{segment}') / 100
+
+    col1, col2 = st.columns(2)
+    revenue_floor = None
+    max_delay = None
+    with col1:
+        if 'revenue' in segments:
+            revenue_floor = st.slider("Revenue Floor (% of current)", 50, 110, 100, key='priority_revenue_floor') / 100
+    with col2:
+        if 'delay' in segments:
+            current_delay = float((segments['orders'][:, None] * segments['delay'] * segments['current']).sum()
+                                  / segments['orders'].sum())
+            max_delay = st.number_input("Max Avg Delivery Delay (days)", value=round(current_delay, 2), step=0.1,
+                                        key='priority_max_delay')
+
+    result = optimize_priority_mix(segments, min_express, revenue_floor, max_delay)
+    if result['shares'] is None:
+        st.error(f"⚠️ {result['message']}")
+        return
+    if not result['feasible']:
+        st.warning(f"⚠️ {result['message']}")
+
+    savings = result['current_cost'] - result['optimized_cost']
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Current Mix Cost", f"₹{result['current_cost']:,.0f}")
+    with col2:
+        st.metric("Optimized Mix Cost", f"₹{result['optimized_cost']:,.0f}", delta=f"-₹{savings:,.0f}")
+    with col3:
+        pct = savings / result['current_cost'] * 100 if result['current_cost'] > 0 else 0
+        st.metric("Cost Reduction", f"{pct:.1f}%")
+
+    priorities = segments['priorities']
+    comparison_df = pd.DataFrame({
+        'Priority': priorities * 2,
+        'Percentage': list(result['current_mix']) + list(result['optimized_mix']),
+        'Scenario': ['Current'] * len(priorities) + ['Optimized'] * len(priorities)
+    })
+    fig = cached_figure(px.bar, comparison_df, x='Priority', y='Percentage', color='Scenario',
+                        title='Priority Mix: Current vs Optimized', barmode='group')
+    show_chart(fig, use_container_width=True)
+
+    st.markdown("#### Optimized Mix by Segment")
+    st.dataframe(segment_mix_table(segments, result), use_container_width=True)
+    st.caption(f"{result['variables']:,} segment × priority variables solved in {result['seconds'] * 1000:.0f} ms "
+               f"({result['iterations']} pricing rounds)")
+
+
+def _show_fleet_scenario(base):
+    st.markdown("### 🚗 Fleet Optimization Scenario")
 
-    if 'Vehicle_Maintenance' in df.columns and 'Insurance' in df.columns:
-        fleet_reduction = st.slider("Reduce Fleet by (%)", 0, 30, 10)
-        efficiency_gain = st.slider("Improve Efficiency by (%)", 0, 25, 10)
+    if base['has_fleet']:
+        fleet_reduction = _scenario_slider('fleet_reduction')
+        efficiency_gain = _scenario_slider('efficiency_gain')
 
-        fixed_costs = df['Vehicle_Maintenance'].sum() + df['Insurance'].sum()
-        variable_costs = current_fuel_cost + current_labor_cost
+        fixed_costs = base['maintenance'] + base['insurance']
+        variable_costs = base['fuel'] + base['labor']
 
-        new_fixed = fixed_costs * (1 - fleet_reduction / 100)
-        new_variable = variable_costs * (1 - efficiency_gain / 100)
+        scenario = evaluate_scenarios(base, fleet_reduction=fleet_reduction, efficiency_gain=efficiency_gain)
+        new_fixed = float(scenario['fixed'])
+        new_variable = float(scenario['fuel'] + scenario['labor'])
         new_total_fleet = new_fixed + new_variable
 
         current_fleet_costs = fixed_costs + variable_costs
@@ -216,9 +314,9 @@ def _show_fleet_scenario(df):
             'Amount': [fixed_costs, variable_costs, new_fixed, new_variable]
         })
 
-        fig = px.bar(breakdown_df, x='Scenario', y='Amount', color='Category',
-                     title='Fleet Costs: Current vs Optimized', barmode='stack')
-        st.plotly_chart(fig, use_container_width=True)
+        fig = cached_figure(px.bar, breakdown_df, x='Scenario', y='Amount', color='Category',
+                            title='Fleet Costs: Current vs Optimized', barmode='stack')
+        show_chart(fig, use_container_width=True)
 
         st.markdown(f"""
         <div class="success-box">
@@ -236,22 +334,42 @@ def _show_fleet_scenario(df):
         st.warning("Fleet cost data not available")
 
 
-def _show_route_scenario(df):
+def _planned_routes(df, data, data_key):
+    # The same route analysis the Optimization page runs, so the plan is
+    # computed once per filter set and shared between the two pages.
+    jobs = analysis_jobs(df, data, orders_key=data_key)
+    _, analysis = next(run_analyses({'route': jobs['route']}))
+    return analysis['plan'] if analysis is not None else None
+
+
+def _use_planned_reduction(reduction):
+    low, high, step, default = SCENARIO_RANGES['distance_reduction']
+    st.session_state['distance_reduction'] = int(min(max(round(reduction / step) * step, low), high))
+
+
+def _show_route_scenario(base, df, data, data_key):
     st.markdown("### 🗺️ Route Efficiency Scenario")
 
-    current_fuel_cost = df['Fuel_Cost'].sum() if 'Fuel_Cost' in df.columns else 0
-    current_labor_cost = df['Labor_Cost'].sum() if 'Labor_Cost' in df.columns else 0
+    if base['fuel'] > 0 and base['labor'] > 0:
+        plan = _planned_routes(df, data, data_key)
+        if plan is not None:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.info(f"Route planner: consolidating each day's orders into multi-stop tours cuts distance by "
+                        f"{plan['distance_reduction']:.1f}% and saves ₹{plan['fuel_saved_cost']:,.0f} in fuel.")
+            with col2:
+                st.button("Use planned reduction", key='use_planned_reduction',
+                          on_click=_use_planned_reduction, args=(plan['distance_reduction'],))
 
-    if current_fuel_cost > 0 and current_labor_cost > 0:
-        distance_reduction = st.slider("Reduce Average Distance by (%)", 0, 25, 10)
-        time_reduction = st.slider("Reduce Traffic Delays by (%)", 0, 40, 15)
+        distance_reduction = _scenario_slider('distance_reduction')
+        time_reduction = _scenario_slider('delay_reduction')
 
-        toll_charges = df['Toll_Charges_INR'].sum() if 'Toll_Charges_INR' in df.columns else 0
-        current_distance_costs = current_fuel_cost + toll_charges
-        current_time_costs = current_labor_cost
+        current_distance_costs = base['fuel'] + base['tolls']
+        current_time_costs = base['labor']
 
-        new_distance_costs = current_distance_costs * (1 - distance_reduction / 100)
-        new_time_costs = current_time_costs * (1 - time_reduction / 100)
+        scenario = evaluate_scenarios(base, distance_reduction=distance_reduction, delay_reduction=time_reduction)
+        new_distance_costs = float(scenario['fuel'] + scenario['tolls'])
+        new_time_costs = float(scenario['labor'])
 
         total_route_savings = (current_distance_costs - new_distance_costs) + (current_time_costs - new_time_costs)
 
@@ -271,9 +389,9 @@ def _show_route_scenario(df):
             'Amount': [current_distance_costs, current_time_costs, new_distance_costs, new_time_costs]
         })
 
-        fig = px.bar(route_comparison, x='Scenario', y='Amount', color='Metric',
-                     title='Route Costs: Current vs Optimized', barmode='group')
-        st.plotly_chart(fig, use_container_width=True)
+        fig = cached_figure(px.bar, route_comparison, x='Scenario', y='Amount', color='Metric',
+                            title='Route Costs: Current vs Optimized', barmode='group')
+        show_chart(fig, use_container_width=True)
 
         st.markdown(f"""
         <div class="success-box">
@@ -291,24 +409,211 @@ def _show_route_scenario(df):
         st.warning("Route cost data not available")
 
 
-def _show_combined_impact(df):
+def _show_sensitivity_analysis(base):
+    st.markdown("### 📊 Sensitivity Analysis")
+
+    if base['total'] <= 0:
+        st.warning("Insufficient cost data for sensitivity analysis")
+        return
+
+    params = _current_params()
+    names = list(SCENARIO_RANGES)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        x_param = st.selectbox("Horizontal axis", names, index=0,
+                               format_func=lambda name: SCENARIO_LABELS[name], key='sensitivity_x')
+    with col2:
+        y_options = [name for name in names if name != x_param]
+        y_param = st.selectbox("Vertical axis", y_options, index=0,
+                               format_func=lambda name: SCENARIO_LABELS[name], key='sensitivity_y')
+
+    x_values, y_values, surface = sensitivity_surface(base, x_param, y_param, params)
+    fig = cached_figure(_sensitivity_figure, x_values, y_values, surface / base['total'] * 100,
+                        (params[x_param], params[y_param]), SCENARIO_LABELS[x_param], SCENARIO_LABELS[y_param])
+    show_chart(fig, use_container_width=True)
+
+    bars, current_total = tornado(base, params)
+    tornado_df = pd.DataFrame(bars, columns=['Parameter', 'Low', 'High'])
+    tornado_df['Parameter'] = tornado_df['Parameter'].map(SCENARIO_LABELS)
+    tornado_df = tornado_df.iloc[::-1]
+
+    fig = cached_figure(_tornado_figure, tornado_df, current_total)
+    show_chart(fig, use_container_width=True)
+
+
+def _sensitivity_figure(x_values, y_values, z, current, x_title, y_title):
+    fig = go.Figure(go.Heatmap(
+        x=x_values, y=y_values, z=z,
+        colorscale='RdYlGn_r', zmid=0, colorbar={'title': 'Cost Change %'}
+    ))
+    fig.add_trace(go.Scatter(x=[current[0]], y=[current[1]], mode='markers',
+                             marker={'color': 'black', 'size': 12, 'symbol': 'x'}, name='Current'))
+    fig.update_layout(title='Total Cost Change (%) Across Scenario Grid', height=500,
+                      xaxis_title=x_title, yaxis_title=y_title)
+    return fig
+
+
+def _tornado_figure(tornado_df, current_total):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(y=tornado_df['Parameter'], x=tornado_df['Low'], orientation='h',
+                         name='Range Minimum', marker_color='#27ae60'))
+    fig.add_trace(go.Bar(y=tornado_df['Parameter'], x=tornado_df['High'], orientation='h',
+                         name='Range Maximum', marker_color='#e74c3c'))
+    fig.update_layout(title=f'Tornado: Cost Swing Around Current Scenario (₹{current_total:,.0f})',
+                      barmode='overlay', height=400, xaxis_title='Change in Total Cost (₹)')
+    return fig
+
+
+# Shared between sessions (it holds its own memo of repriced scenarios), keyed
+# by dataset.filter_key rather than by hashing the frame on every rerun.
+@instrumented(cache=st.cache_resource(max_entries=ORDER_SCENARIO_BASE_ENTRIES))
+def _order_scenario_base(data_key, _df):
+    return build_order_base(_df)
+
+
+def _show_order_repricing(df, base, data_key):
+    st.markdown("### 🧾 Order-Level Repricing")
+    st.markdown("Re-prices every order from its own distance, fuel burn and delay minutes "
+                "using the slider settings from the other tabs.")
+
+    if base['total'] <= 0:
+        st.warning("Insufficient cost data for order-level repricing")
+        return
+
+    params = _current_params()
+    order_base = _order_scenario_base(data_key, df)
+    scenario = reprice_orders(order_base, **params)
+    aggregate = evaluate_scenarios(base, **params)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Order-Level Total Cost", f"₹{base['total'] + scenario['delta'].sum():,.0f}",
+                  delta=f"₹{scenario['delta'].sum():,.0f}")
+    with col2:
+        st.metric("Aggregate Model Total Cost", f"₹{float(aggregate['total']):,.0f}",
+                  delta=f"₹{float(aggregate['delta']):,.0f}")
+    with col3:
+        gap = scenario['delta'].sum() - float(aggregate['delta'])
+        st.metric("Difference vs Aggregate", f"₹{gap:,.0f}")
+
+    totals = rollup_orders(order_base, scenario)
+    component_df = pd.DataFrame({
+        'Component': [name.title() for name in ORDER_COMPONENTS] * 2,
+        'Scenario': ['Current'] * len(ORDER_COMPONENTS) + ['Repriced'] * len(ORDER_COMPONENTS),
+        'Amount': ([totals[f'{name}_current'].iloc[0] for name in ORDER_COMPONENTS]
+                   + [totals[f'{name}_scenario'].iloc[0] for name in ORDER_COMPONENTS])
+    })
+    fig = cached_figure(px.bar, component_df, x='Component', y='Amount', color='Scenario',
+                        title='Cost Components: Current vs Repriced', barmode='group')
+    show_chart(fig, use_container_width=True)
+
+    dimensions = list(order_base['dimensions'])
+    if dimensions:
+        by = st.selectbox("Roll up by", dimensions, key='order_rollup_dimension')
+        rollup = rollup_orders(order_base, scenario, by).reset_index()
+        top = rollup.reindex(rollup['delta'].abs().sort_values(ascending=False).index).head(15)
+        fig = cached_figure(px.bar, top, x=by, y='delta', title=f'Largest Cost Changes by {by}',
+                            color='delta', color_continuous_scale='RdYlGn_r',
+                            labels={'delta': 'Cost Change (₹)'}, xaxes={'tickangle': -45})
+        show_chart(fig, use_container_width=True)
+        st.dataframe(rollup, use_container_width=True)
+
+
+def _apply_saved_params(params):
+    for name, value in params.items():
+        st.session_state[name] = value
+
+
+def _show_scenario_library(df, base, data_key):
+    st.markdown("### 💾 Scenario Library")
+    st.markdown("Save the current slider settings with their order-level results, then reload or compare them later.")
+
+    if base['total'] <= 0:
+        st.warning("Insufficient cost data for saving scenarios")
+        return
+
+    params = _current_params()
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        name = st.text_input("Scenario name", key='scenario_save_name')
+    with col2:
+        st.write("")
+        save_clicked = st.button("💾 Save Current", key='scenario_save')
+    if save_clicked:
+        if name.strip():
+            order_base = _order_scenario_base(data_key, df)
+            save_scenario(name.strip(), params, order_base, reprice_orders(order_base, **params))
+            st.success(f"Saved scenario '{name.strip()}'")
+        else:
+            st.warning("Enter a name before saving")
+
+    saved = list_scenarios()
+    if saved.empty:
+        st.info("No saved scenarios yet")
+        return
+
+    display = saved.rename(columns={'name': 'Scenario', 'created_at': 'Saved', 'orders': 'Orders',
+                                    'current_total': 'Baseline Cost', 'scenario_delta': 'Cost Change',
+                                    **SCENARIO_LABELS})
+    st.dataframe(display, use_container_width=True)
+
+    names = saved['name'].tolist()
+    col1, col2 = st.columns(2)
+    with col1:
+        first_name = st.selectbox("Scenario A", names, index=0, key='scenario_diff_a')
+    with col2:
+        second_name = st.selectbox("Scenario B", names, index=min(1, len(names) - 1), key='scenario_diff_b')
+
+    # Saved results are read back as stored; nothing is re-priced here.
+    first = load_scenario(first_name)
+    second = load_scenario(second_name)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button(f"Apply '{first_name}' to sliders", key='scenario_apply',
+                  on_click=_apply_saved_params, args=(first['params'],))
+    with col2:
+        st.button(f"🗑️ Delete '{first_name}'", key='scenario_delete',
+                  on_click=delete_scenario, args=(first_name,))
+
+    dimensions = list(dict.fromkeys(first['results'].index.get_level_values('dimension')))
+    by = st.selectbox("Compare by", dimensions, index=dimensions.index('Route') if 'Route' in dimensions else 0,
+                      key='scenario_diff_dimension')
+    diff = diff_scenarios(first, second, by)
+    if diff.empty:
+        st.info(f"'{by}' was not saved with both scenarios")
+        return
+
+    totals = diff_scenarios(first, second, 'All').iloc[0]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Cost Difference (B − A)", f"₹{totals['total']:,.0f}")
+    with col2:
+        st.metric("Fuel Difference", f"₹{totals['fuel']:,.0f}")
+    with col3:
+        st.metric("Labor Difference", f"₹{totals['labor']:,.0f}")
+
+    top = diff.reindex(diff['total'].abs().sort_values(ascending=False).index).head(15).reset_index()
+    chart_df = top.melt(id_vars=by, value_vars=ORDER_COMPONENTS, var_name='Component', value_name='Difference')
+    fig = cached_figure(px.bar, chart_df, x=by, y='Difference', color='Component',
+                        title=f'{second_name} vs {first_name}: Cost Difference by {by}', barmode='relative',
+                        xaxes={'tickangle': -45})
+    show_chart(fig, use_container_width=True)
+    st.dataframe(diff, use_container_width=True)
+
+
+def _show_combined_impact(base, data_key):
     st.markdown("---")
     st.subheader("🎯 Combined Impact Analysis")
     st.markdown("**If all optimizations were implemented simultaneously:**")
 
-    current_total_cost = df['total_cost'].sum() if 'total_cost' in df.columns else 0
-    current_fuel_cost = df['Fuel_Cost'].sum() if 'Fuel_Cost' in df.columns else 0
-    current_labor_cost = df['Labor_Cost'].sum() if 'Labor_Cost' in df.columns else 0
-
-    if current_total_cost > 0:
-        fuel_saving = current_fuel_cost * 0.10
-        fleet_saving = (df['Vehicle_Maintenance'].sum() if 'Vehicle_Maintenance' in df.columns else 0) * 0.12
-        route_saving = (current_fuel_cost + current_labor_cost) * 0.15
-        priority_saving = current_total_cost * 0.08
-
-        total_combined_savings = (fuel_saving + fleet_saving + route_saving + priority_saving) * 0.85
-        final_cost = current_total_cost - total_combined_savings
-        reduction_pct = (total_combined_savings / current_total_cost) * 100
+    impact = combined_impact(base)
+    if impact is not None:
+        current_total_cost = base['total']
+        total_combined_savings = impact['savings']
+        final_cost = impact['final_cost']
+        reduction_pct = impact['reduction_pct']
 
         col1, col2, col3, col4 = st.columns(4)
         with col1:
@@ -326,25 +631,12 @@ def _show_combined_impact(df):
         waterfall_data = {
             'Category': ['Current Cost', 'Fuel Optimization', 'Fleet Optimization',
                          'Route Optimization', 'Priority Mix', 'Final Cost'],
-            'Value': [current_total_cost, -fuel_saving, -fleet_saving, -route_saving,
-                      -priority_saving, final_cost]
+            'Value': [current_total_cost] + [-saving for saving in impact['areas'].values()] + [final_cost]
         }
         waterfall_df = pd.DataFrame(waterfall_data)
 
-        fig = go.Figure(go.Waterfall(
-            x=waterfall_df['Category'],
-            y=waterfall_df['Value'],
-            measure=['absolute', 'relative', 'relative', 'relative', 'relative', 'total'],
-            text=[f"₹{abs(v):,.0f}" for v in waterfall_df['Value']],
-            textposition="outside",
-            connector={"line": {"color": "rgb(63, 63, 63)"}},
-            decreasing={"marker": {"color": "#27ae60"}},
-            increasing={"marker": {"color": "#e74c3c"}},
-            totals={"marker": {"color": "#3498db"}}
-        ))
-
-        fig.update_layout(title="Cumulative Cost Reduction Waterfall", showlegend=False, height=500)
-        st.plotly_chart(fig, use_container_width=True)
+        fig = cached_figure(_waterfall_figure, waterfall_df)
+        show_chart(fig, use_container_width=True)
 
         if reduction_pct >= 15:
             st.markdown(f"""
@@ -364,23 +656,92 @@ def _show_combined_impact(df):
             </div>
             """, unsafe_allow_html=True)
 
-        scenario_summary = pd.DataFrame({
-            'Optimization Area': ['Fuel Efficiency', 'Fleet Management', 'Route Optimization', 'Priority Mix'],
-            'Potential Savings': [fuel_saving, fleet_saving, route_saving, priority_saving],
-            'Savings %': [
-                (fuel_saving / current_total_cost) * 100,
-                (fleet_saving / current_total_cost) * 100,
-                (route_saving / current_total_cost) * 100,
-                (priority_saving / current_total_cost) * 100
-            ]
-        })
+        scenario_summary = impact['summary']
+
+        show_export_controls(scenario_summary, "Scenario Analysis Report", "what_if_analysis", data_key)
+
+        if st.checkbox("🎲 Monte Carlo uncertainty mode", key='monte_carlo_mode'):
+            _show_monte_carlo(base)
+    else:
+        st.warning("Insufficient cost data for combined impact analysis")
+
+
+def _waterfall_figure(waterfall_df):
+    fig = go.Figure(go.Waterfall(
+        x=waterfall_df['Category'],
+        y=waterfall_df['Value'],
+        measure=['absolute', 'relative', 'relative', 'relative', 'relative', 'total'],
+        text=[f"₹{abs(v):,.0f}" for v in waterfall_df['Value']],
+        textposition="outside",
+        connector={"line": {"color": "rgb(63, 63, 63)"}},
+        decreasing={"marker": {"color": "#27ae60"}},
+        increasing={"marker": {"color": "#e74c3c"}},
+        totals={"marker": {"color": "#3498db"}}
+    ))
+    fig.update_layout(title="Cumulative Cost Reduction Waterfall", showlegend=False, height=500)
+    return fig
+
+
+@instrumented(cache=st.cache_data(max_entries=MC_CACHE_ENTRIES))
+def _simulate_combined_impact(base, trials, seed, _timing):
+    # Only the summary and the histogram are cached, not the per-trial arrays.
+    # Timings describe the run that just happened, so they go into `_timing`,
+    # which stays empty when the result comes from the cache.
+    result = run_monte_carlo(base, trials=trials, seed=seed)
+    _timing.update({key: result[key] for key in ('elapsed', 'trials_per_second', 'workers')})
+    counts, edges = np.histogram(result['reduction'], bins=60)
+    summary = {key: value for key, value in result.items()
+               if key not in ('savings', 'reduction', 'elapsed', 'trials_per_second', 'workers')}
+    summary['histogram'] = ((edges[:-1] + edges[1:]) / 2, counts / trials * 100)
+    return summary
+
+
+def _show_monte_carlo(base):
+    st.markdown("#### 🎲 Savings Uncertainty")
+    st.markdown("Savings rates, overlap, fuel price moves and adoption are drawn from the configured distributions.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        trials = st.number_input("Trials", 10000, 10000000, MC_TRIALS, 10000, key='mc_trials')
+    with col2:
+        seed = st.number_input("Random Seed", 0, 2 ** 31 - 1, MC_SEED, key='mc_seed')
+
+    with st.spinner("Running simulation..."):
+        timing = {}
+        result = _simulate_combined_impact(base, int(trials), int(seed), timing)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("P10 Savings", f"₹{result['savings_p10']:,.0f}", delta=f"{result['reduction_p10']:.1f}%")
+    with col2:
+        st.metric("P50 Savings", f"₹{result['savings_p50']:,.0f}", delta=f"{result['reduction_p50']:.1f}%")
+    with col3:
+        st.metric("P90 Savings", f"₹{result['savings_p90']:,.0f}", delta=f"{result['reduction_p90']:.1f}%")
+    with col4:
+        st.metric(f"P(≥{MC_TARGET_REDUCTION}% Reduction)", f"{result['prob_target'] * 100:.1f}%")
+
+    fig = cached_figure(_monte_carlo_figure, *result['histogram'])
+    show_chart(fig, use_container_width=True)
 
-        csv = scenario_summary.to_csv(index=False).encode('utf-8')
-        st.download_button(
-            label="📥 Download Scenario Analysis Report",
-            data=csv,
-            file_name=f"what_if_analysis_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
-        )
+    if timing:
+        st.caption(f"{result['trials']:,} trials in {timing['elapsed']:.2f}s "
+                   f"({timing['trials_per_second']:,.0f} trials/s, {timing['workers']} worker(s), seed {int(seed)})")
     else:
-        st.warning("Insufficient cost data for combined impact analysis")
\ No newline at end of file
+        st.caption(f"{result['trials']:,} trials, seed {int(seed)} (cached result)")
+
+    with st.expander("Simulation assumptions"):
+        assumptions = pd.DataFrame([
+            {'Input': name.replace('_', ' ').title(), 'Distribution': spec[0],
+             'Parameters': ', '.join(str(value) for value in spec[1:])}
+            for name, spec in MC_DISTRIBUTIONS.items()
+        ])
+        st.dataframe(assumptions, use_container_width=True)
+
+
+def _monte_carlo_figure(centers, share):
+    fig = go.Figure(go.Bar(x=centers, y=share, marker_color='steelblue'))
+    fig.add_vline(x=MC_TARGET_REDUCTION, line_dash="dash", line_color="red",
+                  annotation_text=f"{MC_TARGET_REDUCTION}% goal", annotation_position="top")
+    fig.update_layout(title='Distribution of Cost Reduction (%)', height=400, bargap=0,
+                      xaxis_title='Cost Reduction (%)', yaxis_title='Share of Trials (%)')
+    return fig
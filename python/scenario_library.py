@@ -0,0 +1,120 @@
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import SCENARIO_LIBRARY_PATH, SCENARIO_LIBRARY_DIMENSIONS
+from scenario_engine import ORDER_COMPONENTS, rollup_orders
+
+RESULT_COMPONENTS = ORDER_COMPONENTS + ['total']
+RESULT_COLUMNS = ([f'{name}_{side}' for name in RESULT_COMPONENTS for side in ('current', 'scenario')]
+                  + ['delta', 'orders'])
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    params TEXT NOT NULL,
+    orders INTEGER NOT NULL,
+    current_total REAL NOT NULL,
+    scenario_delta REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenario_results (
+    scenario_id INTEGER NOT NULL REFERENCES scenarios(id) ON DELETE CASCADE,
+    dimension TEXT NOT NULL,
+    member TEXT NOT NULL,
+    {', '.join(f'{col} REAL' for col in RESULT_COLUMNS)},
+    PRIMARY KEY (scenario_id, dimension, member)
+);
+"""
+
+
+def connect(path=SCENARIO_LIBRARY_PATH):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _result_rows(order_base, scenario, dimensions):
+    # Every rollup is computed once at save time, so loading and diffing a
+    # saved scenario is a plain table read.
+    frames = [rollup_orders(order_base, scenario).assign(orders=len(order_base['total']))]
+    frames[0].index = pd.Index(['All'])
+    keys = ['All']
+    for dim in dimensions:
+        if dim in order_base['dimensions']:
+            frames.append(rollup_orders(order_base, scenario, dim))
+            keys.append(dim)
+    results = pd.concat(frames, keys=keys, names=['dimension', 'member'])
+    results = results.reset_index()
+    results['member'] = results['member'].astype(str)
+    return results[['dimension', 'member'] + RESULT_COLUMNS]
+
+
+def save_scenario(name, params, order_base, scenario, dimensions=SCENARIO_LIBRARY_DIMENSIONS,
+                  path=SCENARIO_LIBRARY_PATH):
+    results = _result_rows(order_base, scenario, dimensions)
+    overall = results.iloc[0]
+    with closing(connect(path)) as conn, conn:
+        conn.execute('DELETE FROM scenarios WHERE name = ?', (name,))
+        cursor = conn.execute(
+            'INSERT INTO scenarios (name, created_at, params, orders, current_total, scenario_delta) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (name, datetime.now().isoformat(timespec='seconds'), json.dumps(params),
+             int(overall['orders']), float(overall['total_current']), float(overall['delta'])))
+        scenario_id = cursor.lastrowid
+        placeholders = ', '.join('?' * (len(RESULT_COLUMNS) + 3))
+        conn.executemany(
+            f'INSERT INTO scenario_results VALUES ({placeholders})',
+            [(scenario_id, *row) for row in results.itertuples(index=False, name=None)])
+    return scenario_id
+
+
+def list_scenarios(path=SCENARIO_LIBRARY_PATH):
+    with closing(connect(path)) as conn, conn:
+        saved = pd.read_sql_query('SELECT name, created_at, params, orders, current_total, scenario_delta '
+                                  'FROM scenarios ORDER BY created_at DESC, id DESC', conn)
+    params = pd.DataFrame([json.loads(value) for value in saved.pop('params')], index=saved.index)
+    return pd.concat([saved, params], axis=1)
+
+
+def load_scenario(name, path=SCENARIO_LIBRARY_PATH):
+    with closing(connect(path)) as conn, conn:
+        row = conn.execute('SELECT id, params, created_at FROM scenarios WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"No saved scenario named '{name}'")
+        results = pd.read_sql_query(
+            f"SELECT dimension, member, {', '.join(RESULT_COLUMNS)} FROM scenario_results WHERE scenario_id = ?",
+            conn, params=(row[0],))
+    return {
+        'name': name,
+        'params': json.loads(row[1]),
+        'created_at': row[2],
+        'results': results.set_index(['dimension', 'member']).sort_index()
+    }
+
+
+def delete_scenario(name, path=SCENARIO_LIBRARY_PATH):
+    with closing(connect(path)) as conn, conn:
+        conn.execute('DELETE FROM scenarios WHERE name = ?', (name,))
+
+
+def diff_scenarios(first, second, dimension='Route', components=None):
+    # `first` and `second` are loaded scenarios. Members are aligned on the
+    # union of both indexes and every component is differenced in one array op.
+    components = components or RESULT_COMPONENTS
+    left = first['results'].xs(dimension, level='dimension') if dimension in first['results'].index.levels[0] else None
+    right = second['results'].xs(dimension, level='dimension') if dimension in second['results'].index.levels[0] else None
+    if left is None or right is None:
+        return pd.DataFrame(columns=components)
+
+    members = left.index.union(right.index)
+    scenario_cols = [f'{name}_scenario' for name in components]
+    a = left.reindex(members)[scenario_cols].to_numpy(dtype=float)
+    b = right.reindex(members)[scenario_cols].to_numpy(dtype=float)
+    diff = pd.DataFrame(np.nan_to_num(b) - np.nan_to_num(a), index=members, columns=components)
+    diff.index.name = dimension
+    return diff
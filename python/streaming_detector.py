@@ -0,0 +1,223 @@
+import math
+import numpy as np
+import pandas as pd
+from instrumentation import instrumented
+from config import (STREAM_METRICS, STREAM_KEY_COLS, STREAM_EWMA_ALPHA, STREAM_WINDOW_ALPHA,
+                    STREAM_Z_THRESHOLD, STREAM_WINDOW_Z_THRESHOLD, STREAM_MIN_OBS)
+
+
+class RollingCostDetector:
+    # Per-key state is a fixed-size list of floats, so update() is O(1) per order
+    # and the detector can keep consuming rows as they are appended.
+    # Until 1/alpha observations have been seen the weights fall back to 1/n,
+    # which makes the warm-up phase an exact Welford running mean/variance.
+
+    def __init__(self, metrics=STREAM_METRICS, key_cols=STREAM_KEY_COLS, alpha=STREAM_EWMA_ALPHA,
+                 window_alpha=STREAM_WINDOW_ALPHA, z_threshold=STREAM_Z_THRESHOLD,
+                 window_z_threshold=STREAM_WINDOW_Z_THRESHOLD, min_obs=STREAM_MIN_OBS):
+        self.metrics = list(metrics)
+        self.key_cols = list(key_cols)
+        self.alpha = alpha
+        self.window_alpha = window_alpha
+        self.z_threshold = z_threshold
+        self.window_z_threshold = window_z_threshold
+        self.min_obs = min_obs
+        self.window_scale = math.sqrt(window_alpha / (2 - window_alpha))
+        self.state = {}
+
+    def update(self, key, values):
+        states = self.state.get(key)
+        if states is None:
+            states = [[0, 0.0, 0.0, 0.0] for _ in self.metrics]
+            self.state[key] = states
+
+        z_scores = []
+        window_z_scores = []
+        for state, x in zip(states, values):
+            if x is None or x != x:
+                z_scores.append(np.nan)
+                window_z_scores.append(np.nan)
+                continue
+
+            count, mean, var, window_mean = state
+            std = math.sqrt(var) if var > 0 else 0.0
+            if count >= self.min_obs and std > 0:
+                z_scores.append((x - mean) / std)
+            else:
+                z_scores.append(np.nan)
+
+            count += 1
+            a = max(self.alpha, 1.0 / count)
+            w = max(self.window_alpha, 1.0 / count)
+            delta = x - mean
+            mean += a * delta
+            var = (1 - a) * (var + a * delta * delta)
+            window_mean += w * (x - window_mean)
+
+            if count >= self.min_obs and var > 0:
+                window_z_scores.append((window_mean - mean) / (math.sqrt(var) * self.window_scale))
+            else:
+                window_z_scores.append(np.nan)
+
+            state[0], state[1], state[2], state[3] = count, mean, var, window_mean
+
+        order_flag = any(abs(z) > self.z_threshold for z in z_scores if z == z)
+        window_flag = any(abs(z) > self.window_z_threshold for z in window_z_scores if z == z)
+        return z_scores, window_z_scores, order_flag, window_flag
+
+    def scan(self, df):
+        # Batch equivalent of calling update() on every row in date order. The
+        # detector's recurrences are linear in the value and its square, so each
+        # (key, metric) series is solved with cumulative sums for the warm-up
+        # and one IIR filter pass for the EWMA, and the final state is written
+        # back so update() can carry on from the last row.
+        metrics = [m for m in self.metrics if m in df.columns]
+        if not metrics:
+            return pd.DataFrame(index=df.index)
+
+        group, key_list = self._series_codes(df)
+        states = [self.state.setdefault(key, [[0, 0.0, 0.0, 0.0] for _ in self.metrics]) for key in key_list]
+        order = np.arange(len(df))
+        if 'Order_Date' in df.columns:
+            dates = df['Order_Date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+            dates = np.where(dates == np.iinfo(np.int64).min, np.iinfo(np.int64).max, dates)
+            order = np.argsort(dates, kind='stable')
+        order = order[np.argsort(group[order], kind='stable')]
+
+        n = len(df)
+        z = np.full((n, len(self.metrics)), np.nan)
+        window_z = np.full((n, len(self.metrics)), np.nan)
+        for j, metric in enumerate(self.metrics):
+            if metric not in metrics:
+                continue
+            values = df[metric].to_numpy(dtype=float)[order]
+            present = ~np.isnan(values)
+            rows = order[present]
+            prior = np.array([state[j] for state in states], dtype=float)
+            z[rows, j], window_z[rows, j], final = self._scan_series(values[present], group[rows], prior)
+            for g, state in final.items():
+                states[g][j] = state
+
+        result = pd.DataFrame(index=df.index)
+        for j, metric in enumerate(self.metrics):
+            if metric in metrics:
+                result[f'{metric}_z'] = z[:, j]
+                result[f'{metric}_window_z'] = window_z[:, j]
+        with np.errstate(invalid='ignore'):
+            result['order_flag'] = (np.abs(z) > self.z_threshold).any(axis=1)
+            result['window_flag'] = (np.abs(window_z) > self.window_z_threshold).any(axis=1)
+        return result
+
+    def _series_codes(self, df):
+        # Series id per row plus the state key of each id, with keys built as
+        # update() sees them (strings, missing values as 'All').
+        combined = np.zeros(len(df), dtype=np.int64)
+        uniques = []
+        for col in self.key_cols:
+            if col in df.columns:
+                codes, values = pd.factorize(df[col])
+            else:
+                codes, values = np.full(len(df), -1), []
+            uniques.append(['All' if value != value else str(value) for value in values] + ['All'])
+            combined = combined * (len(values) + 1) + np.where(codes < 0, len(values), codes)
+        combined, distinct = pd.factorize(combined)
+        ids = {}
+        remap = np.empty(len(distinct), dtype=np.int64)
+        for i, code in enumerate(distinct):
+            key = []
+            for names in reversed(uniques):
+                code, at = divmod(code, len(names))
+                key.append(names[at])
+            remap[i] = ids.setdefault(tuple(reversed(key)), len(ids))
+        return remap[combined], list(ids)
+
+    def _scan_series(self, x, group, prior):
+        # `x` holds one metric's values grouped by series (in time order within
+        # each); `prior` is every series' [count, mean, var, window_mean]. A
+        # series already tracked gets a leading virtual row standing in for its
+        # history, weighted by its count.
+        seen = np.unique(group)
+        carried = seen[prior[seen, 0] > 0]
+        series = np.concatenate([carried, group])
+        real = np.concatenate([np.zeros(len(carried), dtype=bool), np.ones(len(group), dtype=bool)])
+        order = np.lexsort((real, series))
+        series, real = series[order], real[order]
+        x = np.concatenate([np.zeros(len(carried)), x])[order]
+
+        # Centre each series on its first value (or prior mean) so the second
+        # moment doesn't cancel catastrophically.
+        starts = np.ones(len(series), dtype=bool)
+        starts[1:] = series[1:] != series[:-1]
+        first_value = x[starts]
+        centre = np.where(prior[series[starts], 0] > 0, prior[series[starts], 1], first_value)
+        position = np.cumsum(starts) - 1
+        u = np.where(real, x - centre[position], 0.0)
+        weight = np.where(real, 1.0, prior[series, 0])
+        square = np.where(real, u * u, prior[series, 2])
+        recent = np.where(real, u, prior[series, 3] - centre[position])
+
+        count = _series_cumsum(weight, starts, position)
+        mean = _running_mean(u, weight, count, starts, position, self.alpha)
+        var = _running_mean(square, weight, count, starts, position, self.alpha) - mean * mean
+        var = np.where(var > 1e-12 * np.abs(mean * mean + var), var, 0.0)
+        window_mean = _running_mean(recent, weight, count, starts, position, self.window_alpha)
+
+        prev_count = np.where(starts, 0.0, np.roll(count, 1))
+        prev_mean = np.roll(mean, 1)
+        prev_var = np.where(starts, 0.0, np.roll(var, 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.where((prev_count >= self.min_obs) & (prev_var > 0), (u - prev_mean) / np.sqrt(prev_var), np.nan)
+            window_z = np.where((count >= self.min_obs) & (var > 0),
+                                (window_mean - mean) / (np.sqrt(var) * self.window_scale), np.nan)
+
+        last = np.append(starts[1:], True)
+        final = {int(g): [int(c), m + c0, v, w + c0]
+                 for g, c, m, v, w, c0 in zip(series[last], count[last], mean[last], var[last],
+                                              window_mean[last], centre)}
+        return z[real], window_z[real], final
+
+    def summary(self):
+        rows = []
+        for key, states in self.state.items():
+            row = dict(zip(self.key_cols, key))
+            for metric, (count, mean, var, window_mean) in zip(self.metrics, states):
+                row[f'{metric}_count'] = count
+                row[f'{metric}_mean'] = mean
+                row[f'{metric}_std'] = math.sqrt(var)
+                row[f'{metric}_recent'] = window_mean
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+
+def _series_cumsum(values, starts, position):
+    total = np.cumsum(values)
+    return total - (total - values)[starts][position]
+
+
+def _running_mean(u, weight, count, starts, position, alpha):
+    # m_n = (1 - a) m_(n-1) + a u_n with a = max(alpha, weight_n / count_n),
+    # restarted at each series start. While a > alpha it is the weighted running
+    # mean; after that an EWMA seeded with the last warm-up mean, run for all
+    # series at once by one lfilter pass with the carry-over across series
+    # boundaries subtracted out.
+    from scipy.signal import lfilter
+    mean = _series_cumsum(weight * u, starts, position) / count
+    warm = starts | (count * alpha <= 1)
+    if warm.all():
+        return mean
+    seed = warm & np.append(~warm[1:], False)
+    decay = 1 - alpha
+    inputs = np.where(seed, mean, np.where(warm, 0.0, alpha * u))
+    filtered = lfilter([1.0], [1.0, -decay], inputs)
+    seed_at = np.maximum.accumulate(np.where(seed, np.arange(len(u)), 0))
+    carry = np.where(seed_at > 0, filtered[np.maximum(seed_at - 1, 0)], 0.0)
+    tail = ~warm
+    steps = np.arange(len(u)) - seed_at
+    mean[tail] = filtered[tail] - carry[tail] * decay ** (steps[tail] + 1)
+    return mean
+
+
+@instrumented()
+def detect_rolling_anomalies(df, detector=None):
+    detector = detector or RollingCostDetector()
+    return detector.scan(df), detector
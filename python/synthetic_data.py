@@ -0,0 +1,218 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from config import CITY_COORDINATES, ROUTE_PLAN_ROAD_FACTOR, SYNTHETIC_CHUNK_ROWS, SYNTHETIC_SEED
+from dataset import TABLE_FILES
+
+# Category weights follow the shipped sample CSVs.
+SEGMENTS = {'SMB': 0.40, 'Enterprise': 0.30, 'Individual': 0.30}
+PRIORITIES = {'Standard': 0.42, 'Economy': 0.35, 'Express': 0.23}
+CATEGORIES = {'Fashion': 0.17, 'Books': 0.155, 'Home Goods': 0.15, 'Electronics': 0.145, 'Food & Beverage': 0.145,
+              'Industrial': 0.135, 'Healthcare': 0.10}
+ORIGINS = {'Mumbai': 0.22, 'Delhi': 0.18, 'Bangalore': 0.16, 'Kolkata': 0.12, 'Chennai': 0.11, 'Hyderabad': 0.09,
+           'Pune': 0.07, 'Ahmedabad': 0.05}
+HANDLING = {'None': 0.765, 'Fragile': 0.115, 'Temperature_Controlled': 0.065, 'Hazmat': 0.055}
+CARRIERS = {'SpeedyLogistics': 0.27, 'ReliableExpress': 0.27, 'QuickShip': 0.21, 'GlobalTransit': 0.15,
+            'EcoDeliver': 0.10}
+PROMISED_DAYS = {'Express': (1, 2), 'Standard': (3, 5), 'Economy': (5, 10)}
+QUALITY = {'Perfect': 0.89, 'Minor_Damage': 0.04, 'Wrong_Item': 0.04, 'Incomplete': 0.02, 'Major_Damage': 0.01}
+WEATHER = {'None': 0.78, 'Light_Rain': 0.12, 'Heavy_Rain': 0.07, 'Fog': 0.03}
+VEHICLES = {
+    # type: (share, capacity kg range, km per litre range, CO2 kg per km range)
+    'Large_Truck': (0.28, (6000, 10000), (4.0, 6.0), (0.50, 0.65)),
+    'Small_Van': (0.26, (500, 1200), (9.0, 12.0), (0.20, 0.30)),
+    'Refrigerated': (0.24, (1500, 4000), (5.0, 7.0), (0.40, 0.50)),
+    'Medium_Truck': (0.18, (2500, 5000), (6.0, 8.0), (0.35, 0.45)),
+    'Express_Bike': (0.04, (20, 40), (25.0, 31.0), (0.08, 0.10))
+}
+VEHICLE_STATUSES = {'Available': 0.56, 'In_Transit': 0.38, 'Maintenance': 0.06}
+FEEDBACK_TEXT = {
+    'positive': ['Great service, very fast delivery!', 'No complaints, smooth process', 'Perfect condition, thank you',
+                 'Excellent packaging', 'Driver was very professional'],
+    'negative': ['Late delivery but good quality', 'Wrong item delivered', 'Package arrived damaged',
+                 'Delivery took too long']
+}
+ISSUES = {'Timing': 0.42, 'Quality': 0.31, 'Service': 0.22, 'Other': 0.05}
+
+
+def _choice(rng, weights, size):
+    names = list(weights)
+    p = np.array(list(weights.values()), dtype=float)
+    return np.array(names, dtype=object)[rng.choice(len(names), size=size, p=p / p.sum())]
+
+
+def _city_distances(cities):
+    lat, lon = np.radians(np.array([CITY_COORDINATES[city] for city in cities])).T
+    h = (np.sin((lat[None, :] - lat[:, None]) / 2) ** 2
+         + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin((lon[None, :] - lon[:, None]) / 2) ** 2)
+    return 2 * 6371.0 * np.arcsin(np.sqrt(h))
+
+
+def _append(frame, path, first):
+    frame.to_csv(path, mode='w' if first else 'a', header=first, index=False, float_format='%.2f',
+                 date_format='%Y-%m-%d')
+
+
+def _order_chunk(rng, start, size, width, start_date, days, coverage):
+    ids = pd.Series(np.arange(start + 1, start + size + 1)).astype(str).str.zfill(width).radd('ORD').to_numpy()
+    priority = _choice(rng, PRIORITIES, size)
+    origin = _choice(rng, ORIGINS, size)
+    cities = pd.Index(list(CITY_COORDINATES))
+    # Any other city, domestic or international, as the destination.
+    origin_code = cities.get_indexer(origin)
+    destination_code = rng.integers(0, len(cities) - 1, size)
+    destination_code += destination_code >= origin_code
+    destination = cities.to_numpy(dtype=object)[destination_code]
+    order_date = pd.Timestamp(start_date) + pd.to_timedelta(rng.integers(0, days, size), unit='D')
+    handling = _choice(rng, HANDLING, size)
+
+    orders = pd.DataFrame({
+        'Order_ID': ids,
+        'Order_Date': order_date,
+        'Customer_Segment': _choice(rng, SEGMENTS, size),
+        'Priority': priority,
+        'Product_Category': _choice(rng, CATEGORIES, size),
+        'Order_Value_INR': np.minimum(rng.lognormal(6.2, 1.6, size), 100000),
+        'Origin': origin,
+        'Destination': destination,
+        'Special_Handling': handling
+    })
+
+    # Only a share of orders has shipped, as in the sample data.
+    shipped = rng.random(size) < coverage
+    n = int(shipped.sum())
+    distance = (_city_distances(cities)[origin_code[shipped], destination_code[shipped]]
+                * ROUTE_PLAN_ROAD_FACTOR * rng.lognormal(0, 0.15, n))
+    fuel = distance / rng.uniform(6.0, 10.0, n)
+    delay_minutes = np.round(rng.gamma(1.5, 14, n))
+    routes = pd.DataFrame({
+        'Order_ID': ids[shipped],
+        'Route': origin[shipped] + '-' + destination[shipped],
+        'Distance_KM': distance,
+        'Fuel_Consumption_L': fuel,
+        'Toll_Charges_INR': np.where(rng.random(n) < 0.1, 0, distance * rng.uniform(0.08, 0.25, n)),
+        'Traffic_Delay_Minutes': delay_minutes.astype(int),
+        'Weather_Impact': _choice(rng, WEATHER, n)
+    })
+
+    shipped_priority = pd.Series(priority[shipped])
+    low = shipped_priority.map({name: days[0] for name, days in PROMISED_DAYS.items()}).to_numpy()
+    high = shipped_priority.map({name: days[1] for name, days in PROMISED_DAYS.items()}).to_numpy()
+    promised = rng.integers(low, high + 1)
+    late = _choice(rng, {0: 0.53, 1: 0.18, 2: 0.12, 3: 0.07, 4: 0.06, 5: 0.04}, n).astype(int)
+    status = np.where(late == 0, 'On-Time', np.where(late <= 2, 'Slightly-Delayed', 'Severely-Delayed'))
+    rating = np.clip(5 - late - rng.integers(0, 2, n), 1, 5)
+    delivery = pd.DataFrame({
+        'Order_ID': ids[shipped],
+        'Carrier': _choice(rng, CARRIERS, n),
+        'Promised_Delivery_Days': promised,
+        'Actual_Delivery_Days': promised + late,
+        'Delivery_Status': status,
+        'Quality_Issue': _choice(rng, QUALITY, n),
+        'Customer_Rating': rating,
+        'Delivery_Cost_INR': np.clip(150 + distance * 0.2 * rng.lognormal(0, 0.2, n), 150, 1200)
+    })
+
+    fragile = handling[shipped] == 'Fragile'
+    costs = pd.DataFrame({
+        'Order_ID': ids[shipped],
+        'Fuel_Cost': fuel * rng.uniform(0.9, 1.1, n),
+        'Labor_Cost': 45 + distance * 0.06 + delay_minutes * 0.8 + rng.normal(0, 15, n).clip(-40, None),
+        'Vehicle_Maintenance': np.clip(rng.normal(70, 25, n), 20, None),
+        'Insurance': np.clip(rng.normal(42, 16, n), 8, None),
+        'Packaging_Cost': np.clip(rng.normal(38, 14, n) + fragile * 25, 8, None),
+        'Technology_Platform_Fee': np.clip(rng.normal(57, 20, n), 13, None),
+        'Other_Overhead': np.clip(rng.normal(40, 15, n), 8, None)
+    })
+
+    reviewed = rng.random(n) < 0.55
+    m = int(reviewed.sum())
+    feedback_rating = np.clip(rating[reviewed] + rng.integers(-1, 2, m), 1, 5)
+    positive = feedback_rating >= 4
+    text = np.where(positive, np.array(FEEDBACK_TEXT['positive'], dtype=object)[rng.integers(0, 5, m)],
+                    np.array(FEEDBACK_TEXT['negative'], dtype=object)[rng.integers(0, 4, m)])
+    feedback = pd.DataFrame({
+        'Order_ID': ids[shipped][reviewed],
+        'Feedback_Date': order_date[shipped][reviewed] + pd.to_timedelta(promised[reviewed] + late[reviewed] +
+                                                                         rng.integers(0, 7, m), unit='D'),
+        'Rating': feedback_rating,
+        'Feedback_Text': text,
+        'Would_Recommend': np.where(positive ^ (rng.random(m) < 0.1), 'Yes', 'No'),
+        'Issue_Category': _choice(rng, ISSUES, m)
+    })
+    return {'orders': orders, 'routes': routes, 'delivery': delivery, 'costs': costs, 'feedback': feedback}
+
+
+def _fleet(rng, vehicles):
+    types = _choice(rng, {name: spec[0] for name, spec in VEHICLES.items()}, vehicles)
+    code = pd.Index(list(VEHICLES)).get_indexer(types)
+    spec = {field: np.array([VEHICLES[name][i] for name in VEHICLES])[code]
+            for i, field in [(1, 'capacity'), (2, 'efficiency'), (3, 'co2')]}
+    origins = np.array(list(ORIGINS), dtype=object)
+    return pd.DataFrame({
+        'Vehicle_ID': pd.Series(np.arange(1, vehicles + 1)).astype(str).str.zfill(4).radd('VEH'),
+        'Vehicle_Type': types,
+        'Capacity_KG': rng.uniform(spec['capacity'][:, 0], spec['capacity'][:, 1]),
+        'Fuel_Efficiency_KM_per_L': rng.uniform(spec['efficiency'][:, 0], spec['efficiency'][:, 1]),
+        'Current_Location': origins[rng.integers(0, len(origins), vehicles)],
+        'Status': _choice(rng, VEHICLE_STATUSES, vehicles),
+        'Age_Years': rng.uniform(0.5, 8.0, vehicles),
+        'CO2_Emissions_Kg_per_KM': rng.uniform(spec['co2'][:, 0], spec['co2'][:, 1]).round(3)
+    })
+
+
+def _warehouses(rng, start_date, days):
+    rows = [(f'WH{i + 1:03d}_{city}', city, category)
+            for i, city in enumerate(ORIGINS) for category in CATEGORIES]
+    n = len(rows)
+    frame = pd.DataFrame(rows, columns=['Warehouse_ID', 'Location', 'Product_Category'])
+    frame['Current_Stock_Units'] = rng.integers(100, 5000, n)
+    frame['Reorder_Level'] = rng.integers(250, 1000, n)
+    frame['Storage_Cost_per_Unit'] = rng.uniform(7.5, 44.0, n)
+    frame['Last_Restocked_Date'] = (pd.Timestamp(start_date) + pd.to_timedelta(days, unit='D')
+                                    - pd.to_timedelta(rng.integers(0, 30, n), unit='D'))
+    return frame
+
+
+def generate_dataset(orders, directory, seed=SYNTHETIC_SEED, days=365, start_date='2025-01-01', coverage=0.75,
+                     vehicles=None, chunk_rows=SYNTHETIC_CHUNK_ROWS):
+    # Writes all seven CSVs in chunks, so memory stays bounded at any order
+    # count. Each chunk draws from its own stream spawned from `seed`, so the
+    # output is reproducible for a given seed and chunk size.
+    os.makedirs(directory, exist_ok=True)
+    paths = {name: os.path.join(directory, filename) for name, filename in TABLE_FILES.items()}
+    streams = np.random.SeedSequence(seed).spawn(2 + -(-orders // chunk_rows))
+    width = max(6, len(str(orders)))
+
+    rng = np.random.default_rng(streams[0])
+    _append(_fleet(rng, vehicles or max(50, orders // 200)), paths['fleet'], True)
+    _append(_warehouses(np.random.default_rng(streams[1]), start_date, days), paths['warehouse'], True)
+
+    for i, start in enumerate(range(0, orders, chunk_rows)):
+        chunk = _order_chunk(np.random.default_rng(streams[2 + i]), start, min(chunk_rows, orders - start), width,
+                             start_date, days, coverage)
+        for name, frame in chunk.items():
+            _append(frame, paths[name], i == 0)
+    return paths
+
+
+def synthetic_directory(orders, seed=SYNTHETIC_SEED, root='data/synthetic'):
+    return os.path.join(root, f'{orders}_{seed}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic dataset in the shape of the data/ CSVs')
+    parser.add_argument('--orders', type=int, nargs='+', default=[10000])
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--output', help='directory for a single size (default data/synthetic/<orders>_<seed>)')
+    args = parser.parse_args()
+
+    for n in args.orders:
+        directory = args.output or synthetic_directory(n, args.seed)
+        started = time.perf_counter()
+        paths = generate_dataset(n, directory, args.seed, args.days)
+        size_mb = sum(os.path.getsize(path) for path in paths.values()) / 1e6
+        print(f"{n:,} orders -> {directory} ({size_mb:,.1f} MB) in {time.perf_counter() - started:.1f} s")
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from changepoint import binary_segmentation, build_daily_series, detect_changepoints
+
+
+def _daily_orders(values, route='A'):
+    return pd.DataFrame({
+        'Order_Date': pd.date_range('2025-01-01', periods=len(values), freq='D'),
+        'Route': route,
+        'total_cost': values,
+        'Distance_KM': 100.0
+    })
+
+
+def test_mean_shift_is_found_at_its_day():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([100 + rng.normal(0, 2, 60), 150 + rng.normal(0, 2, 60)])
+    assert binary_segmentation(values[None, :]) == [[60]]
+
+
+def test_flat_series_has_no_shift():
+    rng = np.random.default_rng(2)
+    assert binary_segmentation((100 + rng.normal(0, 2, 120))[None, :]) == [[]]
+
+
+def test_missing_days_keep_calendar_positions():
+    rng = np.random.default_rng(3)
+    values = np.concatenate([100 + rng.normal(0, 2, 60), 150 + rng.normal(0, 2, 60)])
+    values[10:20] = np.nan
+    values[70:75] = np.nan
+    assert binary_segmentation(values[None, :]) == [[60]]
+
+
+def test_detect_changepoints_reports_dates_and_means():
+    rng = np.random.default_rng(4)
+    shifted = _daily_orders(np.concatenate([100 + rng.normal(0, 2, 60), 150 + rng.normal(0, 2, 60)]), 'A')
+    flat = _daily_orders(100 + rng.normal(0, 2, 120), 'B')
+
+    result = detect_changepoints(pd.concat([shifted, flat], ignore_index=True), metrics=['total_cost'])
+
+    route_a = result[result['Series'] == 'A']
+    assert len(route_a) == 1
+    assert route_a['Date'].iloc[0] == pd.Timestamp('2025-03-02')
+    assert route_a['Change %'].iloc[0] > 40
+    assert 'B' not in set(result['Series'])
+
+
+def test_daily_series_sums_orders_per_day():
+    df = pd.concat([_daily_orders([1.0, 2.0]), _daily_orders([3.0, 4.0])], ignore_index=True)
+    series = build_daily_series(df, metrics=['total_cost', 'cost_per_km'])
+    assert list(series['total_cost'].loc['All Routes']) == [4.0, 6.0]
+    assert np.allclose(series['cost_per_km'].loc['A'], [4.0 / 200, 6.0 / 200])
@@ -0,0 +1,68 @@
+import datetime
+import numpy as np
+import pandas as pd
+from chart_sampling import lttb_indices, downsample_series, bin_scatter
+
+
+def _daily(n=2000, spike_at=1234):
+    y = np.sin(np.arange(n) / 50.0)
+    y[spike_at] = 40.0
+    return pd.DataFrame({
+        'Date': pd.date_range('2020-01-01', periods=n, freq='D'),
+        'Total Cost': y
+    })
+
+
+def test_lttb_keeps_ends_and_extremes():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[300], y[700] = 10.0, -10.0
+    kept = lttb_indices(x, y, 50)
+    assert len(kept) == 50
+    assert kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    assert 300 in kept and 700 in kept
+
+
+def test_lttb_leaves_short_series_alone():
+    assert np.array_equal(lttb_indices([0, 1, 2], [1, 2, 3], 10), [0, 1, 2])
+
+
+def test_spike_survives_on_datetime_keys():
+    sampled = downsample_series(_daily(), 'Date', 'Total Cost', budget=200)
+    assert len(sampled) == 200
+    assert sampled['Total Cost'].max() == 40.0
+
+
+def test_spike_survives_on_date_object_keys():
+    frame = _daily()
+    frame['Date'] = frame['Date'].dt.date
+    assert isinstance(frame['Date'].iloc[0], datetime.date)
+    sampled = downsample_series(frame, 'Date', 'Total Cost', budget=200)
+    assert sampled['Total Cost'].max() == 40.0
+    # points spread over the whole range rather than piling up at the start
+    assert sampled['Date'].max() - sampled['Date'].min() > datetime.timedelta(days=1900)
+
+
+def test_several_columns_share_x_values():
+    frame = _daily()
+    frame['Fuel'] = 1.0
+    sampled = downsample_series(frame, 'Date', ['Total Cost', 'Fuel'], budget=100)
+    assert len(sampled) == 100
+    assert sampled['Total Cost'].max() == 40.0
+
+
+def test_bin_scatter_keeps_totals_and_centroids():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        'Distance': rng.uniform(0, 100, 5000),
+        'Cost': rng.uniform(0, 50, 5000),
+        'Orders': rng.integers(1, 10, 5000)
+    })
+    binned = bin_scatter(frame, 'Distance', 'Cost', budget=100, size='Orders', label='Route')
+    assert len(binned) <= 100
+    assert binned['Orders'].sum() == frame['Orders'].sum()
+    weighted = (binned['Distance'] * binned['Orders']).sum() / binned['Orders'].sum()
+    assert np.isclose(weighted, np.average(frame['Distance'], weights=frame['Orders']))
+    assert binned['Distance'].between(0, 100).all()
+    assert binned['Route'].str.endswith(' routes').all()
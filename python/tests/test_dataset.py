@@ -0,0 +1,73 @@
+import datetime
+import pandas as pd
+from config import UNASSIGNED_VEHICLE_TYPE
+from dataset import merge_tables, filter_orders, default_filters, filter_key
+
+
+def _tables():
+    ids = [f'O{i}' for i in range(6)]
+    orders = pd.DataFrame({
+        'Order_ID': ids,
+        'Order_Date': pd.to_datetime(['2025-01-01'] * 3 + ['2025-01-02'] * 3),
+        'Customer_Segment': 'SMB',
+        'Priority': ['Express', 'Standard', 'Economy'] * 2,
+        'Product_Category': ['Electronics', 'Food & Beverage', 'Industrial'] * 2,
+        'Order_Value_INR': 1000.0,
+        'Origin': 'A',
+        'Destination': 'B',
+        # No refrigerated vehicle is available, so these two cannot be assigned.
+        'Special_Handling': [None, 'Temperature_Controlled', None, None, 'Temperature_Controlled', None]
+    })
+    costs = pd.DataFrame({'Order_ID': ids, 'Fuel_Cost': 100.0, 'Labor_Cost': 50.0})
+    routes = pd.DataFrame({'Order_ID': ids, 'Route': 'A-B', 'Distance_KM': 100.0, 'Fuel_Consumption_L': 10.0})
+    fleet = pd.DataFrame({
+        'Vehicle_ID': ['V1', 'V2'],
+        'Vehicle_Type': ['Small_Van', 'Refrigerated'],
+        'Capacity_KG': [1000.0, 1000.0],
+        'Fuel_Efficiency_KM_per_L': [10.0, 8.0],
+        'Current_Location': 'A',
+        'Status': ['Available', 'In_Transit']
+    })
+    return {'orders': orders, 'delivery': pd.DataFrame({'Order_ID': ids}), 'costs': costs, 'routes': routes,
+            'fleet': fleet, 'warehouse': pd.DataFrame(), 'feedback': pd.DataFrame()}
+
+
+def test_unassigned_orders_keep_an_explicit_vehicle_type():
+    main = merge_tables(_tables())['main']
+    assert main['Vehicle_Type'].notna().all()
+    assert (main['Vehicle_Type'] == UNASSIGNED_VEHICLE_TYPE).sum() == 2
+
+
+def test_default_filters_keep_every_order():
+    main = merge_tables(_tables())['main']
+    assert len(filter_orders(main, **default_filters(main))) == len(main)
+
+
+def test_filter_key_ignores_selection_order():
+    first = filter_key('v1', {'Priority': ['Express', 'Economy'], 'Product_Category': ['Industrial']})
+    second = filter_key('v1', {'Product_Category': ['Industrial'], 'Priority': ['Economy', 'Express']})
+    assert first == second
+    assert hash(first) == hash(second)
+
+
+def test_filter_key_keeps_date_range_order_and_version():
+    dates = (datetime.date(2025, 1, 1), datetime.date(2025, 1, 2))
+    key = filter_key('v1', {'date_range': dates})
+    assert key != filter_key('v1', {'date_range': dates[::-1]})
+    assert key != filter_key('v2', {'date_range': dates})
+    assert filter_key('v1', {'Priority': None}) == filter_key('v1', {})
+
+
+def test_filter_orders_applies_dates_and_selections():
+    main = merge_tables(_tables())['main']
+    day_one = (datetime.date(2025, 1, 1), datetime.date(2025, 1, 1))
+    assert len(filter_orders(main, date_range=day_one)) == 3
+    assert len(filter_orders(main, date_range=day_one, Priority=['Express'])) == 1
+    assert len(filter_orders(main, Priority=['Express', 'Economy'])) == 4
+
+
+def test_empty_selections_and_partial_dates_leave_orders_unfiltered():
+    main = merge_tables(_tables())['main']
+    assert len(filter_orders(main, Priority=[])) == len(main)
+    assert len(filter_orders(main, date_range=(datetime.date(2025, 1, 2),))) == len(main)
+    assert len(filter_orders(main, Unknown_Column=['x'])) == len(main)
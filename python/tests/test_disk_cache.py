@@ -0,0 +1,55 @@
+import os
+import disk_cache
+from disk_cache import disk_cached, artifact_path, code_version, prune_directory
+
+calls = []
+
+
+def _square(value):
+    calls.append(value)
+    return value * value
+
+
+def test_second_call_loads_from_disk(tmp_path):
+    calls.clear()
+    assert disk_cached(_square, 4, directory=str(tmp_path)) == 16
+    assert disk_cached(_square, 4, directory=str(tmp_path)) == 16
+    assert calls == [4]
+    assert os.path.exists(artifact_path(_square, 4, directory=str(tmp_path)))
+
+
+def test_arguments_key_and_code_version_change_the_path(tmp_path, monkeypatch):
+    path = artifact_path(_square, 4, directory=str(tmp_path))
+    assert artifact_path(_square, 5, directory=str(tmp_path)) != path
+    assert artifact_path(_square, 4, key='v2', directory=str(tmp_path)) != path
+    monkeypatch.setattr(disk_cache, 'CODE_VERSION', 'next-deploy')
+    assert artifact_path(_square, 4, directory=str(tmp_path)) != path
+
+
+def test_code_version_follows_sources(tmp_path):
+    (tmp_path / 'config.py').write_text('LIMIT = 1\n')
+    (tmp_path / 'notes.txt').write_text('ignored')
+    before = code_version(str(tmp_path))
+    (tmp_path / 'notes.txt').write_text('still ignored')
+    assert code_version(str(tmp_path)) == before
+    (tmp_path / 'config.py').write_text('LIMIT = 2\n')
+    assert code_version(str(tmp_path)) != before
+
+
+def test_corrupt_artifact_is_recomputed(tmp_path):
+    calls.clear()
+    path = artifact_path(_square, 3, directory=str(tmp_path))
+    os.makedirs(tmp_path, exist_ok=True)
+    with open(path, 'wb') as handle:
+        handle.write(b'not a pickle')
+    assert disk_cached(_square, 3, directory=str(tmp_path)) == 9
+    assert calls == [3]
+
+
+def test_prune_keeps_the_newest_files(tmp_path):
+    for i in range(5):
+        path = tmp_path / f'{i}.pkl'
+        path.write_bytes(b'')
+        os.utime(path, (1000 + i, 1000 + i))
+    prune_directory(str(tmp_path), 2)
+    assert sorted(os.listdir(tmp_path)) == ['3.pkl', '4.pkl']
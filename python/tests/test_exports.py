@@ -0,0 +1,50 @@
+import gzip
+import os
+import pandas as pd
+import exports
+from exports import export_frame
+
+
+def _orders(n=25):
+    return pd.DataFrame({
+        'Order_ID': [f'ORD{i:04d}' for i in range(n)],
+        'Order_Date': pd.date_range('2025-01-01', periods=n, freq='D'),
+        'Total_Cost': [float(i) * 1.5 for i in range(n)],
+        'Notes': [None if i % 4 == 0 else 'ok' for i in range(n)]
+    })
+
+
+def test_csv_round_trips_in_chunks(tmp_path):
+    df = _orders()
+    path = export_frame(df, 'csv.gz', directory=str(tmp_path), chunk_rows=7)
+    with gzip.open(path, 'rt') as handle:
+        back = pd.read_csv(handle, parse_dates=['Order_Date'])
+    pd.testing.assert_frame_equal(back.fillna({'Notes': ''}), df.fillna({'Notes': ''}))
+
+
+def test_parquet_round_trips(tmp_path):
+    df = _orders()
+    back = pd.read_parquet(export_frame(df, 'parquet', directory=str(tmp_path), chunk_rows=7))
+    pd.testing.assert_frame_equal(back, df, check_dtype=False)
+
+
+def test_excel_spills_onto_extra_sheets(tmp_path, monkeypatch):
+    from openpyxl import load_workbook
+    monkeypatch.setattr(exports, 'EXCEL_MAX_ROWS', 10)
+    df = _orders()
+    workbook = load_workbook(export_frame(df, 'xlsx', directory=str(tmp_path), chunk_rows=7), read_only=True)
+    rows = [list(sheet.values) for sheet in workbook.worksheets]
+    assert [len(sheet) for sheet in rows] == [11, 11, 6]
+    assert all(sheet[0][0] == 'Order_ID' for sheet in rows)
+    assert [row[0] for sheet in rows for row in sheet[1:]] == list(df['Order_ID'])
+
+
+def test_same_frame_reuses_its_file(tmp_path):
+    df = _orders()
+    first = export_frame(df, 'csv.gz', directory=str(tmp_path))
+    modified = os.path.getmtime(first)
+    os.utime(first, (modified - 100, modified - 100))
+    assert export_frame(df.copy(), 'csv.gz', directory=str(tmp_path)) == first
+    assert os.path.getmtime(first) > modified - 100
+    assert export_frame(df.head(3), 'csv.gz', directory=str(tmp_path)) != first
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.part')]
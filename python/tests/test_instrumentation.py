@@ -0,0 +1,23 @@
+import tracemalloc
+import pytest
+from instrumentation import track_memory
+
+
+def test_memory_is_only_traced_during_runs_that_ask_for_it():
+    with track_memory(False):
+        assert not tracemalloc.is_tracing()
+    with track_memory(True):
+        assert tracemalloc.is_tracing()
+        with track_memory(True):
+            pass
+        # another run finishing does not stop tracing for this one
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_an_interrupted_run_stops_tracing():
+    with pytest.raises(RuntimeError):
+        with track_memory(True):
+            raise RuntimeError
+    assert not tracemalloc.is_tracing()
+
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from inventory_simulation import build_inventory_state, simulate_inventory, inventory_summary_table, synthetic_state
+
+
+def _reference(stock, reorder, demand, lead_time, target, daily_cost):
+    # one SKU, one day at a time
+    arrivals = {}
+    on_order = 0.0
+    levels, reorders, lost, first_stockout = [], 0, 0.0, -1
+    for day, wanted in enumerate(demand):
+        arriving = arrivals.pop(day, 0.0)
+        stock += arriving
+        on_order -= arriving
+        served = min(stock, wanted)
+        stock -= served
+        if wanted - served > 1e-9:
+            lost += wanted - served
+            if first_stockout < 0:
+                first_stockout = day
+        if stock + on_order <= reorder:
+            quantity = target - stock - on_order
+            arrivals[day + lead_time] = arrivals.get(day + lead_time, 0.0) + quantity
+            on_order += quantity
+            reorders += 1
+        levels.append(stock)
+    return np.array(levels), reorders, lost, first_stockout, sum(levels) * daily_cost
+
+
+def test_matches_a_per_sku_reference():
+    state = synthetic_state(30, seed=3)
+    horizon, lead_time, order_up_to, period = 60, 9, 2.0, 30
+    result = simulate_inventory(state, horizon=horizon, lead_time=lead_time, order_up_to=order_up_to,
+                                cost_period=period)
+    weekday = np.roll(state['weekday'], -state['start'].dayofweek)[np.arange(horizon) % 7]
+    for k in range(30):
+        target = max(state['reorder'][k] * order_up_to, state['reorder'][k] + 1)
+        levels, reorders, lost, first_stockout, cost = _reference(
+            state['stock'][k], state['reorder'][k], state['rate'][k] * weekday, lead_time, target,
+            state['cost'][k] / period)
+        assert np.allclose(result['levels'][k], levels)
+        assert result['reorders'][k] == reorders
+        assert np.isclose(result['lost_units'][k], lost)
+        assert result['first_stockout'][k] == first_stockout
+        assert np.isclose(result['storage_cost'][k], cost)
+    assert result['lost_units'].sum() > 0
+
+
+def test_reorders_before_running_out_with_a_short_lead_time():
+    state = dict(synthetic_state(1), stock=np.array([10.0]), reorder=np.array([4.0]), rate=np.array([2.0]),
+                 weekday=np.ones(7))
+    result = simulate_inventory(state, horizon=6, lead_time=2, order_up_to=2.0)
+    assert np.allclose(result['levels'][0], [8, 6, 4, 2, 4, 2])
+    assert result['first_reorder'][0] == 2
+    assert result['stockout_days'][0] == 0
+
+    summary = inventory_summary_table(state, result)
+    assert summary.loc[0, 'First Reorder'] == result['dates'][2]
+    assert pd.isna(summary.loc[0, 'First Stockout'])
+
+
+def test_remote_demand_is_shared_by_stock():
+    warehouses = pd.DataFrame({
+        'Warehouse_ID': ['WH1', 'WH2'],
+        'Product_Category': ['Books', 'Books'],
+        'Location': ['Pune', 'Delhi'],
+        'Current_Stock_Units': [300, 100],
+        'Reorder_Level': [50, 50]
+    })
+    orders = pd.DataFrame({
+        'Order_Date': pd.to_datetime(['2025-01-01', '2025-01-01', '2025-01-02', '2025-01-02']),
+        'Product_Category': ['Books'] * 4,
+        'Origin': ['Pune', 'Chennai', 'Chennai', 'Chennai']
+    })
+    state = build_inventory_state(warehouses, orders, demand_scale=1)
+    # Pune ships its own half order a day; Chennai's 1.5 a day splits 3:1 by stock
+    assert np.allclose(state['rate'], [0.5 + 1.5 * 0.75, 1.5 * 0.25])
+
+
+def test_missing_columns_give_no_state():
+    assert build_inventory_state(pd.DataFrame({'Warehouse_ID': ['WH1']}), pd.DataFrame()) is None
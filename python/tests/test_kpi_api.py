@@ -0,0 +1,93 @@
+import asyncio
+import datetime
+import json
+import pandas as pd
+import pytest
+import kpi_api
+from kpi_api import KpiService
+
+
+def _data():
+    main = pd.DataFrame({
+        'Order_ID': [f'O{i}' for i in range(6)],
+        'Order_Date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03'] * 2),
+        'Priority': ['Express', 'Standard'] * 3,
+        'Vehicle_Type': ['Small_Van'] * 6,
+        'Product_Category': ['Books', 'Food'] * 3,
+        'total_cost': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0]
+    })
+    return {'main': main}
+
+
+def _get(service, path, query=None):
+    status, body = asyncio.run(service.respond(path, query or {}))
+    return status, json.loads(body)
+
+
+def test_empty_query_keeps_the_sidebar_defaults():
+    service = KpiService(_data())
+    filters = service.resolve_filters({})
+    assert filters['date_range'] == (datetime.date(2025, 1, 1), datetime.date(2025, 1, 3))
+    assert sorted(filters['Priority']) == ['Express', 'Standard']
+
+
+def test_query_overrides_dates_and_values():
+    service = KpiService(_data())
+    filters = service.resolve_filters({'date_from': ['2025-01-02'], 'Priority': ['Express,', 'Standard']})
+    assert filters['date_range'] == (datetime.date(2025, 1, 2), datetime.date(2025, 1, 3))
+    assert filters['Priority'] == ['Express', 'Standard']
+    with pytest.raises(ValueError):
+        service.resolve_filters({'date_to': ['03/01/2025']})
+
+
+def test_kpis_follow_the_filters():
+    service = KpiService(_data())
+    status, body = _get(service, '/kpis', {'Priority': ['Express']})
+    assert status == 200
+    assert body['result']['orders'] == 3
+    assert body['result']['total_cost'] == 90.0
+    status, body = _get(service, '/kpis', {'date_from': ['2025-01-03']})
+    assert body['result']['orders'] == 2
+
+
+def test_value_order_shares_a_cache_entry():
+    service = KpiService(_data())
+    _get(service, '/kpis', {'Product_Category': ['Books,Food']})
+    _get(service, '/kpis', {'Product_Category': ['Food,Books']})
+    _get(service, '/kpis', {})
+    assert service.stats()['misses'] == 1
+    assert service.stats()['hits'] == 2
+
+
+def test_concurrent_requests_share_one_computation(monkeypatch):
+    calls = []
+
+    def slow_kpis(df, data):
+        calls.append(len(df))
+        return {'orders': len(df)}
+
+    monkeypatch.setitem(kpi_api.ENDPOINTS, '/kpis', slow_kpis)
+    service = KpiService(_data())
+
+    async def both():
+        return await asyncio.gather(service.respond('/kpis', {}), service.respond('/kpis', {}))
+
+    first, second = asyncio.run(both())
+    assert first == second
+    assert calls == [6]
+    assert not service.inflight
+
+
+def test_cache_is_bounded():
+    service = KpiService(_data(), max_entries=2)
+    for priority in ['Express', 'Standard', 'Express,Standard']:
+        _get(service, '/kpis', {'Priority': [priority]})
+    assert len(service.responses) == 2
+
+
+def test_errors():
+    service = KpiService(_data())
+    assert _get(service, '/nope')[0] == 404
+    assert _get(service, '/kpis', {'date_from': ['soon']})[0] == 400
+    status, body = _get(service, '/health')
+    assert status == 200 and body['orders'] == 6
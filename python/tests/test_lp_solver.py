@@ -0,0 +1,62 @@
+import numpy as np
+from lp_solver import solve_lp, TableauLP
+
+
+def test_textbook_problem():
+    # max 3x + 5y  s.t. x <= 4, 2y <= 12, 3x + 2y <= 18  ->  x = 2, y = 6
+    result = solve_lp([-3, -5], A_ub=[[1, 0], [0, 2], [3, 2]], b_ub=[4, 12, 18])
+    assert result['success']
+    assert np.allclose(result['x'], [2, 6])
+    assert np.isclose(result['fun'], -36)
+    # linprog sign convention: binding <= rows have non-positive duals
+    assert np.allclose(result['duals'], [0, -1.5, -1])
+
+
+def test_equality_rows_and_lower_bounds():
+    # min x + 2y  s.t. x + y == 10, x <= 7, y >= 1
+    result = solve_lp([1, 2], A_ub=[[1, 0]], b_ub=[7], A_eq=[[1, 1]], b_eq=[10], lower=[0, 1])
+    assert result['success']
+    assert np.allclose(result['x'], [7, 3])
+
+
+def test_negative_right_hand_side():
+    # x + y >= 4 written as -x - y <= -4
+    result = solve_lp([2, 1], A_ub=[[-1, -1]], b_ub=[-4])
+    assert result['success']
+    assert np.allclose(result['x'], [0, 4])
+
+
+def test_infeasible():
+    result = solve_lp([1, 1], A_ub=[[1, 1]], b_ub=[1], A_eq=[[1, 1]], b_eq=[2])
+    assert result['status'] == 2
+    assert not result['success'] and result['x'] is None
+
+
+def test_unbounded():
+    result = solve_lp([-1, 0], A_ub=[[0, 1]], b_ub=[1])
+    assert result['status'] == 3
+
+
+def test_added_columns_match_solving_from_scratch():
+    rng = np.random.default_rng(0)
+    A = rng.uniform(0, 1, (3, 6))
+    c = rng.uniform(-1, 1, 6)
+    b = np.ones(3)
+
+    lp = TableauLP(c[:3], A_ub=A[:, :3], b_ub=b)
+    assert lp.solve()['success']
+    lp.add_columns(c[3:], A_ub=A[:, 3:])
+    warm = lp.solve()
+
+    cold = solve_lp(c, A_ub=A, b_ub=b)
+    assert warm['success'] and cold['success']
+    assert np.isclose(warm['fun'], cold['fun'])
+
+
+def test_basis_hint_gives_same_optimum():
+    c = [3, 1, 2]
+    A_eq = [[1, 1, 1]]
+    hinted = solve_lp(c, A_eq=A_eq, b_eq=[1], basis_hint={0: 0})
+    plain = solve_lp(c, A_eq=A_eq, b_eq=[1])
+    assert np.allclose(hinted['x'], [0, 1, 0])
+    assert np.isclose(hinted['fun'], plain['fun'])
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from monte_carlo import run_monte_carlo, _run_chunk
+
+BASE = {'fuel': 30000.0, 'labor': 25000.0, 'maintenance': 12000.0, 'total': 95000.0}
+FIXED = {
+    'fuel_rate': ('fixed', 0.10),
+    'fleet_rate': ('fixed', 0.10),
+    'route_rate': ('fixed', 0.10),
+    'priority_rate': ('fixed', 0.10),
+    'overlap': ('fixed', 0.5),
+    'fuel_price_change': ('fixed', 0.0),
+    'adoption': ('fixed', 1.0)
+}
+
+
+def test_same_seed_gives_same_result():
+    first = run_monte_carlo(BASE, trials=20000, seed=7, chunk_size=5000)
+    second = run_monte_carlo(BASE, trials=20000, seed=7, chunk_size=5000)
+    assert np.array_equal(first['savings'], second['savings'])
+    assert len(first['savings']) == 20000
+
+
+def test_fixed_inputs_give_the_closed_form_savings():
+    savings, reduction = _run_chunk(BASE, FIXED, np.random.SeedSequence(0), 10)
+    expected = (30000 * 0.1 + 12000 * 0.1 + 55000 * 0.1 + 95000 * 0.1) * 0.5
+    assert np.allclose(savings, expected)
+    assert np.allclose(reduction, expected / 95000 * 100)
+
+
+def test_percentiles_are_ordered():
+    result = run_monte_carlo(BASE, trials=10000, seed=1)
+    assert result['savings_p10'] <= result['savings_p50'] <= result['savings_p90']
+    assert 0.0 <= result['prob_target'] <= 1.0
+
+
+def test_zero_cost_base_has_zero_reduction():
+    result = run_monte_carlo({}, trials=1000, seed=1)
+    assert not result['reduction'].any()
+
+
+def test_unknown_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        run_monte_carlo(BASE, trials=100, distributions={'overlap': ('cauchy', 0, 1)})
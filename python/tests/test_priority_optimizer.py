@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from priority_optimizer import build_priority_segments, optimize_priority_mix, segment_mix_table
+
+PRIORITIES = ['Economy', 'Express', 'Standard']
+
+
+def _segments(revenue=True):
+    segments = {
+        'index': pd.Index(['Retail', 'SMB'], name='Customer_Segment'),
+        'customer_segment': np.array(['Retail', 'SMB']),
+        'priorities': PRIORITIES,
+        'orders': np.array([100.0, 50.0]),
+        'current': np.array([[0.2, 0.1, 0.7], [0.2, 0.1, 0.7]]),
+        'cost': np.array([[2.0, 10.0, 5.0], [2.0, 10.0, 5.0]])
+    }
+    if revenue:
+        segments['revenue'] = np.array([[3.0, 12.0, 10.0], [3.0, 12.0, 10.0]])
+    return segments
+
+
+def test_minimum_express_share_holds_when_revenue_floor_binds():
+    segments = _segments()
+    result = optimize_priority_mix(segments, min_express=0.3, revenue_floor=1.0)
+
+    assert result['feasible']
+    assert np.all(result['shares'][:, 1] >= 0.3 - 1e-9)
+    assert np.allclose(result['shares'].sum(axis=1), 1.0)
+    assert result['optimized_revenue'] >= result['current_revenue'] * (1 - 1e-9)
+    # Cheapest way to meet both: 30% Express, then Standard only as far as
+    # the revenue floor needs it (3.6 + 10s + 3(0.7 - s) = 8.8).
+    assert np.allclose(result['shares'], [[0.7 - 3.1 / 7, 0.3, 3.1 / 7]] * 2)
+
+
+def test_runs_without_coupling_constraints():
+    result = optimize_priority_mix(_segments(revenue=False), min_express=0.3)
+    assert result['feasible']
+    assert np.allclose(result['shares'], [[0.7, 0.3, 0.0]] * 2)
+    assert result['optimized_cost'] < result['current_cost']
+
+
+def test_minimum_shares_above_one_are_infeasible():
+    result = optimize_priority_mix(_segments(), min_express=1.5)
+    assert not result['feasible']
+    assert result['shares'] is None
+
+
+def test_unreachable_revenue_floor_returns_closest_mix():
+    result = optimize_priority_mix(_segments(), revenue_floor=10.0)
+    assert not result['feasible']
+    assert np.allclose(result['shares'].sum(axis=1), 1.0)
+
+
+def test_segments_from_orders():
+    df = pd.DataFrame({
+        'Customer_Segment': ['Retail', 'Retail', 'Retail', 'SMB'],
+        'Priority': ['Express', 'Standard', 'Standard', 'Economy'],
+        'total_cost': [10.0, 5.0, 7.0, 2.0],
+        'Order_Value_INR': [12.0, 10.0, 10.0, 3.0]
+    })
+    segments = build_priority_segments(df)
+
+    assert segments['priorities'] == PRIORITIES
+    assert list(segments['orders']) == [3.0, 1.0]
+    assert np.allclose(segments['current'][0], [0.0, 1 / 3, 2 / 3])
+    # Retail has no Economy orders, so it takes Economy's overall mean.
+    assert np.allclose(segments['cost'][0], [2.0, 10.0, 6.0])
+
+    result = optimize_priority_mix(segments, revenue_floor=1.0)
+    table = segment_mix_table(segments, result)
+    assert np.isclose(table['Savings'].sum(), result['current_cost'] - result['optimized_cost'])
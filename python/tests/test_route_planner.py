@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from optimization_engine import route_analysis
+from route_planner import (build_distance_matrix, savings_tours, improve_tour, tour_length, plan_tours,
+                           plan_daily_routes)
+
+
+def _routes():
+    return pd.DataFrame({
+        'Route': ['A-B', 'B-A', 'A-B', 'B-C', 'A-C'],
+        'Distance_KM': [100.0, 110.0, 400.0, 50.0, 500.0]
+    })
+
+
+def test_distance_matrix_takes_medians_and_shortest_paths():
+    names, matrix = build_distance_matrix(_routes())
+    assert names == ['A', 'B', 'C']
+    assert matrix[0, 1] == matrix[1, 0] == 110.0
+    # A-C was observed at 500 km, but going through B is 160 km.
+    assert matrix[0, 2] == 160.0
+    assert np.allclose(matrix, matrix.T)
+
+
+def test_savings_tours_respect_capacity():
+    depot_dist = np.array([10.0, 10.0, 10.0, 10.0])
+    i, j = np.triu_indices(4, 1)
+    tours = savings_tours(depot_dist, i, j, np.ones(len(i)), demand=[3, 3, 3, 3], capacity=6)
+    assert sorted(len(tour) for tour in tours) == [2, 2]
+    assert sorted(np.concatenate(tours).tolist()) == [0, 1, 2, 3]
+
+
+def test_improve_tour_untangles_a_crossing():
+    points = np.array([[0, 0], [0, 1], [1, 1], [1, 0]], dtype=float)
+    block = np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=2))
+    crossed = np.array([0, 2, 1, 3, 0])
+    seq = improve_tour(block, tour_seq=np.array([2, 1, 3]))
+    assert tour_length(block, seq) < tour_length(block, crossed)
+    assert np.isclose(tour_length(block, seq), 4.0)
+    assert seq[0] == seq[-1] == 0 and sorted(seq[1:-1]) == [1, 2, 3]
+
+
+def test_plan_tours_chains_stops_along_a_line():
+    positions = np.array([10.0, 20.0, 30.0])
+
+    def dist(rows, cols):
+        return np.abs(positions[rows][:, None] - positions[cols][None, :])
+
+    tours, total = plan_tours(positions, dist, np.ones(3), capacity=8)
+    assert len(tours) == 1
+    assert np.isclose(total, 60.0)
+
+
+def _orders():
+    return pd.DataFrame({
+        'Order_ID': range(12),
+        'Order_Date': pd.to_datetime(['2025-01-01'] * 10 + ['2025-01-02'] * 2),
+        'Origin': 'A',
+        'Destination': ['B'] * 9 + ['C'] + ['B', 'C'],
+        'Route': ['A-B'] * 9 + ['A-C'] + ['A-B', 'A-C'],
+        'Distance_KM': [110.0] * 9 + [160.0, 110.0, 160.0],
+        'Fuel_Consumption_L': 10.0,
+        'Fuel_Cost': 1000.0,
+        'total_cost': 2000.0,
+        'cost_per_km': 2000.0 / np.array([110.0] * 9 + [160.0, 110.0, 160.0])
+    })
+
+
+def test_daily_plan_sends_full_loads_direct_and_chains_the_rest():
+    plan = plan_daily_routes(_orders(), _routes(), capacity=8)
+    first_day = plan['plan'].iloc[0]
+    # 8 orders to B fill one vehicle; the ninth and the C order share a tour.
+    assert first_day['Orders'] == 10 and first_day['Tours'] == 2
+    assert np.isclose(first_day['Planned KM'], 2 * 110 + (110 + 50 + 160))
+    assert plan['planned_km'] < plan['direct_km']
+    assert plan['fuel_saved_cost'] > 0
+
+
+def test_route_opportunity_comes_from_the_plan():
+    analysis = route_analysis(_orders(), _routes())
+    assert analysis['inefficient'].empty
+    assert np.isclose(analysis['opportunity']['savings'], analysis['plan']['fuel_saved_cost'])
@@ -0,0 +1,104 @@
+import threading
+import numpy as np
+import pandas as pd
+from config import ORDER_SCENARIO_CACHE_SIZE
+from scenario_engine import (build_order_base, reprice_orders, rollup_orders, compute_scenario_base,
+                             evaluate_scenarios, sensitivity_surface, default_params, ORDER_COMPONENTS)
+
+
+def _orders():
+    return pd.DataFrame({
+        'Route': ['A-B', 'A-B', 'B-C', 'C-D'],
+        'Priority': ['Express', 'Standard', 'Standard', 'Economy'],
+        'Distance_KM': [90.0, 45.0, 180.0, 0.0],
+        'Fuel_Consumption_L': [10.0, 5.0, 20.0, 0.0],
+        'Fuel_Cost': [1000.0, 500.0, 2000.0, 100.0],
+        'Labor_Cost': [600.0, 300.0, 1200.0, 50.0],
+        'Traffic_Delay_Minutes': [60.0, 0.0, 120.0, 0.0],
+        'Vehicle_Maintenance': [100.0, 50.0, 200.0, 10.0],
+        'Insurance': [40.0, 20.0, 80.0, 5.0],
+        'Toll_Charges_INR': [30.0, 15.0, 60.0, 0.0],
+        'total_cost': [1800.0, 900.0, 3600.0, 180.0]
+    })
+
+
+def test_no_change_reproduces_current_costs():
+    base = build_order_base(_orders())
+    scenario = reprice_orders(base)
+    for name in ORDER_COMPONENTS + ['total']:
+        assert np.allclose(scenario[name], base[name]), name
+    assert np.allclose(scenario['delta'], 0)
+
+
+def test_fuel_price_change_reprices_fuel_only():
+    df = _orders()
+    base = build_order_base(df)
+    scenario = reprice_orders(base, fuel_change=10)
+    assert np.allclose(scenario['fuel'], df['Fuel_Cost'] * 1.1)
+    assert np.allclose(scenario['labor'], df['Labor_Cost'])
+    assert np.allclose(scenario['delta'], df['Fuel_Cost'] * 0.1)
+    # Scaling fuel is linear, so the order-level and aggregate models agree.
+    aggregate = evaluate_scenarios(compute_scenario_base(df), fuel_change=10)
+    assert np.isclose(scenario['delta'].sum(), float(aggregate['delta']))
+
+
+def test_delay_reduction_only_removes_delay_minutes():
+    df = _orders()
+    scenario = reprice_orders(build_order_base(df), delay_reduction=100)
+    drive = df['Distance_KM'] / 45 * 60
+    expected = df['Labor_Cost'] * drive / (drive + df['Traffic_Delay_Minutes'])
+    # The order with no drive or delay minutes keeps its flat labor cost.
+    expected[3] = 50.0
+    assert np.allclose(scenario['labor'], expected)
+
+
+def test_rollups_add_up_to_the_total():
+    base = build_order_base(_orders())
+    scenario = reprice_orders(base, fuel_change=5, distance_reduction=10, fleet_reduction=20)
+    overall = rollup_orders(base, scenario)
+    by_route = rollup_orders(base, scenario, 'Route')
+
+    assert list(by_route.index) == ['A-B', 'B-C', 'C-D']
+    assert list(by_route['orders']) == [2, 1, 1]
+    for col in overall.columns:
+        assert np.isclose(by_route[col].sum(), overall[col].iloc[0]), col
+
+
+def test_repriced_scenarios_are_memoised_and_bounded():
+    base = build_order_base(_orders())
+    first = reprice_orders(base, fuel_change=5)
+    assert reprice_orders(base, fuel_change=5) is first
+    for change in range(ORDER_SCENARIO_CACHE_SIZE + 3):
+        reprice_orders(base, fuel_change=change)
+    assert len(base['cache']) == ORDER_SCENARIO_CACHE_SIZE
+
+
+def test_concurrent_sessions_share_one_order_base():
+    base = build_order_base(_orders())
+    errors = []
+
+    def session(offset):
+        try:
+            for i in range(200):
+                scenario = reprice_orders(base, fuel_change=(offset + i) % 7, delay_reduction=i % 3)
+                rollup_orders(base, scenario, 'Priority')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(base['cache']) <= ORDER_SCENARIO_CACHE_SIZE
+
+
+def test_sensitivity_surface_matches_pointwise_evaluation():
+    base = compute_scenario_base(_orders())
+    x_values, y_values, surface = sensitivity_surface(base, 'fuel_change', 'efficiency_gain')
+    assert surface.shape == (len(y_values), len(x_values))
+    i, j = len(y_values) // 3, len(x_values) // 2
+    params = dict(default_params(), fuel_change=x_values[j], efficiency_gain=y_values[i])
+    point = evaluate_scenarios(base, **params)
+    assert np.isclose(surface[i, j], float(point['delta']))
@@ -0,0 +1,100 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from scenario_engine import build_order_base, reprice_orders, rollup_orders
+from scenario_library import (save_scenario, list_scenarios, load_scenario, delete_scenario, diff_scenarios,
+                              RESULT_COMPONENTS)
+
+
+def _orders(routes=('A-B', 'A-B', 'B-C', 'C-D')):
+    n = len(routes)
+    return pd.DataFrame({
+        'Route': list(routes),
+        'Priority': ['Express', 'Standard', 'Standard', 'Economy'][:n],
+        'Distance_KM': [90.0, 45.0, 180.0, 60.0][:n],
+        'Fuel_Consumption_L': [10.0, 5.0, 20.0, 6.0][:n],
+        'Fuel_Cost': [1000.0, 500.0, 2000.0, 600.0][:n],
+        'Labor_Cost': [600.0, 300.0, 1200.0, 400.0][:n],
+        'Traffic_Delay_Minutes': [60.0, 0.0, 120.0, 10.0][:n],
+        'Vehicle_Maintenance': [100.0, 50.0, 200.0, 60.0][:n],
+        'Insurance': [40.0, 20.0, 80.0, 30.0][:n],
+        'Toll_Charges_INR': [30.0, 15.0, 60.0, 20.0][:n],
+        'total_cost': [1800.0, 900.0, 3600.0, 1100.0][:n]
+    })
+
+
+def _save(name, path, df=None, **params):
+    base = build_order_base(_orders() if df is None else df)
+    scenario = reprice_orders(base, **params)
+    save_scenario(name, params, base, scenario, dimensions=['Route', 'Priority'], path=path)
+    return base, scenario
+
+
+def test_round_trip_returns_the_saved_rollups(tmp_path):
+    path = str(tmp_path / 'library.db')
+    base, scenario = _save('Fuel+10', path, fuel_change=10)
+
+    loaded = load_scenario('Fuel+10', path=path)
+    assert loaded['params'] == {'fuel_change': 10}
+    by_route = rollup_orders(base, scenario, 'Route')
+    by_route.index = by_route.index.astype(str)
+    pd.testing.assert_frame_equal(loaded['results'].xs('Route', level='dimension'), by_route,
+                                  check_dtype=False, check_names=False)
+    overall = loaded['results'].loc[('All', 'All')]
+    assert overall['orders'] == 4
+    assert np.isclose(overall['delta'], scenario['delta'].sum())
+
+    saved = list_scenarios(path=path)
+    assert list(saved['name']) == ['Fuel+10']
+    assert saved.loc[0, 'fuel_change'] == 10
+    assert np.isclose(saved.loc[0, 'scenario_delta'], scenario['delta'].sum())
+
+
+def test_saving_a_name_again_replaces_it(tmp_path):
+    path = str(tmp_path / 'library.db')
+    _save('Plan', path, fuel_change=10)
+    _, scenario = _save('Plan', path, distance_reduction=20)
+
+    assert list(list_scenarios(path=path)['name']) == ['Plan']
+    loaded = load_scenario('Plan', path=path)
+    assert loaded['params'] == {'distance_reduction': 20}
+    assert np.isclose(loaded['results'].loc[('All', 'All'), 'delta'], scenario['delta'].sum())
+    with sqlite3.connect(path) as conn:
+        assert conn.execute('SELECT COUNT(DISTINCT scenario_id) FROM scenario_results').fetchone()[0] == 1
+
+
+def test_delete_removes_the_scenario_and_its_rows(tmp_path):
+    path = str(tmp_path / 'library.db')
+    _save('Keep', path, fuel_change=5)
+    _save('Drop', path, fuel_change=15)
+    delete_scenario('Drop', path=path)
+
+    assert list(list_scenarios(path=path)['name']) == ['Keep']
+    with pytest.raises(KeyError):
+        load_scenario('Drop', path=path)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute('SELECT COUNT(DISTINCT scenario_id) FROM scenario_results').fetchone()[0] == 1
+
+
+def test_diff_aligns_partly_overlapping_members(tmp_path):
+    path = str(tmp_path / 'library.db')
+    _, first = _save('First', path, fuel_change=10)
+    _, second = _save('Second', path, df=_orders(routes=('B-C', 'C-D', 'C-D', 'D-E')), fuel_change=20)
+    a = load_scenario('First', path=path)
+    b = load_scenario('Second', path=path)
+
+    diff = diff_scenarios(a, b, 'Route')
+    assert list(diff.index) == ['A-B', 'B-C', 'C-D', 'D-E']
+    assert list(diff.columns) == RESULT_COMPONENTS
+    left = a['results'].xs('Route', level='dimension')
+    right = b['results'].xs('Route', level='dimension')
+    # A route missing from one side counts as zero cost there
+    assert np.isclose(diff.loc['A-B', 'total'], -left.loc['A-B', 'total_scenario'])
+    assert np.isclose(diff.loc['D-E', 'fuel'], right.loc['D-E', 'fuel_scenario'])
+    assert np.isclose(diff.loc['C-D', 'total'], right.loc['C-D', 'total_scenario'] - left.loc['C-D', 'total_scenario'])
+    assert np.isclose(diff['total'].sum(), second['total'].sum() - first['total'].sum())
+
+    by_priority = diff_scenarios(a, b, 'Priority', components=['fuel'])
+    assert list(by_priority.columns) == ['fuel']
+    assert diff_scenarios(a, b, 'Carrier').empty
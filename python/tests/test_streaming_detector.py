@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from streaming_detector import RollingCostDetector, detect_rolling_anomalies
+
+
+def _orders(costs, route='A'):
+    return pd.DataFrame({
+        'Order_Date': pd.date_range('2025-01-01', periods=len(costs), freq='D'),
+        'Route': route,
+        'Vehicle_Type': 'Van',
+        'total_cost': costs,
+        'cost_per_km': np.asarray(costs) / 100
+    })
+
+
+def test_warm_up_matches_running_mean_and_variance():
+    values = [10.0, 12.0, 11.0, 13.0, 9.0]
+    detector = RollingCostDetector(metrics=['total_cost'], key_cols=['Route'], alpha=0.05)
+    for value in values:
+        detector.update(('A',), [value])
+    count, mean, var, _ = detector.state[('A',)][0]
+    assert count == 5
+    assert np.isclose(mean, np.mean(values))
+    assert np.isclose(var, np.var(values))
+
+
+def test_spike_is_flagged_only_on_its_route():
+    costs = [99.0, 101.0] * 20
+    costs[30] = 200.0
+    df = pd.concat([_orders(costs, 'A'), _orders([99.0, 101.0] * 20, 'B')], ignore_index=True)
+
+    result, detector = detect_rolling_anomalies(df)
+
+    assert list(result.index) == list(df.index)
+    flagged = df.index[result['order_flag']]
+    assert list(flagged) == [30]
+    assert len(detector.summary()) == 2
+
+
+def test_no_flags_before_min_obs():
+    result, _ = detect_rolling_anomalies(_orders([1.0, 1000.0, 1.0, 1000.0]))
+    assert not result['order_flag'].any()
+    assert result['total_cost_z'].isna().all()
+
+
+def test_missing_values_are_skipped():
+    detector = RollingCostDetector(metrics=['total_cost'], key_cols=['Route'])
+    z, window_z, order_flag, _ = detector.update(('A',), [np.nan])
+    assert np.isnan(z[0]) and np.isnan(window_z[0]) and not order_flag
+    assert detector.state[('A',)][0][0] == 0
+
+
+def test_scan_matches_row_by_row_updates():
+    rng = np.random.default_rng(7)
+    n = 600
+    df = pd.DataFrame({
+        'Order_Date': pd.to_datetime('2025-01-01') + pd.to_timedelta(rng.integers(0, 60, n), 'D'),
+        'Route': rng.choice(['A', 'B', None], n),
+        'Vehicle_Type': 'Van',
+        'total_cost': rng.normal(1000, 100, n),
+        'cost_per_km': rng.normal(10, 1, n)
+    }, index=rng.permutation(n))
+    df.loc[df.index[::9], 'total_cost'] = np.nan
+    df.loc[df.index[::50], 'cost_per_km'] *= 4
+
+    scanned = RollingCostDetector()
+    scanned.scan(df.iloc[:40])
+    result = scanned.scan(df.iloc[40:])
+
+    stepped = RollingCostDetector()
+    rows = {}
+    for part in (df.iloc[:40], df.iloc[40:]):
+        for index, row in part.sort_values('Order_Date', kind='stable').iterrows():
+            key = ('All' if row['Route'] is None else row['Route'], row['Vehicle_Type'])
+            rows[index] = stepped.update(key, [row['cost_per_km'], row['total_cost']])
+
+    expected = pd.DataFrame([rows[index][0] for index in result.index], index=result.index)
+    assert np.allclose(result['cost_per_km_z'], expected[0], equal_nan=True)
+    assert np.allclose(result['total_cost_z'], expected[1], equal_nan=True)
+    assert list(result['order_flag']) == [rows[index][2] for index in result.index]
+    assert list(result['window_flag']) == [rows[index][3] for index in result.index]
+    assert result['order_flag'].any()
+    assert set(scanned.state) == set(stepped.state)
+    for key, states in stepped.state.items():
+        assert np.allclose(scanned.state[key], states)
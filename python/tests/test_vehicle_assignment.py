@@ -0,0 +1,88 @@
+import itertools
+import numpy as np
+import pandas as pd
+from vehicle_assignment import (FORBIDDEN, min_cost_assignment, _assign_round, pack_loads, assign_vehicles,
+                                assignment_summary)
+
+
+def _brute_force(cost):
+    n, m = cost.shape
+    return min(sum(cost[i, cols[i]] for i in range(n)) for cols in itertools.permutations(range(m), n))
+
+
+def test_assignment_is_optimal_on_small_problems():
+    rng = np.random.default_rng(0)
+    for n, m in [(3, 3), (4, 4), (3, 6), (5, 7)]:
+        cost = rng.integers(1, 50, (n, m)).astype(float)
+        cols = min_cost_assignment(cost)
+        assert len(set(cols)) == n
+        assert np.isclose(cost[np.arange(n), cols].sum(), _brute_force(cost))
+
+
+def test_rounds_drop_forbidden_pairs_and_handle_more_rows_than_columns():
+    cost = np.array([[1.0, FORBIDDEN], [FORBIDDEN, FORBIDDEN], [2.0, 3.0]])
+    rows, cols = _assign_round(cost)
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 0), (2, 1)]
+
+
+def test_first_fit_decreasing_respects_capacity():
+    group = np.array([0, 0, 0, 0, 1, 1])
+    weights = np.array([6.0, 5.0, 4.0, 3.0, 2.0, 2.0])
+    bins = pack_loads(group, weights, capacity=[10.0, 3.0])
+    # Group 0: 6+4 and 5+3; group 1 needs one bin per item.
+    assert bins[0] == bins[2] and bins[1] == bins[3] and bins[0] != bins[1]
+    assert bins[4] != bins[5]
+    for g, capacity in [(0, 10.0), (1, 3.0)]:
+        loads = np.bincount(bins[group == g], weights=weights[group == g])
+        assert loads.max() <= capacity
+
+
+def _fleet():
+    return pd.DataFrame({
+        'Vehicle_ID': ['V1', 'V2', 'V3'],
+        'Vehicle_Type': ['Small_Van', 'Large_Truck', 'Refrigerated'],
+        'Capacity_KG': [100.0, 1000.0, 500.0],
+        'Fuel_Efficiency_KM_per_L': [10.0, 5.0, 8.0],
+        'Current_Location': ['A', 'B', 'A'],
+        'Status': ['Available', 'Available', 'Maintenance'],
+        'CO2_Emissions_Kg_per_KM': [0.2, 0.5, 0.3]
+    })
+
+
+def _orders():
+    return pd.DataFrame({
+        'Order_ID': ['O1', 'O2', 'O3', 'O4'],
+        'Order_Date': pd.to_datetime(['2025-01-01', '2025-01-01', '2025-01-01', None]),
+        'Origin': ['A', 'B', 'A', 'A'],
+        'Product_Category': 'Electronics',
+        'Special_Handling': [None, None, 'Temperature_Controlled', None],
+        'Distance_KM': [100.0, 200.0, 50.0, 10.0],
+        'Fuel_Cost': [100.0, 200.0, 50.0, 10.0],
+        'Fuel_Consumption_L': [1.0, 2.0, 0.5, 0.1]
+    })
+
+
+def test_assign_vehicles_prices_empty_running():
+    routes = pd.DataFrame({'Route': ['A-B'], 'Distance_KM': [300.0]})
+    assigned, loads = assign_vehicles(_orders(), _fleet(), routes)
+
+    # O1 from A takes the van parked at A and O2 from B the truck parked at B,
+    # both with no empty running. The refrigerated vehicle is in maintenance,
+    # so the temperature-controlled order and the undated order stay unassigned.
+    assert assigned['Vehicle_ID'].tolist()[:2] == ['V1', 'V2']
+    assert assigned['Vehicle_ID'].iloc[2:].isna().all()
+    placed = loads.dropna(subset=['Vehicle_ID'])
+    assert (placed['Deadhead_KM'] == 0).all()
+    assert np.allclose(placed['Fuel_Cost'], [100.0 * 100 / 10, 200.0 * 100 / 5])
+
+    summary = assignment_summary(loads)
+    assert summary['unassigned_loads'] == 1 and summary['vehicles_used'] == 2
+
+
+def test_second_trips_reuse_vehicles():
+    orders = _orders().iloc[:2].assign(Origin='A', Product_Category='Industrial', Order_Value_INR=1.0)
+    fleet = _fleet().iloc[:1].assign(Capacity_KG=200.0)
+    routes = pd.DataFrame({'Route': ['A-B'], 'Distance_KM': [300.0]})
+    _, loads = assign_vehicles(orders, fleet, routes, max_trips=2)
+    assert sorted(loads['Trip']) == [1, 2]
+    assert (loads['Vehicle_ID'] == 'V1').all()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from lp_solver import solve_lp
+from warehouse_rebalancing import build_rebalancing_problem, solve_rebalancing, stock_change_table, synthetic_problem
+
+
+def _warehouses():
+    return pd.DataFrame({
+        'Warehouse_ID': ['WH1', 'WH2'],
+        'Product_Category': ['Books', 'Books'],
+        'Current_Stock_Units': [100, 100],
+        'Reorder_Level': [20, 0],
+        'Storage_Cost_per_Unit': [10.0, 2.0]
+    })
+
+
+def test_moves_stock_to_the_cheaper_warehouse_within_headroom():
+    problem = build_rebalancing_problem(_warehouses())
+    result = solve_rebalancing(problem, headroom=0.5)
+    plan = result['plan']
+    # WH2 may grow by half its stock; WH1 could give up 80 before its reorder level
+    assert len(plan) == 1
+    assert plan.loc[0, 'From'] == 'WH1' and plan.loc[0, 'To'] == 'WH2'
+    assert plan.loc[0, 'Units'] == 50
+    assert np.allclose(result['final_stock'], [[50], [150]])
+    assert np.isclose(result['savings'], 50 * (10.0 - 2.0) - result['transfer_cost'])
+    assert result['shortfall_units'] == 0
+
+
+def test_no_moves_when_transfer_costs_more_than_it_saves():
+    problem = build_rebalancing_problem(_warehouses())
+    problem['transfer'] = problem['transfer'] + 100.0
+    result = solve_rebalancing(problem)
+    assert result['plan'].empty
+    assert np.isclose(result['savings'], 0)
+
+
+def test_column_generation_matches_the_full_lp():
+    problem = synthetic_problem(6, n_categories=3, seed=4)
+    headroom = 0.25
+    result = solve_rebalancing(problem, headroom=headroom)
+
+    stock, reorder, cost = problem['stock'], problem['reorder'], problem['cost']
+    carried, transfer = problem['carried'], problem['transfer']
+    W, C = stock.shape
+    arcs = [(i, j, c) for i in range(W) for j in range(W) for c in range(C)
+            if i != j and carried[i, c] and carried[j, c]]
+    A = np.zeros((W * C + W, len(arcs)))
+    for k, (i, j, c) in enumerate(arcs):
+        A[i * C + c, k] = 1.0
+        A[j * C + c, k] = -1.0
+        A[W * C + j, k] = 1.0
+        A[W * C + i, k] = -1.0
+    costs = [transfer[i, j] + cost[j, c] - cost[i, c] for i, j, c in arcs]
+    b_ub = np.concatenate([np.where(carried, stock - reorder, 0).ravel(), headroom * stock.sum(axis=1)])
+    full = solve_lp(costs, A_ub=A, b_ub=b_ub)
+    assert full['success']
+    # the plan rounds units, so allow a unit's worth of cost per move
+    assert np.isclose(result['savings'], -full['fun'], atol=len(result['plan']) * float(np.abs(costs).max()))
+    assert result['savings'] > 0
+
+
+def test_plan_keeps_reorder_levels_and_headroom():
+    problem = synthetic_problem(12, seed=1)
+    result = solve_rebalancing(problem, headroom=0.25)
+    final = result['final_stock']
+    assert np.all(final[problem['carried']] >= problem['reorder'][problem['carried']] - 1)
+    assert np.all(final.sum(axis=1) <= 1.25 * problem['stock'].sum(axis=1) + len(result['plan']))
+    assert np.allclose(final.sum(axis=0), problem['stock'].sum(axis=0))
+
+    table = stock_change_table(problem, result)
+    assert len(table) == problem['carried'].sum()
+    assert np.isclose(table['Change'].sum(), 0)
+
+
+def test_missing_columns_give_no_problem():
+    assert build_rebalancing_problem(_warehouses().drop(columns='Storage_Cost_per_Unit')) is None
+
+
+def test_shortfall_is_covered_from_a_warehouse_with_spare_stock():
+    warehouses = _warehouses()
+    warehouses['Reorder_Level'] = [20, 150]
+    problem = build_rebalancing_problem(warehouses)
+    result = solve_rebalancing(problem, headroom=0.5)
+    # WH2 sits 50 below its reorder level and WH1 can spare 80
+    assert result['shortfall_units'] == 0
+    assert result['final_stock'][1, 0] >= 150
+    assert result['plan'].loc[0, 'From'] == 'WH1'
@@ -0,0 +1,286 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from config import (ORDER_WEIGHT_KG, ORDER_WEIGHT_DEFAULT_KG, ASSIGNMENT_VEHICLE_STATUSES,
+                    ASSIGNMENT_HANDLING_VEHICLES, ASSIGNMENT_FUEL_PRICE_PER_L, ASSIGNMENT_MAX_TRIPS)
+from route_planner import build_distance_matrix
+
+FORBIDDEN = 1e12
+
+
+def estimate_order_weights(orders):
+    # Orders carry no weight, so each takes its category's typical weight
+    # scaled by how its value compares with the category median.
+    category = orders['Product_Category'] if 'Product_Category' in orders.columns else pd.Series(index=orders.index)
+    base = category.map(ORDER_WEIGHT_KG).fillna(ORDER_WEIGHT_DEFAULT_KG).to_numpy(dtype=float)
+    if 'Order_Value_INR' not in orders.columns:
+        return base
+    value = orders['Order_Value_INR'].astype(float)
+    median = value.groupby(category.fillna('')).transform('median')
+    scale = (value / median.replace(0, np.nan)).clip(0.25, 4).fillna(1.0)
+    return base * scale.to_numpy()
+
+
+def pack_loads(group, weights, capacity):
+    # First-fit decreasing run for every group at once: step t places the t-th
+    # heaviest item of each group into the first of that group's bins with
+    # room, so the Python loop runs over the largest group size only.
+    group = np.asarray(group)
+    weights = np.asarray(weights, dtype=float)
+    capacity = np.asarray(capacity, dtype=float)
+    n_groups = len(capacity)
+    order = np.lexsort((-weights, group))
+    sizes = np.bincount(group, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    rank = np.arange(len(order)) - starts[group[order]]
+
+    max_size = sizes.max() if len(sizes) else 0
+    remaining = np.zeros((n_groups, max_size))
+    used = np.zeros(n_groups, dtype=np.int64)
+    bins = np.empty(len(weights), dtype=np.int64)
+    for step in range(max_size):
+        items = order[rank == step]
+        g = group[items]
+        w = weights[items]
+        fits = remaining[g, :] >= w[:, None] - 1e-9
+        fits &= np.arange(max_size)[None, :] < used[g][:, None]
+        has_room = fits.any(axis=1)
+        target = np.where(has_room, fits.argmax(axis=1), used[g])
+        used[g[~has_room]] += 1
+        remaining[g[~has_room], target[~has_room]] = capacity[g[~has_room]]
+        remaining[g, target] -= w
+        bins[items] = target
+    return bins
+
+
+def min_cost_assignment(cost):
+    # Shortest augmenting path (Jonker-Volgenant style) assignment of every row
+    # to a distinct column; needs rows <= columns. Each Dijkstra step is one
+    # vectorised pass over the columns.
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    u = np.zeros(n)
+    v = np.zeros(m)
+    col_for_row = np.full(n, -1)
+    row_for_col = np.full(m, -1)
+
+    for start in range(n):
+        shortest = np.full(m, np.inf)
+        path = np.full(m, -1)
+        scanned = np.zeros(m, dtype=bool)
+        visited_rows = [start]
+        row = start
+        min_value = 0.0
+        while True:
+            reduced = min_value + cost[row] - u[row] - v
+            better = ~scanned & (reduced < shortest)
+            path[better] = row
+            shortest[better] = reduced[better]
+            candidates = np.where(scanned, np.inf, shortest)
+            col = int(np.argmin(candidates))
+            # Prefer a free column among equally short ones to end the search early.
+            ties = np.flatnonzero((candidates == candidates[col]) & (row_for_col < 0))
+            if len(ties):
+                col = int(ties[0])
+            min_value = candidates[col]
+            scanned[col] = True
+            if row_for_col[col] < 0:
+                break
+            row = row_for_col[col]
+            visited_rows.append(row)
+
+        u[start] += min_value
+        others = np.array(visited_rows[1:], dtype=np.int64)
+        if len(others):
+            u[others] += min_value - shortest[col_for_row[others]]
+        v[scanned] -= min_value - shortest[scanned]
+
+        while True:
+            row = path[col]
+            row_for_col[col] = row
+            col_for_row[row], col = col, col_for_row[row]
+            if row == start:
+                break
+    return col_for_row
+
+
+def _assign_round(cost):
+    # Rectangular problems are solved from the shorter side; pairs that only
+    # exist through a forbidden cost are dropped.
+    n, m = cost.shape
+    if n < m:
+        # Some optimal assignment only uses each row's n cheapest columns: any
+        # other column could be swapped for one of those still left free.
+        candidates = np.unique(np.argpartition(cost, n - 1, axis=1)[:, :n])
+        rows = np.arange(n)
+        cols = candidates[min_cost_assignment(cost[:, candidates])]
+    elif n == m:
+        rows = np.arange(n)
+        cols = min_cost_assignment(cost)
+    else:
+        cols = np.arange(m)
+        rows = min_cost_assignment(cost.T)
+    keep = cost[rows, cols] < FORBIDDEN
+    return rows[keep], cols[keep]
+
+
+def _fuel_price(orders):
+    if 'Fuel_Cost' in orders.columns and 'Fuel_Consumption_L' in orders.columns:
+        litres = orders['Fuel_Consumption_L'].sum()
+        if litres > 0:
+            return orders['Fuel_Cost'].sum() / litres
+    return ASSIGNMENT_FUEL_PRICE_PER_L
+
+
+def assign_vehicles(orders, fleet, routes=None, statuses=ASSIGNMENT_VEHICLE_STATUSES, max_trips=ASSIGNMENT_MAX_TRIPS):
+    # Packs each day's orders per origin and handling class into vehicle loads,
+    # then matches loads to vehicles by minimum fuel cost (load distance plus
+    # the empty run from the vehicle's location) in up to `max_trips` rounds.
+    # Returns per-order Vehicle_ID/Load_ID and a per-load summary.
+    assigned = pd.DataFrame({'Vehicle_ID': pd.Series(np.nan, index=orders.index, dtype=object),
+                             'Load_ID': pd.Series(np.nan, index=orders.index, dtype=object)})
+    vehicles = fleet[fleet['Status'].isin(statuses)] if 'Status' in fleet.columns else fleet
+    vehicles = vehicles.dropna(subset=['Capacity_KG', 'Fuel_Efficiency_KM_per_L']).reset_index(drop=True)
+    needed = ['Order_Date', 'Origin']
+    if vehicles.empty or any(col not in orders.columns for col in needed):
+        return assigned, pd.DataFrame()
+
+    valid = orders['Order_Date'].notna() & orders['Origin'].notna()
+    work = orders[valid]
+    weights = estimate_order_weights(work)
+    handling = work['Special_Handling'] if 'Special_Handling' in work.columns else pd.Series('', index=work.index)
+    handling = handling.where(handling.isin(list(ASSIGNMENT_HANDLING_VEHICLES)), '').fillna('')
+
+    vehicle_type = vehicles['Vehicle_Type'].to_numpy() if 'Vehicle_Type' in vehicles.columns else np.array([''] * len(vehicles))
+    capacity = vehicles['Capacity_KG'].to_numpy(dtype=float)
+    compatible = {'': np.ones(len(vehicles), dtype=bool)}
+    for name, types in ASSIGNMENT_HANDLING_VEHICLES.items():
+        compatible[name] = np.isin(vehicle_type, types)
+
+    keys = pd.DataFrame({'day': work['Order_Date'].dt.normalize(), 'origin': work['Origin'], 'handling': handling})
+    group, group_keys = pd.factorize(pd.MultiIndex.from_frame(keys))
+    group_keys = group_keys.set_names(keys.columns)
+    group_handling = group_keys.get_level_values('handling')
+    group_capacity = np.array([capacity[compatible[h]].max() if compatible[h].any() else 0.0 for h in group_handling])
+    bins = pack_loads(group, weights, group_capacity)
+
+    distance = work['Distance_KM'].fillna(work['Distance_KM'].median()).fillna(0).to_numpy(dtype=float) \
+        if 'Distance_KM' in work.columns else np.zeros(len(work))
+    load_index = pd.MultiIndex.from_arrays([group, bins])
+    load_codes, load_keys = pd.factorize(load_index)
+    n_loads = len(load_keys)
+    load_group = load_keys.get_level_values(0).to_numpy()
+    load_weight = np.bincount(load_codes, weights=weights, minlength=n_loads)
+    load_km = np.bincount(load_codes, weights=distance, minlength=n_loads)
+    load_orders = np.bincount(load_codes, minlength=n_loads)
+    load_day = group_keys.get_level_values('day')[load_group]
+    load_origin = group_keys.get_level_values('origin')[load_group]
+    load_handling = group_handling[load_group]
+
+    locations = vehicles['Current_Location'].fillna('') if 'Current_Location' in vehicles.columns else pd.Series([''] * len(vehicles))
+    cities, matrix = build_distance_matrix(routes if routes is not None else pd.DataFrame(columns=['Route', 'Distance_KM']),
+                                           set(load_origin) | set(locations) - {''})
+    city_index = {name: i for i, name in enumerate(cities)}
+    vehicle_city = np.array([city_index.get(name, -1) for name in locations])
+    origin_city = np.array([city_index[name] for name in load_origin])
+    # Empty running by origin city and vehicle; a day's loads index into it, so
+    # no load x vehicle matrix is ever built beyond the loads pending that day.
+    city_deadhead = np.where(vehicle_city[None, :] >= 0, matrix[:, np.maximum(vehicle_city, 0)], 0.0)
+
+    cost_per_km = _fuel_price(work) / vehicles['Fuel_Efficiency_KM_per_L'].to_numpy(dtype=float)
+    co2_per_km = vehicles['CO2_Emissions_Kg_per_KM'].to_numpy(dtype=float) \
+        if 'CO2_Emissions_Kg_per_KM' in vehicles.columns else np.zeros(len(vehicles))
+
+    load_vehicle = np.full(n_loads, -1)
+    load_trip = np.zeros(n_loads, dtype=np.int64)
+    start = time.perf_counter()
+    for day in np.unique(load_day):
+        pending = np.flatnonzero(load_day == day)
+        for trip in range(1, max_trips + 1):
+            if not len(pending):
+                break
+            fits = load_weight[pending][:, None] <= capacity[None, :] + 1e-9
+            fits &= np.stack([compatible[h] for h in load_handling[pending]])
+            cost = (load_km[pending][:, None] + city_deadhead[origin_city[pending]]) * cost_per_km[None, :]
+            cost = np.where(fits, cost, FORBIDDEN)
+            rows, cols = _assign_round(cost)
+            load_vehicle[pending[rows]] = cols
+            load_trip[pending[rows]] = trip
+            pending = np.setdiff1d(pending, pending[rows])
+    elapsed = time.perf_counter() - start
+
+    ok = load_vehicle >= 0
+    vehicle = np.where(ok, load_vehicle, 0)
+    load_ids = np.array([f"LD{i + 1:06d}" for i in range(n_loads)])
+    vehicle_ids = vehicles['Vehicle_ID'].to_numpy()
+    assigned.loc[work.index, 'Load_ID'] = load_ids[load_codes]
+    assigned.loc[work.index, 'Vehicle_ID'] = np.where(ok[load_codes], vehicle_ids[vehicle[load_codes]], np.nan)
+
+    deadhead = city_deadhead[origin_city, vehicle]
+    total_km = load_km + deadhead
+    loads = pd.DataFrame({
+        'Load_ID': load_ids,
+        'Date': load_day,
+        'Origin': load_origin,
+        'Handling': load_handling,
+        'Orders': load_orders,
+        'Weight_KG': load_weight,
+        'Vehicle_ID': np.where(ok, vehicle_ids[vehicle], None),
+        'Vehicle_Type': np.where(ok, vehicle_type[vehicle], None),
+        'Capacity_KG': np.where(ok, capacity[vehicle], np.nan),
+        'Trip': np.where(ok, load_trip, 0),
+        'Load_KM': load_km,
+        'Deadhead_KM': np.where(ok, deadhead, np.nan),
+        'Fuel_Cost': np.where(ok, total_km * cost_per_km[vehicle], np.nan),
+        'CO2_Kg': np.where(ok, total_km * co2_per_km[vehicle], np.nan)
+    })
+    loads['Utilisation'] = loads['Weight_KG'] / loads['Capacity_KG']
+    loads.attrs['seconds'] = elapsed
+    return assigned, loads
+
+
+def assignment_summary(loads):
+    placed = loads.dropna(subset=['Vehicle_ID'])
+    return {
+        'loads': len(loads),
+        'unassigned_loads': len(loads) - len(placed),
+        'vehicles_used': placed['Vehicle_ID'].nunique(),
+        'utilisation': placed['Weight_KG'].sum() / placed['Capacity_KG'].sum() if len(placed) else 0.0,
+        'fuel_cost': placed['Fuel_Cost'].sum(),
+        'co2_kg': placed['CO2_Kg'].sum(),
+        'deadhead_km': placed['Deadhead_KM'].sum()
+    }
+
+
+def benchmark(sizes=((100, 1000), (200, 5000), (500, 5000)), cities=12, seed=0):
+    # Synthetic day: loads with random distance and weight, vehicles with random
+    # fuel cost per km, capacity and home city, priced like assign_vehicles.
+    rng = np.random.default_rng(seed)
+    capacities = np.array([30, 700, 2300, 3000, 7000])
+    rows = []
+    for n_loads, n_vehicles in sizes:
+        city_km = rng.uniform(0, 1500, (cities, cities))
+        city_km = (city_km + city_km.T) / 2
+        np.fill_diagonal(city_km, 0)
+        load_km = rng.uniform(50, 3000, n_loads)
+        deadhead = city_km[rng.integers(0, cities, n_loads)][:, rng.integers(0, cities, n_vehicles)]
+        cost = (load_km[:, None] + deadhead) * rng.uniform(8, 30, n_vehicles)[None, :]
+        fits = rng.uniform(10, 5000, n_loads)[:, None] <= rng.choice(capacities, n_vehicles)[None, :]
+        cost = np.where(fits, cost, FORBIDDEN)
+
+        start = time.perf_counter()
+        row_idx, col_idx = _assign_round(cost)
+        elapsed = time.perf_counter() - start
+        rows.append({'loads': n_loads, 'vehicles': n_vehicles, 'assigned': len(row_idx),
+                     'fuel_cost': cost[row_idx, col_idx].sum(), 'seconds': elapsed})
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark load-to-vehicle assignment')
+    parser.add_argument('--loads', type=int, nargs='+', default=[100, 200, 500])
+    parser.add_argument('--vehicles', type=int, nargs='+', default=[1000, 5000, 5000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(benchmark(list(zip(args.loads, args.vehicles)), seed=args.seed).to_string(index=False))
@@ -0,0 +1,223 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from route_planner import build_distance_matrix
+from config import (WAREHOUSE_CAPACITY_HEADROOM, WAREHOUSE_TRANSFER_COST_PER_UNIT_KM,
+                    WAREHOUSE_TRANSFER_HANDLING_PER_UNIT, WAREHOUSE_REBALANCE_MAX_ITER,
+                    WAREHOUSE_REBALANCE_KEEP_REDUCED_COST)
+
+
+def build_rebalancing_problem(warehouse_df, routes=None):
+    needed = ['Warehouse_ID', 'Product_Category', 'Current_Stock_Units', 'Storage_Cost_per_Unit']
+    if any(col not in warehouse_df.columns for col in needed):
+        return None
+    stock = warehouse_df.dropna(subset=needed).groupby(['Warehouse_ID', 'Product_Category']).agg(
+        stock=('Current_Stock_Units', 'sum'),
+        reorder=('Reorder_Level', 'sum') if 'Reorder_Level' in warehouse_df.columns else ('Current_Stock_Units', lambda s: 0),
+        cost=('Storage_Cost_per_Unit', 'mean')
+    )
+    if stock.empty:
+        return None
+
+    warehouses = stock.index.get_level_values(0).unique()
+    categories = stock.index.get_level_values(1).unique()
+    full = pd.MultiIndex.from_product([warehouses, categories])
+    stock = stock.reindex(full)
+    carried = stock['stock'].notna().to_numpy().reshape(len(warehouses), len(categories))
+
+    if 'Location' in warehouse_df.columns:
+        location = warehouse_df.groupby('Warehouse_ID')['Location'].first().reindex(warehouses).fillna('')
+    else:
+        location = pd.Series('', index=warehouses)
+    cities, matrix = build_distance_matrix(routes if routes is not None else pd.DataFrame(columns=['Route', 'Distance_KM']),
+                                           set(location) - {''})
+    city_index = {name: i for i, name in enumerate(cities)}
+    city = np.array([city_index.get(name, -1) for name in location])
+    if len(cities):
+        distance = np.where((city[:, None] >= 0) & (city[None, :] >= 0),
+                            matrix[np.maximum(city, 0)][:, np.maximum(city, 0)], 0.0)
+    else:
+        distance = np.zeros((len(warehouses), len(warehouses)))
+
+    shape = (len(warehouses), len(categories))
+    return {
+        'warehouses': list(warehouses),
+        'categories': list(categories),
+        'location': location.to_numpy(),
+        'carried': carried,
+        'stock': stock['stock'].fillna(0).to_numpy(dtype=float).reshape(shape),
+        'reorder': stock['reorder'].fillna(0).to_numpy(dtype=float).reshape(shape),
+        'cost': stock['cost'].fillna(0).to_numpy(dtype=float).reshape(shape),
+        'transfer': distance * WAREHOUSE_TRANSFER_COST_PER_UNIT_KM + WAREHOUSE_TRANSFER_HANDLING_PER_UNIT
+    }
+
+
+def solve_rebalancing(problem, headroom=WAREHOUSE_CAPACITY_HEADROOM, max_iter=WAREHOUSE_REBALANCE_MAX_ITER,
+                      keep_reduced_cost=WAREHOUSE_REBALANCE_KEEP_REDUCED_COST):
+    # Transportation problem over (from, to, category) moves. Each stocked
+    # warehouse-category must end at or above its reorder level, and each
+    # warehouse's total stock may grow by at most `headroom`. The move arcs
+    # (W^2 * C of them) are never all in the LP: each round prices every arc
+    # from the master's row duals in one array expression, adds the cheapest
+    # arc out of and into every warehouse-category, and drops unused arcs whose
+    # reduced cost has drifted well above zero, so the sparse master that
+    # HiGHS re-solves each round stays near the size of its basis. Elastic
+    # shortfall columns are only needed where stock already sits below the
+    # reorder level.
+    from scipy.optimize import linprog
+    from scipy.sparse import csc_matrix
+    started = time.perf_counter()
+    stock, reorder, cost = problem['stock'], problem['reorder'], problem['cost']
+    carried, transfer = problem['carried'], problem['transfer']
+    W, C = stock.shape
+    node = np.arange(W * C).reshape(W, C)
+    node_rows = np.flatnonzero(carried.ravel())
+    row_of_node = np.full(W * C, -1)
+    row_of_node[node_rows] = np.arange(len(node_rows))
+    N = len(node_rows)
+
+    # Moving a unit of c from i to j changes cost by transfer[i, j] + cost[j, c] - cost[i, c].
+    arc_cost = transfer[:, :, None] + cost[None, :, :] - cost[:, None, :]
+    allowed = carried[:, None, :] & carried[None, :, :] & ~np.eye(W, dtype=bool)[:, :, None]
+
+    b_ub = np.concatenate([(stock - reorder).ravel()[node_rows], headroom * stock.sum(axis=1)])
+    scale = float(np.abs(cost).max() + np.abs(transfer).max() + 1.0)
+    short = np.flatnonzero(b_ub[:N] < 0)
+    E = len(short)
+    sources, categories = np.indices((W, C))
+
+    def solve_master(arcs):
+        if not E + len(arcs):
+            return {'success': True, 'message': 'No profitable moves', 'x': np.zeros(0)}, np.zeros(N + W)
+        i, j, c = arcs.T
+        K = len(arcs)
+        rows = np.concatenate([short, row_of_node[node[i, c]], row_of_node[node[j, c]], N + j, N + i])
+        values = np.concatenate([-np.ones(E), np.ones(K), -np.ones(K), np.ones(K), -np.ones(K)])
+        cols = np.concatenate([np.arange(E), np.tile(E + np.arange(K), 4)])
+        solved = linprog(np.concatenate([np.full(E, 1e3 * scale), arc_cost[i, j, c]]),
+                         A_ub=csc_matrix((values, (rows, cols)), shape=(N + W, E + K)), b_ub=b_ub, method='highs')
+        if not solved.success:
+            return {'success': False, 'message': solved.message, 'x': None}, None
+        # Elastic columns come first in the master, arcs after them.
+        return {'success': True, 'message': solved.message, 'x': solved.x[E:]}, solved.ineqlin.marginals
+
+    arcs = np.zeros((0, 3), dtype=np.int64)
+    result, duals = solve_master(arcs)
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        if not result['success']:
+            break
+        node_dual = np.zeros(W * C)
+        node_dual[node_rows] = duals[:N]
+        node_dual = node_dual.reshape(W, C)
+        cap_dual = duals[N:]
+        reduced = (arc_cost - node_dual[:, None, :] + node_dual[None, :, :]
+                   - cap_dual[None, :, None] + cap_dual[:, None, None])
+        reduced = np.where(allowed, reduced, np.inf)
+        current = reduced[tuple(arcs.T)]
+        reduced[tuple(arcs.T)] = np.inf
+        candidates = np.unique(np.concatenate([
+            np.ravel_multi_index((sources.ravel(), reduced.argmin(axis=1).ravel(), categories.ravel()), reduced.shape),
+            np.ravel_multi_index((reduced.argmin(axis=0).ravel(), sources.ravel(), categories.ravel()), reduced.shape)
+        ]))
+        candidates = candidates[reduced.ravel()[candidates] < -1e-9 * scale]
+        if not len(candidates):
+            break
+        arcs = arcs[(result['x'] > 1e-9) | (current < keep_reduced_cost * scale)]
+        arcs = np.vstack([arcs, np.column_stack(np.unravel_index(candidates, reduced.shape))])
+        result, duals = solve_master(arcs)
+
+    return _summarize(problem, arcs, result, N, iteration, started)
+
+
+def _summarize(problem, arcs, result, n_nodes, iterations, started):
+    stock, cost, transfer = problem['stock'], problem['cost'], problem['transfer']
+    current_cost = float((stock * cost).sum())
+    if result is None or not result['success']:
+        return {'plan': None, 'current_cost': current_cost, 'message': result['message'] if result else 'No data',
+                'iterations': iterations, 'seconds': time.perf_counter() - started}
+
+    units = np.round(result['x'][:len(arcs)])
+    moved = units > 0
+    i, j, c = arcs[moved].T if moved.any() else (np.zeros(0, dtype=np.int64),) * 3
+    units = units[moved]
+
+    final = stock.copy()
+    np.add.at(final, (i, c), -units)
+    np.add.at(final, (j, c), units)
+    transfer_cost = units * transfer[i, j]
+    storage_saving = units * (cost[i, c] - cost[j, c])
+    plan = pd.DataFrame({
+        'From': np.array(problem['warehouses'])[i],
+        'To': np.array(problem['warehouses'])[j],
+        'Product_Category': np.array(problem['categories'])[c],
+        'Units': units.astype(int),
+        'Storage Saving': storage_saving,
+        'Transfer Cost': transfer_cost,
+        'Net Saving': storage_saving - transfer_cost
+    }).sort_values('Net Saving', ascending=False).reset_index(drop=True)
+
+    shortfall = np.maximum(problem['reorder'] - final, 0) * problem['carried']
+    optimized_cost = float((final * cost).sum() + transfer_cost.sum())
+    return {
+        'plan': plan,
+        'final_stock': final,
+        'current_cost': current_cost,
+        'optimized_cost': optimized_cost,
+        'transfer_cost': float(transfer_cost.sum()),
+        'savings': current_cost - optimized_cost,
+        'shortfall_units': float(shortfall.sum()),
+        'message': result['message'],
+        'iterations': iterations,
+        'arcs_priced': int(problem['carried'].sum() * len(problem['warehouses'])),
+        'seconds': time.perf_counter() - started
+    }
+
+
+def stock_change_table(problem, result):
+    rows = pd.MultiIndex.from_product([problem['warehouses'], problem['categories']],
+                                      names=['Warehouse_ID', 'Product_Category'])
+    table = pd.DataFrame({
+        'Current Stock': problem['stock'].ravel(),
+        'Optimized Stock': result['final_stock'].ravel(),
+        'Reorder Level': problem['reorder'].ravel(),
+        'Storage Cost/Unit': problem['cost'].ravel()
+    }, index=rows)[problem['carried'].ravel()]
+    table['Change'] = table['Optimized Stock'] - table['Current Stock']
+    return table.reset_index()
+
+
+def synthetic_problem(n_warehouses, n_categories=7, seed=0):
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0, 2000, (n_warehouses, 2))
+    distance = np.sqrt(((coords[:, None] - coords[None]) ** 2).sum(axis=2))
+    stock = rng.integers(500, 5000, (n_warehouses, n_categories)).astype(float)
+    return {
+        'warehouses': [f'WH{i:04d}' for i in range(n_warehouses)],
+        'categories': [f'CAT{c}' for c in range(n_categories)],
+        'location': np.array([''] * n_warehouses),
+        'carried': rng.random((n_warehouses, n_categories)) < 0.9,
+        'stock': stock,
+        'reorder': np.round(stock * rng.uniform(0.1, 0.5, stock.shape)),
+        'cost': rng.uniform(5, 45, (n_warehouses, n_categories)),
+        'transfer': distance * WAREHOUSE_TRANSFER_COST_PER_UNIT_KM + WAREHOUSE_TRANSFER_HANDLING_PER_UNIT
+    }
+
+
+def benchmark(sizes=(5, 20, 50, 100, 200, 300, 500), n_categories=7, seed=0):
+    rows = []
+    for n in sizes:
+        result = solve_rebalancing(synthetic_problem(n, n_categories, seed))
+        rows.append({'warehouses': n, 'categories': n_categories, 'moves': len(result['plan']),
+                     'savings': result['savings'], 'rounds': result['iterations'], 'seconds': result['seconds']})
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the warehouse rebalancing solver')
+    parser.add_argument('--warehouses', type=int, nargs='+', default=[5, 20, 50, 100, 200, 300, 500])
+    parser.add_argument('--categories', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(benchmark(args.warehouses, args.categories, args.seed).to_string(index=False))
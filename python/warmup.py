@@ -0,0 +1,71 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from dataset import data_version, build_dataset, load_dataset, filter_orders, default_filters
+from disk_cache import disk_cached, artifact_path
+from ml_models import score_cost_anomalies, fit_cost_prediction_model, fit_cost_clusters
+from optimization_engine import analysis_jobs
+from config import N_CLUSTERS, WARMUP_WORKERS
+
+_snapshot = {}
+
+
+def _tasks(df, data):
+    # The same calls, with the same arguments, that the pages make under the
+    # default sidebar filters.
+    tasks = {
+        'anomalies': (score_cost_anomalies, (df,)),
+        'cost_model': (fit_cost_prediction_model, (df,)),
+        'clusters': (fit_cost_clusters, (df, N_CLUSTERS))
+    }
+    for name, (_, func, args) in analysis_jobs(df, data).items():
+        tasks[f'{name}_analysis'] = (func, args)
+    return tasks
+
+
+def _load_snapshot(version):
+    data = load_dataset(version)
+    _snapshot['tasks'] = _tasks(filter_orders(data['main'], **default_filters(data['main'])), data)
+
+
+def _warm(name):
+    func, args = _snapshot['tasks'][name]
+    cached = os.path.exists(artifact_path(func, *args))
+    started = time.perf_counter()
+    disk_cached(func, *args)
+    return {'stage': name, 'seconds': time.perf_counter() - started, 'cached': cached, 'pid': os.getpid()}
+
+
+def warm_caches(workers=WARMUP_WORKERS):
+    # The snapshot is built first, in this process; every other artifact only
+    # depends on it, so they are spread over worker processes that each read
+    # the pickled snapshot back from disk.
+    version = data_version()
+    started = time.perf_counter()
+    cached = os.path.exists(artifact_path(build_dataset, 'data', key=version))
+    data = load_dataset(version)
+    if data is None:
+        raise ValueError("No cost columns found in data")
+    rows = [{'stage': 'dataset', 'seconds': time.perf_counter() - started, 'cached': cached, 'pid': os.getpid()}]
+
+    _load_snapshot(version)
+    names = list(_snapshot['tasks'])
+    if workers <= 1:
+        rows += [_warm(name) for name in names]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(names)), initializer=_load_snapshot,
+                                 initargs=(version,)) as pool:
+            rows += [future.result() for future in as_completed([pool.submit(_warm, name) for name in names])]
+    return pd.DataFrame(rows), time.perf_counter() - started
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pre-build the dataset snapshot, models and analyses on disk')
+    parser.add_argument('--workers', type=int, default=min(WARMUP_WORKERS, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    results, seconds = warm_caches(args.workers)
+    print(results.round(3).to_string(index=False))
+    print(f"Warmed {len(results)} artifacts in {seconds:.2f} s with {args.workers} worker(s)")